@@ -0,0 +1,98 @@
+import functools
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# Single place for the API location and connection settings. Each can be
+# overridden through the environment or at runtime with configure().
+BASE_URL = os.environ.get("TODO_API_URL", "http://localhost:4567")
+POOL_SIZE = int(os.environ.get("TODO_API_POOL_SIZE", "64"))
+TIMEOUT = float(os.environ.get("TODO_API_TIMEOUT", "10"))
+POOLED = os.environ.get("TODO_API_POOLED", "1") != "0"
+
+_session = None
+_session_lock = threading.Lock()
+
+# Layers wrapped around every request, outermost last added. A layer is called
+# as layer(method, path, kwargs, send) and returns a response, usually by
+# calling send(method, path, kwargs) to pass the request on.
+_layers = []
+
+def configure(base_url=None, pool_size=None, timeout=None, pooled=None):
+    """Change client settings; the pooled session is rebuilt on next use"""
+    global BASE_URL, POOL_SIZE, TIMEOUT, POOLED, _session
+    with _session_lock:
+        if base_url is not None:
+            BASE_URL = base_url.rstrip("/")
+        if pool_size is not None:
+            POOL_SIZE = pool_size
+        if timeout is not None:
+            TIMEOUT = timeout
+        if pooled is not None:
+            POOLED = pooled
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def url(path):
+    """Resolve an API path such as "/todos/1" against BASE_URL"""
+    if path.startswith(("http://", "https://")):
+        return path
+    return f"{BASE_URL}{path}"
+
+def session():
+    """Return the shared keep-alive session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+def add_layer(layer):
+    _layers.append(layer)
+
+def remove_layer(layer):
+    if layer in _layers:
+        _layers.remove(layer)
+
+def _send(method, path, kwargs):
+    if POOLED:
+        return session().request(method, url(path), **kwargs)
+    return requests.request(method, url(path), **kwargs)
+
+def request(method, path, **kwargs):
+    """Send a request to the API.
+
+    Pooled mode reuses keep-alive connections from the shared session; fresh
+    mode opens a new connection per call, like module-level requests.get.
+    A default per-request timeout is applied unless one is given. The request
+    passes through any layers added with add_layer() on its way.
+    """
+    kwargs.setdefault("timeout", TIMEOUT)
+    send = _send
+    for layer in list(_layers):
+        send = functools.partial(layer, send=send)
+    return send(method, path, kwargs)
+
+def get(path, **kwargs):
+    return request("GET", path, **kwargs)
+
+def post(path, **kwargs):
+    return request("POST", path, **kwargs)
+
+def put(path, **kwargs):
+    return request("PUT", path, **kwargs)
+
+def delete(path, **kwargs):
+    return request("DELETE", path, **kwargs)
+
+def head(path, **kwargs):
+    kwargs.setdefault("allow_redirects", False)
+    return request("HEAD", path, **kwargs)
+
+def options(path, **kwargs):
+    return request("OPTIONS", path, **kwargs)
@@ -0,0 +1,62 @@
+"""Create the entities of a scenario's "Given ... exists" steps in one batch.
+
+Before a scenario runs, the todo/project/category creation steps among its
+leading Given steps (Background included) are POSTed concurrently with
+seeding.create_all. When each step then runs it takes its prepared object
+instead of sending its own POST, so context.todo, context.project and
+context.category are bound in step order exactly as before. A step whose
+creation failed, or that comes after the first When/Then, creates its entity
+itself.
+"""
+import json
+import re
+from collections import deque
+import seeding
+
+# Step text -> collection the entity is created in. Payload fields are the
+# named groups. The title-only todo pattern must not swallow the one with a
+# description, which the $ anchors guarantee.
+ENTITY_GIVENS = (
+    (re.compile(r'^a todo with title "(?P<title>[^"]+)" and description "(?P<description>[^"]+)" exists$'), "/todos"),
+    (re.compile(r'^a todo with title "(?P<title>[^"]+)" exists$'), "/todos"),
+    (re.compile(r'^a project with title "(?P<title>[^"]+)" exists$'), "/projects"),
+    (re.compile(r'^a category with title "(?P<title>[^"]+)" exists$'), "/categories"),
+)
+
+def entity_spec(step_text):
+    """(path, payload) created by a step, or None for other steps"""
+    for pattern, path in ENTITY_GIVENS:
+        match = pattern.match(step_text)
+        if match:
+            return path, match.groupdict()
+    return None
+
+def setup_steps(steps):
+    """The Given steps before the first When or Then"""
+    leading = []
+    for step in steps:
+        if step.step_type != "given":
+            break
+        leading.append(step)
+    return leading
+
+def _key(path, payload):
+    return f"{path} {json.dumps(payload, sort_keys=True)}"
+
+def materialize(steps, workers=seeding.SEED_WORKERS):
+    """Create the entities of the leading creation steps concurrently.
+
+    Returns the prepared objects by (path, payload), in step order, for take().
+    Failed creations are left out, so their steps retry on their own.
+    """
+    specs = [spec for spec in map(entity_spec, (step.name for step in setup_steps(steps))) if spec]
+    prepared = {}
+    for (path, payload), created in zip(specs, seeding.create_all(specs, workers)):
+        if created is not None:
+            prepared.setdefault(_key(path, payload), deque()).append(created)
+    return prepared
+
+def take(prepared, path, payload):
+    """The next object prepared for a creation step, or None"""
+    queue = (prepared or {}).get(_key(path, payload))
+    return queue.popleft() if queue else None
@@ -1,19 +1,189 @@
+import argparse
+import heapq
+import json
 import os
 import random
 import subprocess
+import sys
+import time
+from setup import find_free_port
+
+REPORTS_DIR = 'reports'
+FAILED_STATUSES = ('failed', 'error')
+
+# Per-feature and per-scenario durations from earlier runs, used to schedule
+# the slowest features first. Durations are smoothed across runs.
+TIMINGS_FILE = os.path.join(REPORTS_DIR, 'timings.json')
+TIMING_SMOOTHING = 0.5  # weight of the newest run
+RECENT_FAILURE_WINDOW = 7 * 24 * 3600  # seconds a failure counts as recent for fail-fast ordering
+ORDERS = ('longest', 'fail-fast', 'random')
 
 def get_feature_files(directory):
     return [os.path.join(directory, f) for f in os.listdir(directory) if f.endswith('.feature')]
 
-def run_features_in_random_order(directory):
-    feature_files = get_feature_files(directory)
-    random.shuffle(feature_files)
+def load_timings(path=TIMINGS_FILE):
+    if not os.path.exists(path):
+        return {"features": {}, "scenarios": {}}
+    with open(path) as f:
+        return json.load(f)
+
+def save_timings(timings, path=TIMINGS_FILE):
+    with open(path, 'w') as f:
+        json.dump(timings, f, indent=2, sort_keys=True)
+
+def _smooth(previous, duration):
+    if previous is None:
+        return duration
+    return TIMING_SMOOTHING * duration + (1 - TIMING_SMOOTHING) * previous
+
+def update_timings(timings, merged, now=None):
+    """Fold a merged behave JSON report into the timing history.
+
+    Durations are the sum of step durations, so hook time such as the server
+    reset between features is not included.
+    """
+    now = time.time() if now is None else now
+    for feature in merged:
+        path = feature['location'].rsplit(':', 1)[0]
+        feature_duration = 0
+        for element in feature.get('elements', []):
+            duration = sum(step.get('result', {}).get('duration', 0) for step in element.get('steps', []))
+            feature_duration += duration
+            if element.get('type') == 'scenario':
+                key = f"{element['location']} {element['name']}"
+                timings["scenarios"][key] = _smooth(timings["scenarios"].get(key), duration)
+        entry = timings["features"].setdefault(path, {})
+        entry["duration"] = _smooth(entry.get("duration"), feature_duration)
+        entry["status"] = feature['status']
+        if feature['status'] in FAILED_STATUSES:
+            entry["last_failed"] = now
+    return timings
+
+def estimated_duration(feature, timings):
+    """Historical duration of a feature; features never timed are assumed to be
+    as slow as the slowest known one, so they are not left until the end.
+    Without any history every feature counts as one unit of work."""
+    history = timings["features"]
+    if feature in history:
+        return history[feature]["duration"]
+    return max((entry["duration"] for entry in history.values()), default=1.0)
+
+def recently_failed(feature, timings, now=None):
+    now = time.time() if now is None else now
+    last_failed = timings["features"].get(feature, {}).get("last_failed")
+    return last_failed is not None and now - last_failed <= RECENT_FAILURE_WINDOW
+
+def order_features(feature_files, order, seed, timings):
+    """Return the features in run order.
+
+    longest   - slowest first, by historical duration
+    fail-fast - recently failing features first (most recent failure first),
+                then the rest slowest first
+    random    - shuffled with `seed`
+    """
+    feature_files = sorted(feature_files)
+    if order == 'random':
+        random.Random(seed).shuffle(feature_files)
+        return feature_files
+    by_duration = sorted(feature_files, key=lambda f: -estimated_duration(f, timings))
+    if order == 'longest':
+        return by_duration
+    return sorted(by_duration, key=lambda f: -timings["features"][f]["last_failed"]
+                  if recently_failed(f, timings) else 0)
+
+def shard(feature_files, workers, timings):
+    """Assign the (already ordered) features to workers, each going to the
+    worker with the least estimated work so far. With longest-first order this
+    is the LPT schedule, which keeps one slow feature from finishing last."""
+    shards = [[] for _ in range(workers)]
+    loads = [(0, worker) for worker in range(workers)]
     for feature in feature_files:
-        result = subprocess.run(['behave', feature])
-        if result.returncode != 0:
-            print(f"Feature {feature} failed.")
-            break
+        load, worker = heapq.heappop(loads)
+        shards[worker].append(feature)
+        heapq.heappush(loads, (load + estimated_duration(feature, timings), worker))
+    return shards
+
+def start_worker(worker, features):
+    """Run one behave process for a shard against its own server.
+
+    The worker's server is started by features/environment.py on the port in
+    TODO_API_URL, so every worker has a separate JAR instance and data set.
+    """
+    port = find_free_port()
+    env = dict(os.environ,
+               TODO_API_URL=f"http://localhost:{port}",
+               TODO_API_LOG_FILE=os.path.join('logs', f'todo_api_worker{worker}.log'))
+    report = os.path.join(REPORTS_DIR, f'worker{worker}.json')
+    output = open(os.path.join(REPORTS_DIR, f'worker{worker}.log'), 'w')
+    print(f"Worker {worker}: port {port}, {len(features)} features")
+    process = subprocess.Popen(['behave', '-f', 'json', '-o', report, '-f', 'progress', *features],
+                               env=env, stdout=output, stderr=subprocess.STDOUT)
+    return process, output, report
+
+def merge_reports(report_files, merged_file):
+    """Concatenate the workers' behave JSON reports into one"""
+    merged = []
+    for report in report_files:
+        if os.path.exists(report) and os.path.getsize(report) > 0:
+            with open(report) as f:
+                merged.extend(json.load(f))
+    with open(merged_file, 'w') as f:
+        json.dump(merged, f, indent=2)
+    return merged
+
+def summarize(merged):
+    """Print feature and scenario totals by status; returns True if nothing failed"""
+    features, scenarios = {}, {}
+    for feature in merged:
+        features[feature['status']] = features.get(feature['status'], 0) + 1
+        for element in feature.get('elements', []):
+            if element.get('type') == 'scenario':
+                scenarios[element['status']] = scenarios.get(element['status'], 0) + 1
+    print("Features: " + ", ".join(f"{count} {status}" for status, count in sorted(features.items())))
+    print("Scenarios: " + ", ".join(f"{count} {status}" for status, count in sorted(scenarios.items())))
+    for feature in merged:
+        if feature['status'] in FAILED_STATUSES:
+            print(f"Feature {feature['location']} {feature['status']}.")
+    return not any(status in FAILED_STATUSES for status in (*features, *scenarios))
+
+def print_slowest_scenarios(timings, count=5):
+    slowest = sorted(timings["scenarios"].items(), key=lambda item: -item[1])[:count]
+    print("Slowest scenarios (smoothed):")
+    for scenario, duration in slowest:
+        print(f"  {duration:7.2f}s  {scenario}")
+
+def run_features(directory, workers, order='longest', seed=None):
+    """Order the features, split them across `workers` behave processes, each
+    with its own server, merge their results and update the timing history"""
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    os.makedirs('logs', exist_ok=True)
+    timings = load_timings()
+    ordered = order_features(get_feature_files(directory), order, seed, timings)
+    shards = [features for features in shard(ordered, workers, timings) if features]
+    running = [start_worker(worker, features) for worker, features in enumerate(shards)]
+    for process, output, _ in running:
+        process.wait()
+        output.close()
+    merged = merge_reports([report for _, _, report in running], os.path.join(REPORTS_DIR, 'behave_report.json'))
+    print(f"Merged report written to {os.path.join(REPORTS_DIR, 'behave_report.json')}")
+    save_timings(update_timings(timings, merged))
+    print_slowest_scenarios(timings)
+    return summarize(merged)
 
 if __name__ == "__main__":
-    features_dir = 'features'  # Adjust this path as needed
-    run_features_in_random_order(features_dir)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the behave features, scheduled across parallel workers")
+    parser.add_argument('--features', default='features', help="directory holding the .feature files")
+    parser.add_argument('--order', choices=ORDERS, default='longest',
+                        help="longest: slowest features first (from the timing history); "
+                             "fail-fast: recently failing features first; random: seeded shuffle")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="random-order seed; reuse a printed seed to reproduce a run")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="run features in this many parallel behave processes, each with its own server")
+    args = parser.parse_args()
+
+    seed = None
+    if args.order == 'random':
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        print(f"Random order seed: {seed}")
+    sys.exit(0 if run_features(args.features, args.workers, args.order, seed) else 1)
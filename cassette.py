@@ -0,0 +1,329 @@
+"""Record and replay API traffic made through api_client.
+
+Recording captures every request/response pair into a gzip-compressed JSON
+cassette with an index from request key to positions. Replay answers requests
+from that index without any server, and reports where the requests diverge
+from the recording. Interactions are grouped into chapters (one per test or
+scenario), so a subset of the suite can be replayed on its own.
+
+    cassette = cassette.use("cassettes/pytest.json.gz", "record")
+    cassette.begin("tests/test_todos.py::test_get_all_todos")
+    ...
+    cassette.eject()
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from datetime import timedelta
+import requests
+from requests.structures import CaseInsensitiveDict
+import api_client
+
+CASSETTE_DIR = "cassettes"  # default location for the test suites' cassettes
+CASSETTE_VERSION = 2
+SESSION_CHAPTER = "session"
+# Readiness checks (GET /) are filed apart from the test or scenario they were
+# made in: starting or restarting a server polls it a varying number of times,
+# and replay answers every check from the recording without an order or count
+# check
+READINESS_CHAPTER = "readiness"
+READINESS_PATH = "/"
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+# Response headers that describe the connection or raw encoding rather than
+# the API's answer; the body is stored decoded
+UNRECORDED_HEADERS = ("connection", "keep-alive", "date", "transfer-encoding", "content-encoding",
+                      "content-length")
+
+class CassetteMiss(requests.RequestException):
+    """Raised in replay for a request the cassette has no response for"""
+
+def _body_text(kwargs):
+    if kwargs.get("json") is not None:
+        return json.dumps(kwargs["json"], sort_keys=True)
+    data = kwargs.get("data")
+    if isinstance(data, bytes):
+        return data.decode("utf-8", errors="replace")
+    return data or ""
+
+def _relative(path):
+    """Cassettes hold paths, so a recording can be replayed against any base URL"""
+    if path.startswith(api_client.BASE_URL):
+        return path[len(api_client.BASE_URL):] or "/"
+    return path
+
+def request_key(method, path, accept, body):
+    """What a request is matched on: method, path with query, Accept header
+    and a digest of the body"""
+    digest = hashlib.blake2b(body.encode(), digest_size=8).hexdigest() if body else "-"
+    return f"{method} {path} {accept or '*'} {digest}"
+
+def mark_concurrent(interactions):
+    """Flag interactions whose request overlapped another one in time, such
+    as concurrent seeding or resets. Replay does not check their order."""
+    running_end, holder = None, None
+    for interaction in sorted(interactions, key=lambda interaction: interaction["t"]):
+        if running_end is not None and interaction["t"] < running_end:
+            interaction["concurrent"] = holder["concurrent"] = True
+        if running_end is None or interaction["t_end"] > running_end:
+            running_end, holder = interaction["t_end"], interaction
+
+def build_index(interactions):
+    """Map (chapter, key) to the positions of its interactions, in order"""
+    index = {}
+    for position, interaction in enumerate(interactions):
+        index.setdefault(f"{interaction['chapter']}|{interaction['key']}", []).append(position)
+    return index
+
+def load(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != CASSETTE_VERSION:
+        raise ValueError(f"{path}: unsupported cassette version {data.get('version')}")
+    return data
+
+def to_response(interaction):
+    """Rebuild a requests.Response from a recorded interaction"""
+    response = requests.Response()
+    response.status_code = interaction["status"]
+    response.headers = CaseInsensitiveDict(interaction["response_headers"])
+    response._content = interaction["response"].encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = api_client.url(interaction["path"])
+    response.elapsed = timedelta(0)
+    return response
+
+class Cassette:
+    def __init__(self, path, mode):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.chapter = SESSION_CHAPTER
+        self.started = time.perf_counter()
+        self.interactions = []
+        self.divergences = []
+        if mode == "replay":
+            data = load(path)
+            self.interactions = data["interactions"]
+            self.remaining = {key: deque(positions) for key, positions in data["index"].items()}
+            self.last_served = {}
+            self.out_of_order = set()
+            self.used = set()
+            # Per chapter, positions of the sequential requests in recorded
+            # order; the head is the request the recording says should come next
+            self.expected = {}
+            for position, interaction in enumerate(self.interactions):
+                if not interaction.get("concurrent"):
+                    self.expected.setdefault(interaction["chapter"], deque()).append(position)
+
+    def begin(self, chapter):
+        """Attribute the following requests to a test or scenario"""
+        self.chapter = chapter
+
+    def _diverged(self, kind, key):
+        self.divergences.append({"chapter": self.chapter, "kind": kind, "request": key})
+
+    def _chapter_for(self, method, path):
+        if method in IDEMPOTENT_METHODS and path == READINESS_PATH:
+            return READINESS_CHAPTER
+        return self.chapter
+
+    def layer(self, method, path, kwargs, send):
+        """api_client layer: record the exchange, or answer it from the cassette"""
+        path = _relative(path)
+        headers = kwargs.get("headers") or {}
+        body = _body_text(kwargs)
+        key = request_key(method, path, headers.get("Accept"), body)
+        chapter = self._chapter_for(method, path)
+        if self.mode == "record":
+            offset = time.perf_counter() - self.started
+            response = send(method, path, kwargs)
+            end = time.perf_counter() - self.started
+            kept_headers = {name: value for name, value in headers.items()
+                            if name.lower() in ("accept", "content-type")}
+            if kwargs.get("json") is not None:
+                kept_headers["Content-Type"] = "application/json"
+            with self.lock:
+                self.interactions.append({
+                    "chapter": chapter, "key": key, "t": round(offset, 6), "t_end": round(end, 6),
+                    "method": method, "path": path, "body": body, "headers": kept_headers,
+                    "status": response.status_code,
+                    "response_headers": {name: value for name, value in response.headers.items()
+                                         if name.lower() not in UNRECORDED_HEADERS},
+                    "response": response.text,
+                })
+            return response
+        return to_response(self.interactions[self._replay_position(method, key, chapter)])
+
+    def _replay_position(self, method, key, chapter):
+        chapter_key = f"{chapter}|{key}"
+        with self.lock:
+            queue = self.remaining.get(chapter_key)
+            if queue:
+                position = queue.popleft()
+                if not self.interactions[position].get("concurrent"):
+                    expected = self.expected[chapter]
+                    # One misplaced request shifts every later one, so only the
+                    # first of a chapter is reported
+                    if expected[0] != position and chapter not in self.out_of_order:
+                        self.out_of_order.add(chapter)
+                        self._diverged("out of order", key)
+                    expected.remove(position)
+                self.used.add(position)
+                self.last_served[chapter_key] = position
+                return position
+            # A repeated read gets the last answer again; anything else was
+            # never recorded
+            if method in IDEMPOTENT_METHODS and chapter_key in self.last_served:
+                if chapter != READINESS_CHAPTER:
+                    self._diverged("repeated", key)
+                return self.last_served[chapter_key]
+            self._diverged("unrecorded", key)
+        raise CassetteMiss(f"No recorded response for {key} in {self.chapter}")
+
+    def save(self):
+        mark_concurrent(self.interactions)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            json.dump({"version": CASSETTE_VERSION, "interactions": self.interactions,
+                       "index": build_index(self.interactions)}, f, separators=(",", ":"))
+        print(f"Recorded {len(self.interactions)} interactions to {self.path}")
+
+    def report(self):
+        """Divergences seen during replay, plus recorded requests that were
+        never made. Only chapters that were replayed are checked for unused
+        requests, so replaying part of a suite is not reported as divergent.
+        Readiness checks are never reported."""
+        replayed = {self.interactions[position]["chapter"] for position in self.used}
+        replayed.update(divergence["chapter"] for divergence in self.divergences)
+        replayed.discard(READINESS_CHAPTER)
+        unused = [{"chapter": interaction["chapter"], "kind": "not replayed", "request": interaction["key"]}
+                  for position, interaction in enumerate(self.interactions)
+                  if position not in self.used and interaction["chapter"] in replayed]
+        return self.divergences + unused
+
+    def print_report(self):
+        divergences = self.report()
+        if not divergences:
+            print(f"Replay of {self.path} matched the recording")
+            return
+        print(f"Replay of {self.path} diverged from the recording {len(divergences)} times "
+              f"(see {self.report_file()}):")
+        for divergence in divergences:
+            print(f"  [{divergence['kind']}] {divergence['chapter']}: {divergence['request']}")
+
+    def report_file(self):
+        return self.path.replace(".json.gz", "") + ".divergences.json"
+
+    def eject(self):
+        """Stop intercepting requests. Saves the recording in record mode, and
+        writes the divergence report next to the cassette in replay mode."""
+        api_client.remove_layer(self.layer)
+        if self.mode == "record":
+            self.save()
+            return
+        with open(self.report_file(), "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+def use(path, mode):
+    """Start recording to or replaying from `path` for all api_client requests"""
+    cassette = Cassette(path, mode)
+    api_client.add_layer(cassette.layer)
+    return cassette
+
+# Replaying a cassette as load against a live server. Objects get new IDs
+# there, so IDs from the recording are mapped to the ones the server returns.
+
+# Relationship -> resource its IDs refer to
+RELATIONSHIP_TARGETS = {"categories": "categories", "tasksof": "projects", "tasks": "todos",
+                        "todos": "todos", "projects": "projects"}
+
+# Longest a replayed request waits for the request that creates an object it uses
+DEPENDENCY_TIMEOUT = 10.0
+
+def load_schedule(path):
+    """A cassette's interactions in the order they were recorded"""
+    return sorted(load(path)["interactions"], key=lambda interaction: interaction["t"])
+
+def _response_id(text):
+    """The "id" of a JSON or XML object in a response body, or None"""
+    try:
+        if text.startswith("<"):
+            return ET.fromstring(text).findtext("id")
+        return json.loads(text).get("id")
+    except (ValueError, AttributeError, ET.ParseError):
+        return None
+
+def _created(interaction):
+    """(resource, recorded id) of the object an interaction created, or None"""
+    if interaction["method"] != "POST" or interaction["status"] != 201:
+        return None
+    parts = interaction["path"].split("?")[0].strip("/").split("/")
+    resource = parts[0] if len(parts) == 1 else RELATIONSHIP_TARGETS.get(parts[-1])
+    recorded_id = _response_id(interaction["response"])
+    return (resource, recorded_id) if resource and recorded_id else None
+
+class IdMap:
+    """Recorded ID -> live ID per resource, learned from POST responses.
+
+    A request that uses an object created earlier in the recording waits until
+    that creation has been answered, so replaying faster than recorded does
+    not send it before the object exists.
+    """
+
+    def __init__(self, interactions=()):
+        self.ids = {}
+        self.lock = threading.Lock()
+        self.pending = {}
+        for interaction in interactions:
+            created = _created(interaction)
+            if created:
+                self.pending[created] = threading.Event()
+
+    @staticmethod
+    def _id_resources(parts):
+        """(position, resource) for each path segment that holds an ID"""
+        positions = [(1, parts[0])]
+        if len(parts) >= 4:
+            positions.append((3, RELATIONSHIP_TARGETS.get(parts[2])))
+        return positions
+
+    def _map(self, resource, object_id):
+        created = self.pending.get((resource, object_id))
+        if created is not None:
+            created.wait(DEPENDENCY_TIMEOUT)
+        with self.lock:
+            return self.ids.get((resource, object_id), object_id)
+
+    def rewrite(self, interaction):
+        """The interaction's path and body with recorded IDs replaced"""
+        path, _, query = interaction["path"].partition("?")
+        parts = path.strip("/").split("/")
+        for position, resource in self._id_resources(parts):
+            if len(parts) > position:
+                parts[position] = self._map(resource, parts[position])
+        body = interaction["body"]
+        if len(parts) == 3 and interaction["method"] == "POST" and body.startswith("{"):
+            payload = json.loads(body)
+            if "id" in payload:
+                payload["id"] = self._map(RELATIONSHIP_TARGETS.get(parts[2]), str(payload["id"]))
+                body = json.dumps(payload)
+        return "/" + "/".join(parts) + (f"?{query}" if query else ""), body
+
+    def learn(self, interaction, response):
+        """Remember the live ID of an object the interaction created. Call it
+        with response None when the request failed, to release waiters."""
+        created = _created(interaction)
+        if created is None:
+            return
+        live_id = _response_id(response.text) if response is not None and response.status_code == 201 else None
+        if live_id:
+            with self.lock:
+                self.ids[created] = live_id
+        self.pending[created].set()
@@ -1,13 +1,155 @@
+import os
+import time
+import api_client
+import batch_givens
+import cassette
+import http_metrics
+import latency_budget
+import response_cache
+import seeding
+import setup
 from setup import start_api, is_api_running, stop_api
 
+# Server lifecycle, chosen with `behave -D server=...`:
+#   shared      - start the server once in before_all and reset its data to the
+#                 default fixtures between features (or scenarios, with
+#                 `-D reset=scenario`) by purging and restoring
+#   per-feature - start and stop the server around every feature
+# `-D api=local` starts the Python stand-in (local_api.py) instead of the JAR.
+# `-D cassette=record` records all API traffic to `-D cassette_file=...`;
+# `-D cassette=replay` answers it from that file with no server at all.
+# `-D http_metrics=1` times every API call per scenario and phase, writes
+# HTTP_METRICS_FILE and prints the slowest routes (visible with --no-capture).
+# Scenarios tagged @latency_budget fail when the routes they call exceed their
+# budgets in latency_budgets.json (`-D latency_budgets=...` for another file).
+# The entities of a scenario's leading "Given ... exists" steps are created
+# concurrently before it runs (batch_givens.py); `-D batch_givens=0` leaves
+# each step to create its own.
+# Repeated GETs within a scenario are answered by context.response_cache
+# (response_cache.py) until a write invalidates them; `-D response_cache=0`
+# turns it off, and `with context.response_cache.bypass():` skips it in a step.
+DEFAULT_SERVER_MODE = "shared"
+DEFAULT_CASSETTE_FILE = os.path.join(cassette.CASSETTE_DIR, "behave.json.gz")
+HTTP_METRICS_FILE = os.path.join("reports", "behave_http_metrics.json")
+DEFAULT_RESET = "feature"
+
+def before_all(context):
+    context.server_mode = context.config.userdata.get("server", DEFAULT_SERVER_MODE)
+    context.reset_scope = context.config.userdata.get("reset", DEFAULT_RESET)
+    setup.API_SERVER = context.config.userdata.get("api", setup.API_SERVER)
+    context.cassette = None
+    cassette_mode = context.config.userdata.get("cassette")
+    if cassette_mode:
+        context.cassette = cassette.use(context.config.userdata.get("cassette_file", DEFAULT_CASSETTE_FILE),
+                                        cassette_mode)
+        if cassette_mode == "replay" and context.server_mode != "shared":
+            # Stopping a server cannot be replayed, so replay always runs shared
+            print("Cassette replay uses the shared server mode")
+            context.server_mode = "shared"
+    context.http_metrics = http_metrics.use() if context.config.userdata.get("http_metrics") else None
+    context.response_cache_enabled = context.config.userdata.get("response_cache", "1") != "0"
+    context.response_cache_totals = {"hits": 0, "misses": 0, "invalidations": 0}
+    context.latency_budgets = latency_budget.load_budgets(
+        context.config.userdata.get("latency_budgets", latency_budget.BUDGETS_FILE))
+    if context.server_mode != "shared":
+        return
+    # Kept in a dict so later hooks can swap the process without it being
+    # scoped to a single feature or scenario
+    context.shared_server = {"process": None, "defaults": None}
+    if not is_api_running():
+        context.shared_server["process"] = start_api()
+    assert is_api_running(), "API did not start successfully."
+    context.shared_server["defaults"] = seeding.snapshot()
+
+def after_all(context):
+    if context.server_mode == "shared" and context.shared_server["process"]:
+        stop_api(context.shared_server["process"])
+    if context.response_cache_enabled:
+        print("Response cache: " + ", ".join(f"{count} {kind}"
+                                             for kind, count in context.response_cache_totals.items()))
+    if context.http_metrics:
+        http_metrics.stop(context.http_metrics)
+        context.http_metrics.save(HTTP_METRICS_FILE)
+        context.http_metrics.report()
+    if context.cassette:
+        context.cassette.eject()
+        if context.cassette.mode == "replay":
+            context.cassette.print_report()
+
+def scenario_id(scenario):
+    return f"{scenario.filename}:{scenario.line} {scenario.name}"
+
+def reset_shared_server(context):
+    """Restore the default fixtures, restarting the server if one of them was
+    deleted (the API cannot recreate an object with its original ID)."""
+    shared = context.shared_server
+    if seeding.restore(shared["defaults"]):
+        return
+    if shared["process"] is None:
+        print("Warning: a default fixture was deleted and the server was not started by behave, "
+              "so it cannot be restarted")
+        return
+    print("A default fixture was deleted, restarting the API...")
+    stop_api(shared["process"])
+    shared["process"] = start_api()
+    assert is_api_running(), "API did not restart successfully."
+
 def before_scenario(context, scenario):
     print(f"\nStarting scenario: {scenario.name}")
+    if context.cassette:
+        context.cassette.begin(scenario_id(scenario))
+    if context.http_metrics:
+        context.http_metrics.begin(scenario_id(scenario), "setup")
+    if context.server_mode == "shared" and context.reset_scope == "scenario":
+        reset_shared_server(context)
+    context.prepared_givens = None
+    if context.config.userdata.get("batch_givens", "1") != "0":
+        context.prepared_givens = batch_givens.materialize(scenario.all_steps)
+    context.latency_probe = None
+    # Replayed latencies mean nothing, and extra calls would not match a recording
+    if latency_budget.MARKER in scenario.effective_tags and not context.cassette:
+        context.latency_probe = latency_budget.use(context.latency_budgets)
+    # Added last so it is the outermost layer: a hit sends nothing further
+    context.response_cache = (response_cache.use() if context.response_cache_enabled
+                              else response_cache.ResponseCache())
 
 def after_scenario(context, scenario):
     print(f"\nFinished scenario: {scenario.name}")
+    response_cache.stop(context.response_cache)
+    for kind, count in context.response_cache.stats().items():
+        context.response_cache_totals[kind] += count
+    if context.latency_probe:
+        if scenario.status == "passed":
+            failures = latency_budget.measure(context.latency_probe)
+            assert not failures, "Latency budget exceeded:\n  " + "\n  ".join(failures)
+        else:
+            api_client.remove_layer(context.latency_probe.layer)
+    if context.http_metrics:
+        context.http_metrics.begin(scenario_id(scenario), "teardown")
+        for step in scenario.all_steps:
+            context.http_metrics.add_duration(scenario_id(scenario), step_phase(step), step.duration)
+
+def step_phase(step):
+    """Given steps (Background included) build fixtures; When/Then are the body"""
+    return "setup" if step.step_type == "given" else "call"
+
+def before_step(context, step):
+    if context.http_metrics:
+        context.http_metrics.begin(scenario_id(context.scenario), step_phase(step))
 
 def before_feature(context, feature):
     print(f"Starting feature: {feature.name}")
+    if context.cassette:
+        context.cassette.begin(feature.filename)
+    if context.http_metrics:
+        context.http_metrics.begin(feature.filename, "setup")
+    if context.server_mode == "shared":
+        if context.reset_scope == "feature":
+            start = time.perf_counter()
+            reset_shared_server(context)
+            if context.http_metrics:
+                context.http_metrics.add_duration(feature.filename, "setup", time.perf_counter() - start)
+        return
     # Start the API server before each feature
     if not is_api_running():
         context.api_process = start_api()
@@ -15,9 +157,11 @@ def before_feature(context, feature):
 
 def after_feature(context, feature):
     print(f"Finishing feature: {feature.name}")
+    if context.server_mode == "shared":
+        return
     # Stop the API server after each feature
     if hasattr(context, 'api_process') and context.api_process:
         stop_api(context.api_process)
     else:
         print("No API process found to stop.")
-    assert not is_api_running(), "API did not stop successfully."
\ No newline at end of file
+    assert not is_api_running(), "API did not stop successfully."
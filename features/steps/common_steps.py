@@ -1,9 +1,17 @@
 import re
-import requests
+import api_client
+import batch_givens
 from behave import given, when, then
 from setup import start_api, is_api_running
 
-BASE_URL = "http://localhost:4567"
+def create_entity(context, path, payload):
+    """The object a creation step prepared in before_scenario, or a new one"""
+    created = batch_givens.take(context.prepared_givens, path, payload)
+    if created is not None:
+        return created
+    response = api_client.post(path, json=payload)
+    assert response.status_code == 201, f"{path[1:-1].capitalize()} creation failed: {response.status_code}"
+    return response.json()
 
 # Common setup step
 @given('the server is running')
@@ -15,26 +23,17 @@ def step_impl_server(context):
 # Generic todo with title pattern
 @given(re.compile(r'^a todo with title "(?P<title>[^"]+)" exists$'))
 def step_impl_todo_title(context, title):
-    payload = {"title": title}
-    response = requests.post(f"{BASE_URL}/todos", json=payload)
-    assert response.status_code == 201, f"Todo creation failed: {response.status_code}"
-    context.todo = response.json()
+    context.todo = create_entity(context, "/todos", {"title": title})
 
 # Generic todo with title and description pattern
 @given(re.compile(r'^a todo with title "(?P<title>[^"]+)" and description "(?P<description>[^"]+)" exists$'))
 def step_impl_todo_title_desc(context, title, description):
-    payload = {"title": title, "description": description}
-    response = requests.post(f"{BASE_URL}/todos", json=payload)
-    assert response.status_code == 201, f"Todo creation failed: {response.status_code}"
-    context.todo = response.json()
+    context.todo = create_entity(context, "/todos", {"title": title, "description": description})
 
 # Generic project creation
 @given(re.compile(r'^a project with title "(?P<title>[^"]+)" exists$'))
 def step_impl_project(context, title):
-    payload = {"title": title}
-    response = requests.post(f"{BASE_URL}/projects", json=payload)
-    assert response.status_code == 201, f"Project creation failed: {response.status_code}"
-    context.project = response.json()
+    context.project = create_entity(context, "/projects", {"title": title})
 
 # Notification assertions
 @then('the user is notified of the successful creation')
@@ -263,15 +262,15 @@ def step_impl_release_management_project(context):
 
 @given('a project with id {project_id} already exists')
 def step_given_project_exists(context, project_id):
-    response = requests.get(f"{BASE_URL}/projects/{project_id}")
-    print(f"{BASE_URL}/projects/{project_id}")
+    response = api_client.get(f"/projects/{project_id}")
+    print(api_client.url(f"/projects/{project_id}"))
     print(response.status_code)
     context.response = response
     assert response.status_code == 200, f"Expected project with id {project_id} to exist, but it does not."
 
 @given('no project with id {project_id} exists')
 def step_given_no_project_exists(context, project_id):
-    response = requests.get(f"{BASE_URL}/projects/{project_id}")
+    response = api_client.get(f"/projects/{project_id}")
     print(response.status_code)
     context.response = response
     assert response.status_code == 404, f"Expected project with id {project_id} to not exist, but it does."
@@ -1,15 +1,13 @@
-import requests
+import api_client
 from behave import when, then, given
 
-BASE_URL = "http://localhost:4567"
-
 @given('a task with id {task_id} is assigned to the project with id {project_id}')
 def step_given_task_assigned_to_project(context, task_id, project_id):
     context.project_id = project_id
     context.task_id = task_id
     
     # Get all tasks for the project
-    response = requests.get(f"{BASE_URL}/projects/{project_id}/tasks")
+    response = api_client.get(f"/projects/{project_id}/tasks")
     context.response = response
     assert 200 <= response.status_code < 300, f"Failed to get tasks for project with ID {project_id}"
 
@@ -21,14 +19,14 @@ def step_given_task_assigned_to_project(context, task_id, project_id):
 
 @when('the user checks the tasks assigned to the project with id {project_id}')
 def step_when_check_tasks(context, project_id):
-    response = requests.get(f"{BASE_URL}/projects/{project_id}/tasks")
+    response = api_client.get(f"/projects/{project_id}/tasks")
     context.response = response
     context.tasks = response.json().get("todos", [])
 
 @when('the user retrieves the task with id {task_id} from the project with id {project_id}')
 def step_when_get_task_by_id(context, task_id, project_id):
     # Get the tasks for the project
-    response = requests.get(f"{BASE_URL}/projects/{project_id}/tasks")
+    response = api_client.get(f"/projects/{project_id}/tasks")
     context.response = response
     todos = response.json().get("todos", [])
     # Find the specific task by ID
@@ -50,6 +48,6 @@ def step_then_task_displayed(context):
 
 @when('the user tries to check the task with {nonexistent_task_id} assigned to the project with id {project_id}')
 def step_when_check_nonexistent_task(context, nonexistent_task_id, project_id):
-    response = requests.get(f"{BASE_URL}/projects/{project_id}/tasks/{nonexistent_task_id}")
+    response = api_client.get(f"/projects/{project_id}/tasks/{nonexistent_task_id}")
     context.response = response
     
\ No newline at end of file
@@ -1,7 +1,6 @@
 from behave import when, then, given
-import requests
+import api_client
 import re
-BASE_URL = "http://localhost:4567/todos"
 
 @when('a user creates a todo with title {title} and description {description}')
 def step_impl_create_todo(context, title, description):
@@ -9,21 +8,21 @@ def step_impl_create_todo(context, title, description):
         "title": title.strip('"'),
         "description": description.strip('"')
     }
-    context.response = requests.post(BASE_URL, json=payload)
+    context.response = api_client.post("/todos", json=payload)
 
 @when('a user creates a todo with only title {title}')
 def step_impl_create_todo_only_title(context, title):
     payload = {"title": title.strip('"')}
-    context.response = requests.post(BASE_URL, json=payload)
+    context.response = api_client.post("/todos", json=payload)
 
 @when('a user tries to create a todo with description {description} but no title')
 def step_impl_create_todo_no_title(context, description):
     payload = {"description": description.strip('"')}
-    context.response = requests.post(BASE_URL, json=payload)
+    context.response = api_client.post("/todos", json=payload)
 
 @then('the todo with title {title} is created with the correct details')
 def step_impl_check_todo_created(context, title):
-    response = requests.get(BASE_URL)
+    response = api_client.get("/todos")
     todos = response.json()["todos"]
     created_todo = next((t for t in todos if t["title"] == title.strip('"')), None)
     assert created_todo is not None, f"Todo with title '{title}' not found"
@@ -31,7 +30,7 @@ def step_impl_check_todo_created(context, title):
 
 @then('the todo has an empty description')
 def step_impl_check_empty_description(context):
-    todos = requests.get(BASE_URL).json()["todos"]
+    todos = api_client.get("/todos").json()["todos"]
     created_todo = next((t for t in todos if t["id"] == context.response.json()["id"]), None)
     assert created_todo is not None, "Created todo not found"
     assert created_todo.get("description", "") == "", f"Expected empty description, got '{created_todo.get('description', '')}'"
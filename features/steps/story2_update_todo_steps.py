@@ -1,16 +1,14 @@
 from behave import when, then
-import requests
+import api_client
 import xml.etree.ElementTree as ET
 
-BASE_URL = "http://localhost:4567/todos"
-
 @when('the user updates the todo with new title {new_title} and new description {new_description}')
 def step_impl_update_todo(context, new_title, new_description):
     payload = {
         "title": new_title.strip('"'),
         "description": new_description.strip('"')
     }
-    context.response = requests.put(f"{BASE_URL}/{context.todo['id']}", json=payload)
+    context.response = api_client.put(f"/todos/{context.todo['id']}", json=payload)
 
 @then('the todo with new title {new_title} is updated with the correct details')
 def step_impl_check_updated_todo(context, new_title):
@@ -26,7 +24,7 @@ def step_impl_check_updated_todo(context, new_title):
             updated_todo = updated_todo["todos"][0]
     except:
         # If that fails, fetch the todo
-        response = requests.get(f"{BASE_URL}/{context.todo['id']}")
+        response = api_client.get(f"/todos/{context.todo['id']}")
         assert response.status_code == 200, f"Failed to get todo: {response.status_code}"
         updated_todo = response.json()
         if "todos" in updated_todo:
@@ -48,7 +46,7 @@ def step_impl_update_todo_xml(context, title, description):
         <description>{description.strip('"')}</description>
     </todo>
     """
-    context.response = requests.put(f"{BASE_URL}/{context.todo['id']}", 
+    context.response = api_client.put(f"/todos/{context.todo['id']}", 
                                   headers=headers, 
                                   data=xml_data)
 
@@ -67,7 +65,7 @@ def step_impl_check_updated_todo_by_title(context, title):
             print(f"Error parsing XML: {e}")
     
     # If not XML or parsing failed, fetch the todo directly
-    response = requests.get(f"{BASE_URL}/{context.todo['id']}")
+    response = api_client.get(f"/todos/{context.todo['id']}")
     assert response.status_code == 200, f"Failed to get todo: {response.status_code}"
     
     updated_todo = response.json()
@@ -95,4 +93,4 @@ def step_impl_update_nonexistent_todo(context, invalid_id):
     }
     # Clean the invalid_id by stripping any extraneous quotes
     clean_invalid_id = invalid_id.strip('"')
-    context.response = requests.put(f"{BASE_URL}/{clean_invalid_id}", json=payload)
\ No newline at end of file
+    context.response = api_client.put(f"/todos/{clean_invalid_id}", json=payload)
\ No newline at end of file
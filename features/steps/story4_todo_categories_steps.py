@@ -1,19 +1,18 @@
 from behave import given, when, then
-import requests
+import api_client
 import re
-
-BASE_URL = "http://localhost:4567"
+from common_steps import create_entity
 
 def step_impl(context, title):
     payload = {"title": title}
-    response = requests.post(f"{BASE_URL}/categories", json=payload)
+    response = api_client.post("/categories", json=payload)
     assert response.status_code == 201
     context.category = response.json()
 
 @when('the user adds the category to the todo')
 def step_impl(context):
-    context.response = requests.post(
-        f"{BASE_URL}/todos/{context.todo['id']}/categories",
+    context.response = api_client.post(
+        f"/todos/{context.todo['id']}/categories",
         json={"id": context.category['id']}
     )
 
@@ -23,13 +22,13 @@ def step_impl(context):
 
 @then('the todo\'s categories include "{category_title}"')
 def step_impl(context, category_title):
-    response = requests.get(f"{BASE_URL}/todos/{context.todo['id']}/categories")
+    response = api_client.get(f"/todos/{context.todo['id']}/categories")
     categories = response.json()["categories"]
     assert any(cat["title"] == category_title for cat in categories)
 
 @when('the user requests the todo\'s categories')
 def step_impl(context):
-    context.response = requests.get(f"{BASE_URL}/todos/{context.todo['id']}/categories")
+    context.response = api_client.get(f"/todos/{context.todo['id']}/categories")
 
 @then('the response includes the category "{category_title}"')
 def step_impl(context, category_title):
@@ -39,17 +38,14 @@ def step_impl(context, category_title):
 
 @when('the user tries to add a category with id {invalid_id} to the todo')
 def step_impl(context, invalid_id):
-    context.response = requests.post(
-        f"{BASE_URL}/todos/{context.todo['id']}/categories",
+    context.response = api_client.post(
+        f"/todos/{context.todo['id']}/categories",
         json={"id": invalid_id.strip('"')}
     )
 
 @given(re.compile(r'^a category with title "(?P<title>[^"]+)" exists$'))
 def step_impl_category(context, title):
-    payload = {"title": title}
-    response = requests.post(f"{BASE_URL}/categories", json=payload)
-    assert response.status_code == 201, f"Category creation failed: {response.status_code}"
-    context.category = response.json()
+    context.category = create_entity(context, "/categories", {"title": title})
 
 @given('a category with title "Test Category" exists')
 def step_impl_test_category(context):
@@ -1,18 +1,16 @@
 from behave import when, then
-import requests
-
-BASE_URL = "http://localhost:4567"
+import api_client
 
 def step_impl(context, title):
     payload = {"title": title}
-    response = requests.post(f"{BASE_URL}/projects", json=payload)
+    response = api_client.post("/projects", json=payload)
     assert response.status_code == 201
     context.project = response.json()
 
 @when('the user adds the todo to the project')
 def step_impl(context):
-    context.response = requests.post(
-        f"{BASE_URL}/todos/{context.todo['id']}/tasksof",
+    context.response = api_client.post(
+        f"/todos/{context.todo['id']}/tasksof",
         json={"id": context.project['id']}
     )
 
@@ -22,13 +20,13 @@ def step_impl(context):
 
 @then('the project\'s tasks include the todo')
 def step_impl(context):
-    response = requests.get(f"{BASE_URL}/projects/{context.project['id']}/tasks")
+    response = api_client.get(f"/projects/{context.project['id']}/tasks")
     tasks = response.json()["todos"]
     assert any(task["id"] == context.todo["id"] for task in tasks)
 
 @when('the user requests the project\'s tasks')
 def step_impl(context):
-    context.response = requests.get(f"{BASE_URL}/projects/{context.project['id']}/tasks")
+    context.response = api_client.get(f"/projects/{context.project['id']}/tasks")
 
 @then('the response includes the todo')
 def step_impl(context):
@@ -38,7 +36,7 @@ def step_impl(context):
 
 @when('the user tries to add the todo to a project with id {invalid_id}')
 def step_impl(context, invalid_id):
-    context.response = requests.post(
-        f"{BASE_URL}/todos/{context.todo['id']}/tasksof",
+    context.response = api_client.post(
+        f"/todos/{context.todo['id']}/tasksof",
         json={"id": invalid_id.strip('"')}
     )
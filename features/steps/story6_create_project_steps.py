@@ -1,7 +1,4 @@
-import requests
-
-BASE_URL = "http://localhost:4567/projects"
-
+import api_client
 from behave import when, then
 
 @when('a user creates a project with title {title}, description {description}, and active status {active}')
@@ -11,7 +8,7 @@ def step_when_create_project_with_details(context, title, description, active):
         "description": description,
         "active": active.lower() == "true"  # Convert string to boolean
     }
-    response = requests.post(f"{BASE_URL}", json=payload)
+    response = api_client.post("/projects", json=payload)
     context.response = response
     print(context.response.status_code)
     context.created_project = response.json() if response.status_code == 201 else None
@@ -21,7 +18,7 @@ def step_when_create_project_with_title(context, title):
     payload = {
         "title": title
     }
-    response = requests.post(f"{BASE_URL}", json=payload)
+    response = api_client.post("/projects", json=payload)
     context.response = response
     context.created_project = response.json() if response.status_code == 201 else None
 
@@ -33,7 +30,7 @@ def step_when_create_project_with_id(context, project_id, title, description, ac
         "description": description,
         "active": active.lower() == "true"  # Convert string to boolean
     }
-    response = requests.post(f"{BASE_URL}/projects", json=payload)
+    response = api_client.post("/projects", json=payload)
     context.response = response
 
 @then('the project with title {title} is created with the correct details')
@@ -1,8 +1,6 @@
-import requests
+import api_client
 from behave import when, then
 
-BASE_URL = "http://localhost:4567"
-
 @when(u'the user updates the project with id {project_id} with new name {title}, content {description}, and status {active}')
 def step_impl(context, project_id, title, description, active):
     payload = {
@@ -10,7 +8,7 @@ def step_impl(context, project_id, title, description, active):
         "description": description,
         "active": active.lower() == "true"
     }
-    response = requests.put(f"{BASE_URL}/projects/{project_id}", json=payload)
+    response = api_client.put(f"/projects/{project_id}", json=payload)
     context.response = response
     context.updated_project = response.json() if 200 <= context.response.status_code < 300 else None
     # Store parameters for later validation
@@ -31,7 +29,7 @@ def step_impl(context, existing_id, title):
     payload = {
         "title": title
     }
-    response = requests.put(f"{BASE_URL}/projects/{existing_id}", json=payload)
+    response = api_client.put(f"/projects/{existing_id}", json=payload)
     context.response = response
     print(context.response.status_code)
     context.updated_project = response.json() if 200 <= context.response.status_code < 300 else None
@@ -53,7 +51,7 @@ def step_impl(context, project_id, title, description, active):
         "description": description,
         "active": active.lower() == "true"
     }
-    response = requests.put(f"{BASE_URL}/projects/{project_id}", json=payload)
+    response = api_client.put(f"/projects/{project_id}", json=payload)
     context.response = response
     print(context.response.status_code)
     context.updated_project = response.json() if 200 <= context.response.status_code < 300 else None
\ No newline at end of file
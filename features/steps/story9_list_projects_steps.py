@@ -1,11 +1,9 @@
-import requests
+import api_client
 from behave import when, then
 
-BASE_URL = "http://localhost:4567"
-
 @when('the user requests the list of projects')
 def step_when_request_list_projects(context):
-    response = requests.get(f"{BASE_URL}/projects")
+    response = api_client.get("/projects")
     context.response = response
     print(f"List projects response status code: {context.response.status_code}")
     context.project_list = response.json()["projects"] if 200 <= response.status_code < 300 else []
@@ -15,7 +13,7 @@ def step_when_filter_projects_by_status(context, status):
     # Construct the query parameter
     query_params = {"active": status}
     
-    response = requests.get(f"{BASE_URL}/projects", params=query_params)
+    response = api_client.get("/projects", params=query_params)
     context.response = response
     context.filtered_projects = response.json()["projects"] if 200 <= response.status_code < 300 else []
 
@@ -2,6 +2,7 @@ Feature: List projects
     As a user, I want to view a list of projects and filter them by their various fields.
 
     # Normal Flow: Successfully list all projects
+    @latency_budget
     Scenario: List all projects
         When the user requests the list of projects
         Then all projects are displayed
@@ -0,0 +1,138 @@
+"""Per-call HTTP instrumentation for the functional test suites.
+
+A layer on api_client records every call's method, normalized route (e.g.
+/todos/{id}/categories), status, response bytes and latency, together with
+the test or scenario that made it and the phase it was made in: "setup"
+(fixtures, hooks, Given steps), "call" (the test body, When/Then steps) or
+"teardown". At the end of a run, report() prints the slowest routes and the
+tests whose setup and teardown take longest, and save() writes a JSON summary.
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+import api_client
+
+PHASES = ("setup", "call", "teardown")
+OUTSIDE_TESTS = "session"
+REPORT_ROWS = 10
+
+_ID_SEGMENT = re.compile(r"^\d+$")
+
+def normalize_route(path):
+    """/todos/12/categories/3?title=x -> /todos/{id}/categories/{id}"""
+    path = path.split("?", 1)[0]
+    if path.startswith(("http://", "https://")):
+        path = "/" + path.split("/", 3)[-1] if path.count("/") >= 3 else "/"
+    segments = ["{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.strip("/").split("/")]
+    return "/" + "/".join(segment for segment in segments if segment)
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+def latency_stats(latencies_ms):
+    ordered = sorted(latencies_ms)
+    return {
+        "count": len(ordered),
+        "total_ms": sum(ordered),
+        "avg_ms": sum(ordered) / len(ordered) if ordered else 0,
+        "p50_ms": percentile(ordered, 50),
+        "p95_ms": percentile(ordered, 95),
+        "max_ms": ordered[-1] if ordered else 0,
+    }
+
+class CallLog:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = []
+        self.owner = OUTSIDE_TESTS
+        self.phase = "setup"
+        # owner -> phase -> wall seconds, as reported by the test runner
+        self.durations = {}
+
+    def begin(self, owner, phase):
+        """Attribute the following calls to a test or scenario and phase. Not
+        thread-local, so calls from worker threads (seeding) count too."""
+        self.owner = owner
+        self.phase = phase
+
+    def add_duration(self, owner, phase, seconds):
+        phases = self.durations.setdefault(owner, {})
+        phases[phase] = phases.get(phase, 0) + seconds
+
+    def layer(self, method, path, kwargs, send):
+        """api_client layer timing each call"""
+        owner, phase = self.owner, self.phase
+        start = time.perf_counter()
+        status, size = None, 0
+        try:
+            response = send(method, path, kwargs)
+            status, size = response.status_code, len(response.content)
+            return response
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            with self.lock:
+                self.calls.append({"owner": owner, "phase": phase, "method": method,
+                                   "route": normalize_route(path), "status": status,
+                                   "bytes": size, "latency_ms": latency_ms})
+
+    def summary(self):
+        by_route = {}
+        by_owner = {}
+        for call in self.calls:
+            route = by_route.setdefault(f"{call['method']} {call['route']}",
+                                        {"latencies": [], "bytes": 0, "statuses": {}})
+            route["latencies"].append(call["latency_ms"])
+            route["bytes"] += call["bytes"]
+            status = str(call["status"])
+            route["statuses"][status] = route["statuses"].get(status, 0) + 1
+            owner = by_owner.setdefault(call["owner"], {phase: {"calls": 0, "http_ms": 0} for phase in PHASES})
+            owner[call["phase"]]["calls"] += 1
+            owner[call["phase"]]["http_ms"] += call["latency_ms"]
+        routes = {key: dict(latency_stats(route["latencies"]), bytes=route["bytes"], statuses=route["statuses"])
+                  for key, route in by_route.items()}
+        tests = {}
+        for owner in set(by_owner) | set(self.durations):
+            http = by_owner.get(owner, {phase: {"calls": 0, "http_ms": 0} for phase in PHASES})
+            wall = self.durations.get(owner, {})
+            tests[owner] = {phase: dict(http[phase], wall_ms=wall.get(phase, 0) * 1000) for phase in PHASES}
+        return {
+            "calls": len(self.calls),
+            "http_ms": sum(call["latency_ms"] for call in self.calls),
+            "routes": dict(sorted(routes.items(), key=lambda item: -item[1]["total_ms"])),
+            "tests": tests,
+        }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def report(self, write=print, rows=REPORT_ROWS):
+        summary = self.summary()
+        write(f"{summary['calls']} HTTP calls, {summary['http_ms'] / 1000:.2f}s in total")
+        write("Slowest routes (by total time):")
+        write(f"  {'route':<40} {'calls':>6} {'total ms':>9} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} {'bytes':>9}")
+        for key, route in list(summary["routes"].items())[:rows]:
+            write(f"  {key:<40} {route['count']:>6} {route['total_ms']:>9.1f} {route['p50_ms']:>7.1f} "
+                  f"{route['p95_ms']:>7.1f} {route['max_ms']:>7.1f} {route['bytes']:>9}")
+        write("Slowest tests, setup/body/teardown (wall ms, HTTP ms in brackets):")
+        tests = sorted(summary["tests"].items(),
+                       key=lambda item: -sum(max(phase["wall_ms"], phase["http_ms"]) for phase in item[1].values()))
+        for owner, phases in tests[:rows]:
+            split = " / ".join(f"{phases[phase]['wall_ms']:.0f} ({phases[phase]['http_ms']:.0f})" for phase in PHASES)
+            write(f"  {split}  {owner}")
+
+def use():
+    """Start recording every api_client call"""
+    log = CallLog()
+    api_client.add_layer(log.layer)
+    return log
+
+def stop(log):
+    api_client.remove_layer(log.layer)
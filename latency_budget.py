@@ -0,0 +1,111 @@
+"""Latency budgets for API routes, checked by marked tests and tagged scenarios.
+
+Budgets live in one JSON file keyed by "METHOD /route" (IDs normalized as in
+http_metrics), for example
+
+    {"GET /todos/{id}": {"p95_ms": 20, "calls": 50, "warmup": 5}}
+
+A Probe records every call a test makes to a budgeted route. At the end of the
+test, idempotent requests are repeated until the route has `warmup + calls`
+samples; the first `warmup` are dropped and the percentile of the rest is
+compared with the budget. Requests that change data are never repeated, so a
+budget on one is checked against the calls the test made itself.
+"""
+import json
+import os
+import threading
+import time
+import api_client
+from http_metrics import normalize_route, percentile
+
+BUDGETS_FILE = os.environ.get("TODO_API_BUDGETS",
+                              os.path.join(os.path.dirname(os.path.abspath(__file__)), "latency_budgets.json"))
+DEFAULT_CALLS = 50
+DEFAULT_WARMUP = 5
+REPEATABLE_METHODS = ("GET", "HEAD", "OPTIONS")
+MARKER = "latency_budget"  # pytest marker and behave tag
+
+def load_budgets(path=BUDGETS_FILE):
+    with open(path) as f:
+        budgets = json.load(f)
+    for route_key, budget in budgets.items():
+        limits = [key for key in budget if key.startswith("p") and key.endswith("_ms")]
+        if not limits:
+            raise ValueError(f"{path}: budget for {route_key} has no pNN_ms limit")
+    return budgets
+
+def _limits(budget):
+    """(percentile, limit ms) pairs of a budget, e.g. p95_ms -> (95, 20)"""
+    return [(float(key[1:-3]), limit) for key, limit in sorted(budget.items())
+            if key.startswith("p") and key.endswith("_ms")]
+
+class Probe:
+    """api_client layer sampling the latency of budgeted routes"""
+
+    def __init__(self, budgets, routes=None):
+        # Only the routes a marker names, or every budgeted route by default
+        self.budgets = {key: budget for key, budget in budgets.items() if routes is None or key in routes}
+        self.named = routes is not None
+        self.missing = [key for key in routes or () if key not in budgets]
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.last_request = {}
+
+    def layer(self, method, path, kwargs, send):
+        route_key = f"{method} {normalize_route(path)}"
+        if route_key not in self.budgets:
+            return send(method, path, kwargs)
+        start = time.perf_counter()
+        response = send(method, path, kwargs)
+        latency_ms = (time.perf_counter() - start) * 1000
+        with self.lock:
+            self.samples.setdefault(route_key, []).append(latency_ms)
+            self.last_request[route_key] = (method, path, dict(kwargs))
+        return response
+
+    def top_up(self):
+        """Repeat the last idempotent request of each budgeted route until it
+        has enough samples. Must run while the layer is installed."""
+        for route_key, (method, path, kwargs) in list(self.last_request.items()):
+            if method not in REPEATABLE_METHODS:
+                continue
+            budget = self.budgets[route_key]
+            needed = budget.get("warmup", DEFAULT_WARMUP) + budget.get("calls", DEFAULT_CALLS)
+            for _ in range(needed - len(self.samples[route_key])):
+                api_client.request(method, path, **kwargs)
+
+    def check(self):
+        """Messages for every budget that was exceeded or could not be measured"""
+        failures = [f"{route_key}: no latency budget in {BUDGETS_FILE}" for route_key in self.missing]
+        for route_key, budget in self.budgets.items():
+            samples = self.samples.get(route_key)
+            if samples is None:
+                # Without named routes, budgets only apply to the routes the test used
+                if self.named:
+                    failures.append(f"{route_key}: never called")
+                continue
+            warmup = budget.get("warmup", DEFAULT_WARMUP)
+            measured = sorted(samples[warmup:warmup + budget.get("calls", DEFAULT_CALLS)])
+            if not measured:
+                failures.append(f"{route_key}: only {len(samples)} calls, all within the {warmup} warm-up calls")
+                continue
+            for pct, limit in _limits(budget):
+                value = percentile(measured, pct)
+                if value > limit:
+                    failures.append(f"{route_key}: p{pct:g} {value:.1f} ms over the {limit} ms budget "
+                                    f"({len(measured)} calls after {warmup} warm-up)")
+        return failures
+
+def measure(probe):
+    """Top up the samples and return the budget failures; the probe is removed"""
+    try:
+        probe.top_up()
+    finally:
+        api_client.remove_layer(probe.layer)
+    return probe.check()
+
+def use(budgets, routes=None):
+    """Start sampling budgeted routes (all of them, or only `routes`)"""
+    probe = Probe(budgets, routes)
+    api_client.add_layer(probe.layer)
+    return probe
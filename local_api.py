@@ -0,0 +1,412 @@
+"""Pure-Python stand-in for the Todo Manager REST API (runTodoManagerRestAPI-1.5.5.jar).
+
+Implements /todos, /projects and /categories with the tasks/tasksof,
+todos/categories and projects/categories relationship endpoints (each pair
+kept in step on both sides), JSON and XML content negotiation, the JAR's
+default fixtures and the status codes the tests rely on. It starts in well
+under a second, so client logic can be checked without Java:
+
+    python local_api.py --port 4567
+
+or select it with TODO_API_SERVER=local wherever setup.start_api is used.
+"""
+import argparse
+import json
+import threading
+import xml.etree.ElementTree as ET
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+
+# Fields of each resource with their defaults; booleans must be sent as booleans
+FIELDS = {
+    "todos": {"title": "", "doneStatus": False, "description": ""},
+    "projects": {"title": "", "completed": False, "active": False, "description": ""},
+    "categories": {"title": "", "description": ""},
+}
+MANDATORY = {"todos": ("title",), "categories": ("title",)}
+SINGULAR = {"todos": "todo", "projects": "project", "categories": "category"}
+
+# (resource, relationship) -> (target resource, relationship on the target that
+# mirrors it, or None for one-way relationships)
+RELATIONSHIPS = {
+    ("todos", "tasksof"): ("projects", "tasks"),
+    ("projects", "tasks"): ("todos", "tasksof"),
+    ("todos", "categories"): ("categories", "todos"),
+    ("categories", "todos"): ("todos", "categories"),
+    ("projects", "categories"): ("categories", "projects"),
+    ("categories", "projects"): ("projects", "categories"),
+}
+
+# The data the JAR starts with
+DEFAULTS = {
+    "todos": [{"title": "scan paperwork"}, {"title": "file paperwork"}],
+    "projects": [{"title": "Office Work"}],
+    "categories": [{"title": "Office"}, {"title": "Home"}],
+}
+DEFAULT_LINKS = [("projects", "1", "tasks", "1"), ("projects", "1", "tasks", "2")]
+
+LISTEN_BACKLOG = 256
+
+ALLOW = {
+    1: "OPTIONS, GET, HEAD, POST",
+    2: "OPTIONS, GET, HEAD, POST, PUT, DELETE",
+    3: "OPTIONS, GET, HEAD, POST",
+    4: "OPTIONS, DELETE",
+}
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def _render_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+class Store:
+    """In-memory objects indexed by id and by title.
+
+    Relationships are kept as insertion-ordered dicts of target ids; two-way
+    relationships (tasks/tasksof, categories/todos, categories/projects) are
+    updated on both sides.
+    """
+
+    def __init__(self, defaults=True):
+        self.lock = threading.RLock()
+        self.things = {resource: {} for resource in FIELDS}
+        self.titles = {resource: {} for resource in FIELDS}
+        self.next_id = {resource: 1 for resource in FIELDS}
+        self.links = {key: {} for key in RELATIONSHIPS}
+        if defaults:
+            for resource, objects in DEFAULTS.items():
+                for fields in objects:
+                    self.create(resource, fields)
+            for link in DEFAULT_LINKS:
+                self.link(*link)
+
+    def _find(self, resource, object_id):
+        obj = self.things[resource].get(object_id)
+        if obj is None:
+            raise ApiError(404, f"Could not find an instance with {resource}/{object_id}")
+        return obj
+
+    def _index_title(self, resource, object_id, old_title, new_title):
+        if old_title is not None:
+            ids = self.titles[resource][old_title]
+            ids.discard(object_id)
+            if not ids:
+                del self.titles[resource][old_title]
+        if new_title is not None:
+            self.titles[resource].setdefault(new_title, set()).add(object_id)
+
+    def validate(self, resource, body, creating):
+        """Check a request body against the resource's fields and return the
+        values to store, raising ApiError(400) like the JAR does"""
+        fields = {}
+        for key, value in body.items():
+            if key == "id":
+                if creating:
+                    raise ApiError(400, "Invalid Creation: Failed Validation: Not allowed to create with id")
+                continue
+            if key not in FIELDS[resource]:
+                raise ApiError(400, f"Could not find field: {key}")
+            if isinstance(FIELDS[resource][key], bool):
+                if not isinstance(value, bool):
+                    raise ApiError(400, f"Failed Validation: {key} should be BOOLEAN")
+            else:
+                value = "" if value is None else str(value)
+            fields[key] = value
+        for key in MANDATORY.get(resource, ()):
+            if creating and key not in fields:
+                raise ApiError(400, f"{key} : field is mandatory")
+            if key in fields and fields[key] == "":
+                raise ApiError(400, f"Failed Validation: {key} : can not be empty")
+        return fields
+
+    def create(self, resource, body):
+        fields = self.validate(resource, body, creating=True)
+        with self.lock:
+            object_id = str(self.next_id[resource])
+            self.next_id[resource] += 1
+            obj = dict(FIELDS[resource], **fields)
+            self.things[resource][object_id] = obj
+            self._index_title(resource, object_id, None, obj["title"])
+        return object_id
+
+    def amend(self, resource, object_id, body):
+        fields = self.validate(resource, body, creating=False)
+        with self.lock:
+            obj = self._find(resource, object_id)
+            if "title" in fields:
+                self._index_title(resource, object_id, obj["title"], fields["title"])
+            obj.update(fields)
+
+    def delete(self, resource, object_id):
+        with self.lock:
+            obj = self._find(resource, object_id)
+            del self.things[resource][object_id]
+            self._index_title(resource, object_id, obj["title"], None)
+            for (source, relationship), (target, _) in RELATIONSHIPS.items():
+                links = self.links[(source, relationship)]
+                if source == resource:
+                    links.pop(object_id, None)
+                if target == resource:
+                    for targets in links.values():
+                        targets.pop(object_id, None)
+
+    def link(self, resource, object_id, relationship, target_id):
+        target, inverse = RELATIONSHIPS[(resource, relationship)]
+        with self.lock:
+            self._find(resource, object_id)
+            if target_id not in self.things[target]:
+                raise ApiError(404, f"Could not find thing matching value for id: {target_id}")
+            self.links[(resource, relationship)].setdefault(object_id, {})[target_id] = None
+            if inverse:
+                self.links[(target, inverse)].setdefault(target_id, {})[object_id] = None
+
+    def unlink(self, resource, object_id, relationship, target_id):
+        target, inverse = RELATIONSHIPS[(resource, relationship)]
+        with self.lock:
+            self._find(resource, object_id)
+            targets = self.links[(resource, relationship)].get(object_id, {})
+            if target_id not in targets:
+                raise ApiError(404, f"Could not find relationship {resource}/{object_id}/{relationship}/{target_id}")
+            del targets[target_id]
+            if inverse:
+                self.links[(target, inverse)].get(target_id, {}).pop(object_id, None)
+
+    def render(self, resource, object_id):
+        """The object as the API returns it: every value a string, plus a list
+        of {"id": ...} for each non-empty relationship"""
+        obj = self.things[resource][object_id]
+        rendered = {"id": object_id}
+        rendered.update((key, _render_value(value)) for key, value in obj.items())
+        for (source, relationship) in RELATIONSHIPS:
+            targets = self.links[(source, relationship)].get(object_id) if source == resource else None
+            if targets:
+                rendered[relationship] = [{"id": target_id} for target_id in targets]
+        return rendered
+
+    def get(self, resource, object_id):
+        with self.lock:
+            self._find(resource, object_id)
+            return self.render(resource, object_id)
+
+    def query(self, resource, filters=()):
+        """Every object of a resource matching all (field, value) filters. A
+        title filter is answered from the title index."""
+        filters = dict(filters)
+        with self.lock:
+            if "title" in filters:
+                candidates = sorted(self.titles[resource].get(filters.pop("title"), ()), key=int)
+            else:
+                candidates = list(self.things[resource])
+            rendered = [self.render(resource, object_id) for object_id in candidates]
+        return [obj for obj in rendered if all(obj.get(key) == value for key, value in filters.items())]
+
+    def related(self, resource, object_id, relationship):
+        target, _ = RELATIONSHIPS[(resource, relationship)]
+        with self.lock:
+            self._find(resource, object_id)
+            targets = self.links[(resource, relationship)].get(object_id, {})
+            return target, [self.render(target, target_id) for target_id in targets]
+
+def to_xml(tag, value):
+    """Serialize a value as an element; a list inside an object becomes
+    repeated elements named after its key, e.g. <tasksof><id>1</id></tasksof>"""
+    element = ET.Element(tag)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            for entry in item if isinstance(item, list) else [item]:
+                element.append(to_xml(key, entry))
+    else:
+        element.text = str(value)
+    return element
+
+def response_xml(payload, tag=None):
+    """A single object is wrapped in `tag`; a listing such as {"todos": [...]}
+    becomes <todos><todo>...</todo></todos>"""
+    if tag:
+        return to_xml(tag, payload)
+    (key, items), = payload.items()
+    root = ET.Element(key)
+    for item in items:
+        root.append(to_xml(SINGULAR.get(key, key.rstrip("s")), item))
+    return root
+
+def from_xml(data, resource):
+    """Parse an XML body such as <todo><title>x</title></todo> into a dict,
+    turning "true"/"false" into booleans for boolean fields"""
+    body = {}
+    for child in ET.fromstring(data):
+        value = child.text or ""
+        if isinstance(FIELDS.get(resource, {}).get(child.tag), bool) and value in ("true", "false"):
+            value = value == "true"
+        body[child.tag] = value
+    return body
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "LocalTodoManager"
+    store = None  # set on the subclass built by make_server()
+
+    def log_message(self, format, *args):
+        pass  # per-request logging would swamp the server log during load tests
+
+    def wants_xml(self):
+        """XML only when the client asks for it ahead of (or without) JSON"""
+        accept = self.headers.get("Accept", "")
+        return "xml" in accept and ("json" not in accept or accept.index("xml") < accept.index("json"))
+
+    def read_body(self, resource):
+        data = self.raw_body
+        if not data.strip():
+            return {}
+        try:
+            if "xml" in self.headers.get("Content-Type", ""):
+                return from_xml(data, resource)
+            body = json.loads(data)
+        except (ValueError, ET.ParseError) as e:
+            raise ApiError(400, f"Could not parse request body: {e}")
+        if not isinstance(body, dict):
+            raise ApiError(400, "Request body must be an object")
+        return body
+
+    def send(self, status, payload=None, tag=None, headers=None):
+        """Write the status line, headers and body with a single send, so
+        keep-alive clients are not held up by Nagle's algorithm"""
+        body = b""
+        content_type = "application/json"
+        if payload is not None:
+            if self.wants_xml():
+                content_type = "application/xml"
+                body = ET.tostring(response_xml(payload, tag))
+            else:
+                body = json.dumps(payload).encode()
+        lines = [f"HTTP/1.1 {status} {self.responses.get(status, ('',))[0]}",
+                 f"Content-Type: {content_type}",
+                 f"Content-Length: {len(body)}"]
+        lines += [f"{key}: {value}" for key, value in (headers or {}).items()]
+        if self.close_connection:
+            lines.append("Connection: close")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        self.wfile.write(head if self.command == "HEAD" else head + body)
+
+    def send_error_message(self, status, message):
+        self.send(status, {"errorMessages": [message]})
+
+    def route(self):
+        parts = [part for part in urlsplit(self.path).path.split("/") if part]
+        if parts and parts[0] not in FIELDS:
+            raise ApiError(404, f"Could not find endpoint /{'/'.join(parts)}")
+        if len(parts) > 4 or (len(parts) >= 3 and (parts[0], parts[2]) not in RELATIONSHIPS):
+            raise ApiError(404, f"Could not find endpoint /{'/'.join(parts)}")
+        return parts
+
+    def handle_method(self):
+        # Read the whole body up front so an early error cannot leave part of
+        # it on a keep-alive connection
+        length = int(self.headers.get("Content-Length") or 0)
+        self.raw_body = self.rfile.read(length) if length else b""
+        try:
+            parts = self.route()
+            if self.command == "OPTIONS":
+                return self.send(200, headers={"Allow": ALLOW.get(len(parts), "OPTIONS, GET, HEAD")})
+            if not parts:
+                if self.command in ("GET", "HEAD"):
+                    return self.send(200, {"endpoints": sorted(FIELDS)})
+                raise ApiError(405, "Method not allowed")
+            handler = getattr(self, f"{self.command.lower()}_{len(parts)}", None)
+            if handler is None:
+                raise ApiError(405, "Method not allowed")
+            handler(*parts)
+        except ApiError as e:
+            self.send_error_message(e.status, e.message)
+
+    do_GET = do_HEAD = do_POST = do_PUT = do_DELETE = do_OPTIONS = handle_method
+
+    # One method per (verb, number of path segments)
+
+    def get_1(self, resource):
+        filters = parse_qsl(urlsplit(self.path).query)
+        self.send(200, {resource: self.store.query(resource, filters)})
+
+    head_1 = get_1
+
+    def post_1(self, resource):
+        object_id = self.store.create(resource, self.read_body(resource))
+        self.send(201, self.store.get(resource, object_id), SINGULAR[resource])
+
+    def get_2(self, resource, object_id):
+        self.send(200, {resource: [self.store.get(resource, object_id)]})
+
+    head_2 = get_2
+
+    def post_2(self, resource, object_id):
+        self.store.amend(resource, object_id, self.read_body(resource))
+        self.send(200, self.store.get(resource, object_id), SINGULAR[resource])
+
+    put_2 = post_2
+
+    def delete_2(self, resource, object_id):
+        self.store.delete(resource, object_id)
+        self.send(200)
+
+    def get_3(self, resource, object_id, relationship):
+        target, objects = self.store.related(resource, object_id, relationship)
+        self.send(200, {target: objects})
+
+    head_3 = get_3
+
+    def post_3(self, resource, object_id, relationship):
+        """Link an existing object by id, or create one from the body and link it"""
+        target, _ = RELATIONSHIPS[(resource, relationship)]
+        body = self.read_body(target)
+        self.store.get(resource, object_id)
+        if "id" in body:
+            self.store.link(resource, object_id, relationship, str(body["id"]))
+            return self.send(201)
+        target_id = self.store.create(target, body)
+        self.store.link(resource, object_id, relationship, target_id)
+        self.send(201, self.store.get(target, target_id), SINGULAR[target])
+
+    def delete_4(self, resource, object_id, relationship, target_id):
+        self.store.unlink(resource, object_id, relationship, target_id)
+        self.send(200)
+
+def make_server(port=4567, host="127.0.0.1", store=None):
+    """Build (but do not start) a server with its own store"""
+    handler = type("StoreHandler", (Handler,), {"store": store or Store()})
+    server = ThreadingHTTPServer((host, port), handler, bind_and_activate=False)
+    server.daemon_threads = True
+    # The default backlog of 5 drops connections under concurrent load, and
+    # the client's SYN retry then shows up as a one-second latency spike
+    server.request_queue_size = LISTEN_BACKLOG
+    try:
+        server.server_bind()
+        server.server_activate()
+    except OSError:
+        server.server_close()
+        raise
+    return server
+
+def start_in_thread(port=4567, host="127.0.0.1"):
+    """Serve from a daemon thread of the current process; call
+    server.shutdown() to stop it"""
+    server = make_server(port, host)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Todo Manager REST API")
+    parser.add_argument("--port", type=int, default=4567)
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args()
+    server = make_server(args.port, args.host)
+    print(f"Local Todo Manager API running on port {args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
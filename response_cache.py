@@ -0,0 +1,110 @@
+"""Read-through cache for API GETs, scoped to one behave scenario.
+
+Repeated GETs of the same path (with the same query and Accept header) are
+answered from the cache. Any other request invalidates the cached responses
+whose resources it may have changed:
+
+- a write to /todos/3/categories touches todos and categories, so every
+  cached path under /todos or /categories, or listing either through a
+  relationship (/projects/1/categories), is dropped
+- deleting an object clears the whole cache, since any other object may have
+  linked to it
+
+    cache = response_cache.use()
+    with cache.bypass():
+        api_client.get("/todos/1")  # always sent to the server
+    response_cache.stop(cache)
+"""
+import threading
+from contextlib import contextmanager
+import api_client
+from cassette import RELATIONSHIP_TARGETS
+
+READ_METHODS = ("GET",)
+PASS_THROUGH_METHODS = ("HEAD", "OPTIONS")
+
+def touched_resources(path):
+    """Resources a path reads or writes: /projects/1/tasks -> {projects, todos}"""
+    parts = path.split("?", 1)[0].strip("/").split("/")
+    resources = {parts[0]}
+    if len(parts) >= 3:
+        resources.add(RELATIONSHIP_TARGETS.get(parts[2], parts[2]))
+    return resources
+
+def _relative(path):
+    if path.startswith(api_client.BASE_URL):
+        return path[len(api_client.BASE_URL):] or "/"
+    return path
+
+def cache_key(path, kwargs):
+    params = kwargs.get("params")
+    query = sorted(params.items()) if isinstance(params, dict) else params
+    accept = (kwargs.get("headers") or {}).get("Accept")
+    return f"{path} {query or ''} {accept or '*'}"
+
+class ResponseCache:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}  # key -> (resources, response)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.bypassed = False
+
+    @contextmanager
+    def bypass(self):
+        """Send every request to the server while inside the block, e.g. in a
+        step that must see the current server state"""
+        self.bypassed = True
+        try:
+            yield
+        finally:
+            self.bypassed = False
+
+    def invalidate(self, method, path):
+        with self.lock:
+            if method == "DELETE" and len(path.split("?", 1)[0].strip("/").split("/")) == 2:
+                stale = list(self.entries)
+            else:
+                written = touched_resources(path)
+                stale = [key for key, (resources, _) in self.entries.items() if resources & written]
+            for key in stale:
+                del self.entries[key]
+            self.invalidations += len(stale)
+
+    def layer(self, method, path, kwargs, send):
+        """api_client layer answering repeated GETs from the cache"""
+        if method in PASS_THROUGH_METHODS:
+            return send(method, path, kwargs)
+        relative = _relative(path)
+        if method not in READ_METHODS:
+            response = send(method, path, kwargs)
+            self.invalidate(method, relative)
+            return response
+        if self.bypassed:
+            return send(method, path, kwargs)
+        key = cache_key(relative, kwargs)
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        response = send(method, path, kwargs)
+        # Server errors may be transient, so they are always asked again
+        if response.status_code < 500:
+            with self.lock:
+                self.entries[key] = (touched_resources(relative), response)
+        return response
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
+
+def use():
+    """Start caching api_client GETs until stop()"""
+    cache = ResponseCache()
+    api_client.add_layer(cache.layer)
+    return cache
+
+def stop(cache):
+    api_client.remove_layer(cache.layer)
@@ -0,0 +1,168 @@
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import requests
+from urllib3.exceptions import NewConnectionError
+import api_client
+
+SEED_WORKERS = 16
+SEED_RETRIES = 3
+SEED_BACKOFF = 0.05  # seconds before the first retry, doubled on each attempt
+
+# Resources cleared by purge() and counted by store_size()
+STORE_RESOURCES = ("todos", "projects", "categories")
+
+# Relationships put back by restore(). A todo's "tasksof" is the other side of a
+# project's "tasks", so restoring it from the todo side restores both.
+RELATIONSHIPS = {"todos": ("tasksof", "categories"), "projects": ("categories",)}
+
+def _never_sent(error):
+    """Whether a request failed while connecting, before the server could
+    have seen it"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(error, requests.ConnectionError) and isinstance(reason, NewConnectionError)
+
+def create_with_retry(path, payload, retries=SEED_RETRIES):
+    """POST a payload and return the created object, or None.
+
+    A POST is not idempotent, so it is only retried (with exponential backoff)
+    when the connection could not be made. Any response, or a failure after
+    the request went out, may mean the object was created, and retrying could
+    create it twice.
+    """
+    for attempt in range(retries + 1):
+        try:
+            response = api_client.post(path, json=payload)
+        except requests.RequestException as e:
+            if not _never_sent(e):
+                return None
+        else:
+            return response.json() if response.status_code == 201 else None
+        if attempt < retries:
+            time.sleep(SEED_BACKOFF * 2 ** attempt)
+    return None
+
+def _run_pipeline(specs, workers, on_result):
+    """Create each (index, path, payload) in specs on a worker pool.
+
+    At most 2 * workers creations are queued at once; the producer waits for
+    one to finish before submitting more, so a slow server applies
+    backpressure instead of the queue growing with the whole population.
+    on_result(index, created_object_or_None) is called from this thread.
+    """
+    max_pending = workers * 2
+    pending = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for index, path, payload in specs:
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    on_result(pending.pop(future), future.result())
+            pending[pool.submit(create_with_retry, path, payload)] = index
+        for future in list(pending):
+            on_result(pending.pop(future), future.result())
+
+def create_all(specs, workers=SEED_WORKERS):
+    """Create every (path, payload) pair concurrently.
+
+    Returns the created objects in the same order as specs, with None for any
+    creation that failed after retries.
+    """
+    created = [None] * len(specs)
+    def store(index, obj):
+        created[index] = obj
+    _run_pipeline(((i, path, payload) for i, (path, payload) in enumerate(specs)), workers, store)
+    return created
+
+def seed(path, count, payload_factory=None, workers=SEED_WORKERS):
+    """Create `count` objects at `path` concurrently and return their IDs.
+
+    payload_factory(i) builds the i-th payload (a numbered title by default).
+    IDs come back as a compact array('q') in the order the payloads were
+    generated; objects that could not be created are left out and reported.
+    """
+    payload_factory = payload_factory or (lambda i: {"title": f"Seed {i}"})
+    ids = array('q', bytes(8 * count))
+    def store(index, obj):
+        if obj:
+            ids[index] = int(obj["id"])
+    _run_pipeline(((i, path, payload_factory(i)) for i in range(count)), workers, store)
+
+    seeded = array('q', (object_id for object_id in ids if object_id))
+    if len(seeded) < count:
+        print(f"Warning: seeded {len(seeded)} of {count} objects at {path}")
+    return seeded
+
+def list_ids(resource):
+    """Return the IDs of every object of a resource, e.g. list_ids("todos")"""
+    response = api_client.get(f"/{resource}")
+    return [obj["id"] for obj in response.json().get(resource, [])]
+
+def store_size(resources=STORE_RESOURCES):
+    """Return the number of stored objects per resource"""
+    return {resource: len(list_ids(resource)) for resource in resources}
+
+def _delete(path):
+    try:
+        return api_client.delete(path).status_code == 200
+    except requests.RequestException:
+        return False
+
+def purge(resources=STORE_RESOURCES, workers=SEED_WORKERS, keep=None):
+    """Delete every object of the given resources concurrently and return how
+    many were deleted. `keep` maps a resource to IDs that must survive."""
+    keep = keep or {}
+    paths = [f"/{resource}/{object_id}" for resource in resources for object_id in list_ids(resource)
+             if object_id not in keep.get(resource, ())]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_delete, paths))
+
+def snapshot(resources=STORE_RESOURCES):
+    """Capture every object of the given resources, relationships included,
+    e.g. the server's default fixtures right after it starts"""
+    return {resource: api_client.get(f"/{resource}").json().get(resource, []) for resource in resources}
+
+def _field_values(obj):
+    """A stored object's plain fields as a PUT body. The API returns booleans
+    as "true"/"false" strings but only accepts real booleans back."""
+    body = {}
+    for key, value in obj.items():
+        if key == "id" or isinstance(value, list):
+            continue
+        body[key] = value == "true" if value in ("true", "false") else value
+    return body
+
+def _restore_object(resource, obj):
+    """Put a snapshot object's fields and relationships back. Returns False if
+    the object no longer exists, since the API will not recreate an ID."""
+    response = api_client.put(f"/{resource}/{obj['id']}", json=_field_values(obj))
+    if response.status_code == 404:
+        return False
+    for relationship in RELATIONSHIPS.get(resource, ()):
+        path = f"/{resource}/{obj['id']}/{relationship}"
+        wanted = {link["id"] for link in obj.get(relationship, [])}
+        listing = api_client.get(path).json()
+        current = {link["id"] for link in next(iter(listing.values()), [])}
+        for missing_id in wanted - current:
+            api_client.post(path, json={"id": missing_id})
+        for extra_id in current - wanted:
+            api_client.delete(f"{path}/{extra_id}")
+    return True
+
+def restore(state, workers=SEED_WORKERS):
+    """Bring the server back to a snapshot: delete every object created since,
+    then reset the snapshot objects' fields and relationships concurrently.
+
+    Returns False when a snapshot object has been deleted. It cannot be
+    recreated with its old ID, so the caller has to restart the server.
+    """
+    keep = {resource: {obj["id"] for obj in objects} for resource, objects in state.items()}
+    purge(tuple(state), workers, keep)
+    targets = [(resource, obj) for resource, objects in state.items() for obj in objects]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Consume every result: all() stopping at the first False would cancel
+        # the restores still queued
+        restored = list(pool.map(lambda target: _restore_object(*target), targets))
+    return all(restored)
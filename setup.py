@@ -1,18 +1,174 @@
+import logging
+import re
+import socket
 import subprocess
+import threading
 import time
 import requests
 import os
 import signal
+import sys
+from logging.handlers import RotatingFileHandler
+from urllib.parse import urlparse
+import api_client
 
 JAR_FILE = "runTodoManagerRestAPI-1.5.5.jar"
-API_URL = "http://localhost:4567"
+DEFAULT_PORT = 4567
+
+# Which server start_api launches: "jar" for the real API, or "local" for the
+# pure-Python stand-in in local_api.py, which starts in well under a second
+API_SERVER = os.environ.get("TODO_API_SERVER", "jar")
+LOCAL_API_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "local_api.py")
+
+# Extra JVM options, e.g. "-Xlog:gc" to get GC events in the server log
+JAVA_OPTIONS = os.environ.get("TODO_API_JAVA_OPTIONS", "").split()
+
+# Server stdout/stderr are drained continuously into a rotating, timestamped log
+# so the JVM never blocks on a full pipe buffer
+SERVER_LOG_FILE = os.environ.get("TODO_API_LOG_FILE", os.path.join("logs", "todo_api.log"))
+SERVER_LOG_MAX_BYTES = 10 * 1024 * 1024
+SERVER_LOG_BACKUPS = 3
+SERVER_LOG_LINE = re.compile(r"^(\d+\.\d+) \S+ \S+ \[(\w+)\] (.*)$")
+
+# Readiness probe: give up after STARTUP_TIMEOUT seconds, polling first every
+# PROBE_INITIAL_DELAY seconds and doubling the delay up to PROBE_MAX_DELAY
+STARTUP_TIMEOUT = 30
+PROBE_INITIAL_DELAY = 0.05
+PROBE_MAX_DELAY = 0.25
+
+def is_port_open(host, port):
+    """Checks if something accepts TCP connections on host:port."""
+    try:
+        with socket.create_connection((host, port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+def find_free_port():
+    """Asks the OS for a TCP port nobody is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_until_ready(process=None, timeout=STARTUP_TIMEOUT):
+    """Waits for the REST API to accept connections and answer HTTP requests.
+
+    Polls the port first, then the HTTP root, backing off exponentially.
+    Returns the seconds waited, or None if the deadline passed or the
+    process exited first.
+    """
+    address = urlparse(api_client.BASE_URL)
+    start = time.perf_counter()
+    deadline = start + timeout
+    delay = PROBE_INITIAL_DELAY
+    while time.perf_counter() < deadline:
+        if process is not None and process.poll() is not None:
+            return None
+        if is_port_open(address.hostname, address.port) and is_api_running():
+            return time.perf_counter() - start
+        time.sleep(min(delay, max(0.0, deadline - time.perf_counter())))
+        delay = min(delay * 2, PROBE_MAX_DELAY)
+    return None
+
+_server_logger = None
+
+def get_server_logger():
+    """Returns the logger that writes server output to SERVER_LOG_FILE."""
+    global _server_logger
+    if _server_logger is None:
+        os.makedirs(os.path.dirname(SERVER_LOG_FILE), exist_ok=True)
+        handler = RotatingFileHandler(SERVER_LOG_FILE, maxBytes=SERVER_LOG_MAX_BYTES,
+                                      backupCount=SERVER_LOG_BACKUPS)
+        handler.setFormatter(logging.Formatter("%(created).3f %(asctime)s [%(stream)s] %(message)s"))
+        _server_logger = logging.getLogger("todo_api.server")
+        _server_logger.setLevel(logging.INFO)
+        _server_logger.propagate = False
+        _server_logger.addHandler(handler)
+    return _server_logger
+
+def _drain(pipe, stream_name):
+    """Copies one of the server's pipes into the server log until it closes."""
+    logger = get_server_logger()
+    with pipe:
+        for line in iter(pipe.readline, b""):
+            logger.info(line.decode(errors="replace").rstrip(), extra={"stream": stream_name})
+
+def start_log_capture(process):
+    """Starts background threads that drain the server's stdout and stderr."""
+    process.log_threads = []
+    for pipe, stream_name in [(process.stdout, "stdout"), (process.stderr, "stderr")]:
+        thread = threading.Thread(target=_drain, args=(pipe, stream_name), daemon=True)
+        thread.start()
+        process.log_threads.append(thread)
+
+def _server_log_paths():
+    """The server log and its rotated backups, oldest first"""
+    return [f"{SERVER_LOG_FILE}.{n}" for n in range(SERVER_LOG_BACKUPS, 0, -1)] + [SERVER_LOG_FILE]
+
+def _parse_log_lines(lines):
+    entries = []
+    for line in lines:
+        match = SERVER_LOG_LINE.match(line)
+        if match:
+            entries.append((float(match.group(1)), match.group(2), match.group(3)))
+    return entries
+
+class ServerLogTail:
+    """Reads the server log incrementally: each read() returns only the
+    (timestamp, stream, message) entries written since the previous read, or
+    since the tail was created. Rotation is followed by remembering the inode
+    of the file and the byte offset reached in it."""
+
+    def __init__(self):
+        self.inode, self.offset = None, 0
+        if os.path.exists(SERVER_LOG_FILE):
+            stat = os.stat(SERVER_LOG_FILE)
+            self.inode, self.offset = stat.st_ino, stat.st_size
+
+    def read(self):
+        files = [(path, os.stat(path).st_ino) for path in _server_log_paths() if os.path.exists(path)]
+        if not files:
+            return []
+        # Resume in the file last read, wherever rotation has moved it. If it
+        # has rotated out of the backups, everything left is new.
+        start = next((i for i, (_, inode) in enumerate(files) if inode == self.inode), None)
+        offset = self.offset if start is not None else 0
+        entries = []
+        for i, (path, inode) in enumerate(files[start or 0:]):
+            with open(path, "rb") as f:
+                f.seek(offset if i == 0 else 0)
+                data = f.read()
+            if path == SERVER_LOG_FILE:
+                # A line still being written is left for the next read
+                data = data[:data.rfind(b"\n") + 1]
+                self.inode, self.offset = inode, (offset if i == 0 else 0) + len(data)
+            entries += _parse_log_lines(data.decode("utf-8", errors="replace").splitlines())
+        return entries
+
+def server_command(port):
+    """Command line for the server selected by API_SERVER"""
+    if API_SERVER == "local":
+        return [sys.executable, LOCAL_API_FILE, f"--port={port}"]
+    return ["java", *JAVA_OPTIONS, "-jar", JAR_FILE, f"-port={port}"]
 
 def start_api():
-    """Starts the REST API server and returns the process."""
+    """Starts the REST API server and returns the process once it is ready.
+
+    The measured startup time is stored on the process as startup_seconds.
+    """
     try:
         print("Starting the REST API...")
-        process = subprocess.Popen(["java", "-jar", JAR_FILE], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        time.sleep(5)  # Wait for API to initialize
+        start = time.perf_counter()
+        # Listen on the port api_client points at, so several servers can run side by side
+        port = urlparse(api_client.BASE_URL).port or DEFAULT_PORT
+        process = subprocess.Popen(server_command(port), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        start_log_capture(process)
+        if wait_until_ready(process) is None:
+            print(f"REST API did not become ready within {STARTUP_TIMEOUT} seconds")
+            stop_api(process)
+            return None
+        process.startup_seconds = time.perf_counter() - start
+        print(f"REST API ready in {process.startup_seconds:.2f} seconds")
         return process
     except Exception as e:
         print(f"Error starting API: {e}")
@@ -21,9 +177,9 @@ def start_api():
 def is_api_running():
     """Checks if the REST API is running."""
     try:
-        response = requests.get(API_URL)
+        response = api_client.get("/", timeout=2)
         return response.status_code == 200
-    except requests.ConnectionError:
+    except (requests.ConnectionError, requests.Timeout):
         return False
 
 def stop_api(process):
@@ -32,6 +188,8 @@ def stop_api(process):
         print("Stopping the REST API...")
         process.terminate()  # Terminate the API process
         process.wait()  # Wait for the process to terminate properly
+        for thread in getattr(process, "log_threads", []):
+            thread.join(timeout=1.0)  # Let the log drain threads flush what is left
         print("API stopped.")
     else:
-        print("No running API process found.")
\ No newline at end of file
+        print("No running API process found.")
@@ -0,0 +1,179 @@
+"""asyncio load engine speaking HTTP/1.1 keep-alive directly over streams.
+
+One event loop drives every request, so thousands can be in flight without a
+thread each, and a request costs a few writes and reads instead of a trip
+through requests/urllib3. Each connection carries one request at a time
+(no pipelining); a connection the server closes is reopened on next use.
+Connecting and reading a response each time out after api_client.TIMEOUT;
+the request counts as an error and its connection is dropped.
+
+Requests are given as (method, path, body bytes or None, expected status).
+The runners return the same outcome tuples as their thread-based
+counterparts in performance_test.py, so results feed the same rows.
+"""
+import asyncio
+import time
+from urllib.parse import urlparse
+import api_client
+
+HEADER_END = b"\r\n\r\n"
+NO_BODY_STATUSES = (204, 304)
+
+class HttpError(Exception):
+    """The server closed the connection or sent a malformed response"""
+
+class Connection:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def _open(self):
+        self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port),
+                                                          api_client.TIMEOUT)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        """Send one request and return (status, body bytes)"""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Accept: application/json\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body) if body else 0}\r\n\r\n")
+        try:
+            if self.writer is None:
+                await self._open()
+            self.writer.write(head.encode("latin-1") + (body or b""))
+            return await asyncio.wait_for(self._read_response(method), api_client.TIMEOUT)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ValueError) as e:
+            self.close()
+            raise HttpError(str(e) or type(e).__name__) from e
+
+    async def _read_response(self, method):
+        head = await self.reader.readuntil(HEADER_END)
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        if method == "HEAD" or status in NO_BODY_STATUSES or 100 <= status < 200:
+            body = b""
+        elif "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked()
+        else:
+            # Body delimited by the server closing the connection
+            body = await self.reader.read()
+            headers["connection"] = "close"
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, body
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readuntil(b"\r\n")).split(b";", 1)[0], 16)
+            if size == 0:
+                await self.reader.readuntil(b"\r\n")  # no trailers expected
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+async def _send(connection, spec):
+    """Send a request spec; returns whether it got the expected status"""
+    method, path, body, expected_status = spec
+    try:
+        status, _ = await connection.request(method, path, body)
+    except HttpError:
+        return False
+    return status == expected_status
+
+def _address(base_url):
+    parsed = urlparse(base_url)
+    return parsed.hostname, parsed.port or 80
+
+async def _closed_loop(specs, concurrency, base_url):
+    host, port = _address(base_url)
+    specs = iter(specs)
+    outcomes = []
+
+    async def worker():
+        connection = Connection(host, port)
+        for spec in specs:
+            sent_at, start = time.time(), time.perf_counter()
+            ok = await _send(connection, spec)
+            outcomes.append((time.perf_counter() - start, sent_at, ok))
+        connection.close()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return outcomes
+
+async def _open_loop(specs, rate, max_in_flight, base_url):
+    host, port = _address(base_url)
+    idle = []  # connections not carrying a request, opened on demand
+    in_flight = asyncio.Semaphore(max_in_flight)
+    interval = 1.0 / rate
+    loop = asyncio.get_running_loop()
+
+    async def timed(spec, intended_start):
+        async with in_flight:
+            connection = idle.pop() if idle else Connection(host, port)
+            actual_start = time.perf_counter()
+            ok = await _send(connection, spec)
+            end = time.perf_counter()
+            idle.append(connection)
+        return end - intended_start, end - actual_start, intended_start, ok
+
+    tasks = []
+    start_time = time.perf_counter()
+    for i, spec in enumerate(specs):
+        intended_start = start_time + i * interval
+        # Sleeping even when behind schedule lets started requests progress
+        await asyncio.sleep(max(0.0, intended_start - time.perf_counter()))
+        tasks.append(loop.create_task(timed(spec, intended_start)))
+    outcomes = await asyncio.gather(*tasks)
+    for connection in idle:
+        connection.close()
+    return outcomes
+
+async def _drive(next_request, concurrency, base_url):
+    host, port = _address(base_url)
+
+    async def worker():
+        connection = Connection(host, port)
+        while (request := next_request()) is not None:
+            (method, path, body, _), done = request
+            sent_at, start = time.time(), time.perf_counter()
+            try:
+                status, response_body = await connection.request(method, path, body)
+            except HttpError:
+                status, response_body = None, b""
+            done(status, response_body, time.perf_counter() - start, sent_at)
+        connection.close()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+def closed_loop(specs, concurrency, base_url):
+    """Run specs on `concurrency` keep-alive connections, each sending its next
+    request as soon as the previous one returns. Returns (latency seconds,
+    send time, ok) per request."""
+    return asyncio.run(_closed_loop(specs, concurrency, base_url))
+
+def open_loop(specs, rate, max_in_flight, base_url):
+    """Start request i at start + i / rate regardless of earlier responses.
+    Returns (corrected latency, service time, intended start, ok) per request,
+    latency counted from the intended start as in run_open_loop."""
+    return asyncio.run(_open_loop(specs, rate, max_in_flight, base_url))
+
+def drive(next_request, concurrency, base_url):
+    """Closed loop over requests produced on demand, for workloads whose next
+    request depends on earlier responses. next_request() returns (spec,
+    done) or None when finished; done(status or None, body, latency seconds,
+    send time) is called with each response."""
+    asyncio.run(_drive(next_request, concurrency, base_url))
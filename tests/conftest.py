@@ -0,0 +1,184 @@
+"""Shared pytest fixtures and options.
+
+Every pytest process, and with pytest-xdist (`pytest -n auto`) every worker,
+can run its own API server on a free port, so workers never share state:
+
+    --local-api     serve the in-process Python stand-in (local_api.py)
+    --start-server  start a server with setup.start_api (the JAR, or the
+                    stand-in as a subprocess with TODO_API_SERVER=local)
+
+Without either, the tests use the server already running at TODO_API_URL.
+
+Tests marked @pytest.mark.latency_budget (optionally naming routes, e.g.
+"GET /todos/{id}") fail when those routes exceed their budgets in
+latency_budgets.json; see latency_budget.py.
+"""
+import os
+import sys
+import pytest
+import requests
+
+# Shared modules (api_client, setup) live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api_client
+import cassette
+import http_metrics
+import latency_budget
+import local_api
+import setup
+
+_cassette = None
+_http_metrics = None
+
+def pytest_addoption(parser):
+    parser.addoption("--local-api", action="store_true",
+                     help="serve the API from the in-process Python stand-in (local_api.py) "
+                          "instead of expecting the JAR to be running")
+    parser.addoption("--start-server", action="store_true",
+                     help="start a server per test process (per worker with -n) using setup.start_api")
+    parser.addoption("--cassette", choices=["record", "replay"], default=None,
+                     help="record API traffic to a cassette, or replay it without a server")
+    parser.addoption("--cassette-file", default=os.path.join(cassette.CASSETTE_DIR, "pytest.json.gz"))
+    parser.addoption("--latency-budgets", default=latency_budget.BUDGETS_FILE,
+                     help="latency budget file checked by tests marked latency_budget")
+    parser.addoption("--http-metrics", action="store_true",
+                     help="time every API call per test and phase, print the slowest routes "
+                          "and write reports/pytest_http_metrics[_<worker>].json")
+
+def pytest_configure(config):
+    global _http_metrics
+    if config.getoption("--cassette") and config.getoption("numprocesses", None):
+        raise pytest.UsageError("--cassette cannot be combined with -n: workers would share one cassette")
+    if config.getoption("--http-metrics"):
+        _http_metrics = http_metrics.CallLog()
+    config.addinivalue_line("markers", "latency_budget(*routes): fail the test when the routes it calls "
+                                       "(or only the named \"METHOD /route\" keys) exceed their latency budgets")
+
+def http_metrics_file():
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    return os.path.join("reports", f"pytest_http_metrics_{worker}.json" if worker else "pytest_http_metrics.json")
+
+def worker_id():
+    """pytest-xdist worker name such as "gw0", or "main" without xdist"""
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+@pytest.fixture(scope="session")
+def api_server(request):
+    """This process's own server, started once on a free port with api_client
+    pointed at it, or None when the tests use an already running server"""
+    local = request.config.getoption("--local-api")
+    if not (local or request.config.getoption("--start-server")):
+        yield None
+        return
+    port = setup.find_free_port()
+    api_client.configure(base_url=f"http://localhost:{port}")
+    if local:
+        server = local_api.start_in_thread(port)
+        yield server
+        server.shutdown()
+        server.server_close()
+        return
+    setup.SERVER_LOG_FILE = os.path.join("logs", f"todo_api_{worker_id()}.log")
+    process = setup.start_api()
+    if process is None:
+        pytest.exit(f"Could not start the API server for worker {worker_id()}")
+    yield process
+    setup.stop_api(process)
+
+@pytest.fixture(autouse=True, scope="session")
+def api_cassette(request):
+    """Record or replay every api_client request of the session with --cassette"""
+    global _cassette
+    mode = request.config.getoption("--cassette")
+    if mode is None:
+        yield None
+        return
+    _cassette = cassette.use(request.config.getoption("--cassette-file"), mode)
+    yield _cassette
+    _cassette.eject()
+
+@pytest.fixture(autouse=True, scope="session")
+def api_http_metrics(api_cassette):
+    """Time every api_client call with --http-metrics. Added after the
+    cassette so replayed calls are timed too."""
+    if _http_metrics is None:
+        yield None
+        return
+    api_client.add_layer(_http_metrics.layer)
+    yield _http_metrics
+    http_metrics.stop(_http_metrics)
+
+@pytest.fixture(scope="session")
+def api_url(api_server, api_cassette):
+    """Base URL of the server this process's tests run against; skips the
+    test when nothing answers there"""
+    try:
+        api_client.get("/")
+    except requests.ConnectionError:
+        pytest.skip("API server is not running")
+    return api_client.BASE_URL
+
+@pytest.fixture(autouse=True)
+def cassette_chapter(request, api_cassette):
+    """File each test's requests, fixtures included, under its node ID"""
+    if api_cassette is None:
+        yield
+        return
+    api_cassette.begin(request.node.nodeid)
+    yield
+    api_cassette.begin(cassette.SESSION_CHAPTER)
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    if _http_metrics:
+        _http_metrics.begin(item.nodeid, "setup")
+    yield
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    if _http_metrics:
+        _http_metrics.begin(item.nodeid, "call")
+    marker = item.get_closest_marker(latency_budget.MARKER)
+    # Replayed latencies mean nothing, and extra calls would not match a recording
+    if marker is None or item.config.getoption("--cassette"):
+        return (yield)
+    budgets = latency_budget.load_budgets(item.config.getoption("--latency-budgets"))
+    probe = latency_budget.use(budgets, marker.args or None)
+    try:
+        result = yield
+    except BaseException:
+        api_client.remove_layer(probe.layer)
+        raise
+    failures = latency_budget.measure(probe)
+    if failures:
+        pytest.fail("Latency budget exceeded:\n  " + "\n  ".join(failures), pytrace=False)
+    return result
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    if _http_metrics:
+        _http_metrics.begin(item.nodeid, "teardown")
+    yield
+
+def pytest_runtest_logreport(report):
+    if _http_metrics:
+        _http_metrics.add_duration(report.nodeid, report.when, report.duration)
+
+def pytest_sessionfinish(session):
+    # Under xdist the controller only sees reports, so it saves nothing
+    if _http_metrics and _http_metrics.calls:
+        _http_metrics.save(http_metrics_file())
+
+def pytest_terminal_summary(terminalreporter):
+    if _http_metrics and _http_metrics.calls:
+        terminalreporter.section("HTTP calls")
+        _http_metrics.report(terminalreporter.write_line)
+        terminalreporter.write_line(f"Summary written to {http_metrics_file()}")
+    if _cassette is None or _cassette.mode != "replay":
+        return
+    divergences = _cassette.report()
+    terminalreporter.section("cassette replay")
+    terminalreporter.write_line(f"{len(divergences)} divergences from {_cassette.path}")
+    for divergence in divergences:
+        terminalreporter.write_line(f"[{divergence['kind']}] {divergence['chapter']}: {divergence['request']}")
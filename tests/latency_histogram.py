@@ -0,0 +1,125 @@
+import heapq
+import math
+from array import array
+
+class SlowestRequests:
+    """Keeps the `keep` slowest (latency_seconds, timestamp) pairs seen, so
+    latency spikes can be lined up with other time-stamped events."""
+
+    def __init__(self, keep=10):
+        self.keep = keep
+        self.heap = []
+
+    def add(self, seconds, timestamp):
+        if len(self.heap) < self.keep:
+            heapq.heappush(self.heap, (seconds, timestamp))
+        elif seconds > self.heap[0][0]:
+            heapq.heapreplace(self.heap, (seconds, timestamp))
+
+    def merge(self, other):
+        for seconds, timestamp in other.heap:
+            self.add(seconds, timestamp)
+        return self
+
+    def items(self):
+        """Return (latency_seconds, timestamp) pairs, slowest first"""
+        return sorted(self.heap, reverse=True)
+
+class LatencyHistogram:
+    """Fixed-size log-linear latency histogram in the style of HdrHistogram.
+
+    Values are recorded in whole microseconds. Every power-of-two range is split
+    into the same number of linear sub-buckets, so each recorded value keeps
+    `significant_digits` digits of precision while the bucket array stays the
+    same size no matter how many requests are recorded. Histograms with the
+    same configuration can be merged by adding their bucket counts.
+
+    Values recorded with a timestamp also feed `slowest`, which remembers when
+    the slowest requests happened.
+    """
+
+    def __init__(self, highest_us=60_000_000, significant_digits=2):
+        self.highest_us = highest_us
+        self.significant_digits = significant_digits
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count // 2
+        max_shift = max(0, highest_us.bit_length() - self.sub_bucket_bits)
+        self.counts = array('q', bytes(8 * (max_shift + 2) * self.sub_bucket_half))
+        self.total_count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+        self.slowest = SlowestRequests()
+
+    def _index(self, value_us):
+        if value_us < self.sub_bucket_count:
+            return value_us
+        shift = value_us.bit_length() - self.sub_bucket_bits
+        return shift * self.sub_bucket_half + (value_us >> shift)
+
+    def _highest_equivalent(self, index):
+        if index < self.sub_bucket_count:
+            return index
+        shift = index // self.sub_bucket_half - 1
+        sub_bucket = index - shift * self.sub_bucket_half
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, seconds, timestamp=None):
+        """Record one latency given in seconds, optionally with the time.time()
+        at which the request was sent"""
+        value_us = min(max(0, round(seconds * 1_000_000)), self.highest_us)
+        self.counts[self._index(value_us)] += 1
+        self.total_count += 1
+        self.total_us += value_us
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+        if timestamp is not None:
+            self.slowest.add(seconds, timestamp)
+
+    def merge(self, other):
+        """Add another histogram's counts into this one"""
+        if (other.highest_us, other.significant_digits) != (self.highest_us, self.significant_digits):
+            raise ValueError("Cannot merge histograms with different configurations")
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total_count += other.total_count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+        self.slowest.merge(other.slowest)
+        return self
+
+    def percentile(self, pct):
+        """Return the latency in milliseconds at or below which `pct` percent of
+        recorded values fall"""
+        if self.total_count == 0:
+            return 0
+        target = max(1, math.ceil(pct / 100 * self.total_count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def mean(self):
+        """Return the mean latency in milliseconds"""
+        return self.total_us / self.total_count / 1000 if self.total_count else 0
+
+    def max(self):
+        """Return the largest recorded latency in milliseconds"""
+        return self.max_us / 1000
+
+    def summary(self, prefix="latency"):
+        """Return avg, p50/p95/p99/p99.9 and max in milliseconds as result columns"""
+        return {
+            f"{prefix}_avg_ms": self.mean(),
+            f"{prefix}_p50_ms": self.percentile(50),
+            f"{prefix}_p95_ms": self.percentile(95),
+            f"{prefix}_p99_ms": self.percentile(99),
+            f"{prefix}_p999_ms": self.percentile(99.9),
+            f"{prefix}_max_ms": self.max()
+        }
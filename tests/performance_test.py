@@ -1,167 +1,571 @@
+import argparse
+import json
+import multiprocessing
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import psutil
-import statistics
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import requests
 import random
 import string
 import os
+import re
+import sys
+from array import array
+from urllib.parse import urlparse
+from latency_histogram import LatencyHistogram
 
-BASE_URL = "http://localhost:4567"
+# Shared modules (setup, api_client, seeding) live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import setup
+from setup import start_api, stop_api
+import api_client
+import cassette
+from http_metrics import normalize_route
+import seeding
+import async_load
+import workloads
+
+# Server process started by this script (--start-server) and its PID. Without
+# it, ResourceMonitor looks the server up by its listening port.
+API_PROCESS = None
+SERVER_PID = None
+
+# Measured JAR startup times (seconds until the readiness probe passed) for
+# every server start made by this script, saved alongside the results
+STARTUP_TIMES = []
+
+# Server log lines worth lining up with latency spikes, how far around a slow
+# request to look for them (seconds), and what was found during the run
+LOG_EVENT_PATTERN = re.compile(r"\bgc\b|pause|exception|error|warn", re.IGNORECASE)
+LOG_ALIGN_WINDOW = 0.5
+LOG_EVENTS = []
+SLOW_REQUESTS = []
+# The server log is read incrementally, from where it ended when the script
+# started, once per data point. Matching events are kept until no later data
+# point's window can reach them.
+SERVER_LOG_TAIL = setup.ServerLogTail()
+RECENT_LOG_EVENTS = []
+
+# How server state is reset before each data point: "none" keeps whatever
+# earlier points left behind, "purge" deletes every todo/project/category,
+# "restart" restarts the server (requires --start-server)
+ISOLATION = "none"
+
+# Seconds between resource samples and the number of samples kept per run.
+# Once a run exceeds the capacity the oldest samples are overwritten.
+SAMPLE_INTERVAL = 0.1
+SAMPLE_CAPACITY = 100_000
+
+SAMPLE_COLUMNS = ['timestamp', 'cpu_percent', 'memory_mb', 'threads', 'open_fds',
+                  'client_cpu_percent', 'client_memory_mb']
+
+# Worker pool sizes used by the closed-loop concurrency sweep
+CONCURRENCY_LEVELS = [1, 4, 16, 64]
+
+# Upper bound on requests in flight during open-loop runs
+OPEN_LOOP_MAX_WORKERS = 256
+
+# Load engine: "threads" sends through api_client (requests) from a thread
+# pool; "asyncio" speaks raw HTTP/1.1 keep-alive from one event loop
+# (async_load.py), so the client is no longer the bottleneck at high rates.
+# ASYNC_IN_FLIGHT is the number of concurrent requests of the sequential sweep
+# with the asyncio engine, and ASYNC_MAX_IN_FLIGHT bounds its open-loop runs.
+ENGINE = "threads"
+ASYNC_IN_FLIGHT = 1
+ASYNC_MAX_IN_FLIGHT = 4096
+
+# Load-generating processes for the concurrency and open-loop modes
+# (--processes). Each data point is split across them and their histograms
+# and counters are merged; resources are still sampled once, here, with the
+# load processes' CPU and memory added to the client series.
+PROCESSES = 1
+LOAD_POOL = None
+LOAD_PIDS = []
+LOAD_START_DELAY = 0.2  # seconds for every process to be ready to start together
+
+# Collection-size scaling benchmark (--mode scaling): store sizes to grow to,
+# timed GETs per endpoint and size after untimed warm-up GETs, and the title
+# of the one object the filtered GET matches
+SCALING_SIZES = [1_000, 10_000, 100_000]
+SCALING_SAMPLES = 20
+SCALING_WARMUP = 2
+SCALING_PROBE_TITLE = "ScalingProbe"
+# An SLO break size is only extrapolated from a fit that shows real growth,
+# and never beyond this multiple of the largest store size measured
+SCALING_MIN_EXPONENT = 0.2
+SCALING_MIN_R_SQUARED = 0.8
+SCALING_MAX_EXTRAPOLATION = 100
+
+# Relationship fan-out benchmark (--mode fanout). Graph shapes:
+#   project  - one project with N tasks (todos linked through tasksof)
+#   category - one category on N todos
+#   mesh     - N todos each in every one of FANOUT_MESH_WIDTH categories
+FANOUT_SHAPES = ["project", "category", "mesh"]
+FANOUT_SIZES = [10, 100, 1000, 5000]
+FANOUT_MESH_WIDTH = 10
+# Server RSS grows in allocator-sized steps, so a smaller change while linking
+# is reported as below resolution rather than as a per-edge figure
+FANOUT_MEMORY_RESOLUTION_MB = 1.0
 
 def random_string(length=10):
     """Generate a random string for test data"""
     return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
 
 # Todo operations
-def create_todo():
-    """Create a todo with random data"""
-    payload = {
+def todo_payload():
+    """Random todo body used for creates and seeding"""
+    return {
         "title": f"Performance Test {random_string()}",
         "description": f"Description {random_string(20)}",
         "doneStatus": random.choice([True, False])
     }
-    response = requests.post(f"{BASE_URL}/todos", json=payload)
+
+def create_todo():
+    """Create a todo with random data"""
+    payload = todo_payload()
+    response = api_client.post("/todos", json=payload)
     return response.json() if response.status_code == 201 else None
 
 def delete_todo(todo_id):
     """Delete a todo by ID"""
-    response = requests.delete(f"{BASE_URL}/todos/{todo_id}")
+    response = api_client.delete(f"/todos/{todo_id}")
     return response.status_code == 200
 
-def update_todo(todo_id):
-    """Update a todo with random data"""
-    payload = {
+def todo_update_payload():
+    """Random todo body used for updates"""
+    return {
         "title": f"Updated {random_string()}",
         "description": f"Updated description {random_string(20)}",
         "doneStatus": random.choice([True, False])
     }
-    response = requests.put(f"{BASE_URL}/todos/{todo_id}", json=payload)
+
+def update_todo(todo_id):
+    """Update a todo with random data"""
+    response = api_client.put(f"/todos/{todo_id}", json=todo_update_payload())
     return response.json() if response.status_code == 200 else None
 
 # Project operations
-def create_project():
-    """Create a project with random data"""
-    payload = {
+def project_payload():
+    """Random project body used for creates and seeding"""
+    return {
         "title": f"Project {random_string()}",
         "description": f"Project Description {random_string(20)}",
         "active": random.choice([True, False])
     }
-    response = requests.post(f"{BASE_URL}/projects", json=payload)
+
+def create_project():
+    """Create a project with random data"""
+    payload = project_payload()
+    response = api_client.post("/projects", json=payload)
     return response.json() if response.status_code == 201 else None
 
 def delete_project(project_id):
     """Delete a project by ID"""
-    response = requests.delete(f"{BASE_URL}/projects/{project_id}")
+    response = api_client.delete(f"/projects/{project_id}")
     return response.status_code == 200
 
-def update_project(project_id):
-    """Update a project with random data"""
-    payload = {
+def project_update_payload():
+    """Random project body used for updates"""
+    return {
         "title": f"Updated Project {random_string()}",
         "description": f"Updated project description {random_string(20)}",
         "active": random.choice([True, False])
     }
-    response = requests.put(f"{BASE_URL}/projects/{project_id}", json=payload)
+
+def update_project(project_id):
+    """Update a project with random data"""
+    response = api_client.put(f"/projects/{project_id}", json=project_update_payload())
     return response.json() if response.status_code == 200 else None
 
+def request_spec(object_type, operation, item):
+    """The raw request an operation sends, for the asyncio engine:
+    (method, path, JSON body bytes or None, expected status)"""
+    collection = "/todos" if object_type == "todo" else "/projects"
+    if operation == "create":
+        payload = todo_payload() if object_type == "todo" else project_payload()
+        return "POST", collection, json.dumps(payload).encode(), 201
+    if operation == "update":
+        payload = todo_update_payload() if object_type == "todo" else project_update_payload()
+        return "PUT", f"{collection}/{item}", json.dumps(payload).encode(), 200
+    return "DELETE", f"{collection}/{item}", None, 200
+
+def request_specs(object_type, operation, items):
+    """Request specs for every work item, built before the clock starts"""
+    return [request_spec(object_type, operation, item) for item in items]
+
+def seed_objects(object_type, count):
+    """Create `count` objects of a type in parallel, outside any measured phase,
+    and return their IDs as an array"""
+    if object_type == "todo":
+        return seeding.seed("/todos", count, lambda _: todo_payload())
+    return seeding.seed("/projects", count, lambda _: project_payload())
+
+def start_server(reason):
+    """Start the server, remember its PID and record the measured startup time"""
+    global API_PROCESS, SERVER_PID
+    API_PROCESS = start_api()
+    SERVER_PID = API_PROCESS.pid if API_PROCESS else None
+    if API_PROCESS:
+        STARTUP_TIMES.append({"timestamp": time.time(), "reason": reason,
+                              "startup_seconds": API_PROCESS.startup_seconds})
+
+def save_startup_times():
+    """Write the recorded server startup times and print a summary"""
+    if not STARTUP_TIMES:
+        return
+    df = pd.DataFrame(STARTUP_TIMES)
+    df.to_csv('tests/server_startup_results.csv', index=False)
+    print(f"Server startup: {len(df)} starts, avg={df['startup_seconds'].mean():.2f}s, "
+          f"max={df['startup_seconds'].max():.2f}s")
+
+def align_with_server_log(label, start, end, histogram):
+    """Collect notable server log events from a data point and pair each of its
+    slowest requests with the closest event, if one happened nearby.
+
+    `start` and `end` are time.time() values. Returns the number of events.
+    """
+    global RECENT_LOG_EVENTS
+    RECENT_LOG_EVENTS += [event for event in SERVER_LOG_TAIL.read() if LOG_EVENT_PATTERN.search(event[2])]
+    events = [event for event in RECENT_LOG_EVENTS
+              if start - LOG_ALIGN_WINDOW <= event[0] <= end + LOG_ALIGN_WINDOW]
+    RECENT_LOG_EVENTS = [event for event in RECENT_LOG_EVENTS if event[0] >= end - LOG_ALIGN_WINDOW]
+    for timestamp, stream, message in events:
+        LOG_EVENTS.append({"data_point": label, "timestamp": timestamp,
+                           "offset_seconds": timestamp - start, "stream": stream, "message": message})
+
+    for latency, sent_at in histogram.slowest.items():
+        nearby = [event for event in events
+                  if sent_at - LOG_ALIGN_WINDOW <= event[0] <= sent_at + latency + LOG_ALIGN_WINDOW]
+        nearest = min(nearby, key=lambda event: abs(event[0] - sent_at), default=None)
+        SLOW_REQUESTS.append({
+            "data_point": label,
+            "timestamp": sent_at,
+            "offset_seconds": sent_at - start,
+            "latency_ms": latency * 1000,
+            "nearest_log_event": nearest[2] if nearest else "",
+            "log_event_offset_ms": (nearest[0] - sent_at) * 1000 if nearest else None
+        })
+    return len(events)
+
+def save_log_alignment():
+    """Write the slowest requests and server log events recorded during the run"""
+    if SLOW_REQUESTS:
+        pd.DataFrame(SLOW_REQUESTS).to_csv('tests/slow_requests.csv', index=False)
+    if LOG_EVENTS:
+        pd.DataFrame(LOG_EVENTS).to_csv('tests/server_log_events.csv', index=False)
+    matched = sum(1 for row in SLOW_REQUESTS if row["nearest_log_event"])
+    print(f"Slow requests: {len(SLOW_REQUESTS)} recorded, {matched} near a server log event "
+          f"({len(LOG_EVENTS)} events)")
+
+def isolate_data_point():
+    """Reset server state before a data point according to ISOLATION"""
+    if ISOLATION == "purge":
+        deleted = seeding.purge()
+        print(f"  Purged {deleted} objects before data point")
+    elif ISOLATION == "restart":
+        stop_api(API_PROCESS)
+        start_server("restart")
+
+def store_columns():
+    """Current store size as result columns, recorded just before measuring"""
+    return {f"store_{resource}": size for resource, size in seeding.store_size().items()}
+
+def connection_mode():
+    """Label for the HTTP connection strategy in use, recorded with each result"""
+    if ENGINE == "asyncio":
+        return "asyncio"
+    return "pooled" if api_client.POOLED else "fresh"
+
+def find_server_pid(port=None):
+    """Return the PID of the process listening on the API port, or None"""
+    port = port or urlparse(api_client.BASE_URL).port
+    try:
+        for conn in psutil.net_connections(kind='tcp'):
+            if conn.status == psutil.CONN_LISTEN and conn.laddr and conn.laddr.port == port and conn.pid:
+                return conn.pid
+    except psutil.AccessDenied:
+        # Some platforms only expose other processes' sockets per process
+        for proc in psutil.process_iter(['name']):
+            try:
+                if any(conn.status == psutil.CONN_LISTEN and conn.laddr.port == port
+                       for conn in proc.net_connections(kind='tcp')):
+                    return proc.pid
+            except (psutil.AccessDenied, psutil.NoSuchProcess):
+                continue
+    return None
+
+def count_open_fds(process):
+    """Open file descriptors on POSIX, open handles on Windows"""
+    if hasattr(process, 'num_fds'):
+        return process.num_fds()
+    return process.num_handles()
+
+class ProcessSampler:
+    """Reads cumulative CPU seconds, RSS (MB), thread count and open fds for
+    one process. On Linux this parses /proc/<pid>/stat directly, which is much
+    cheaper per sample than going through psutil; elsewhere it uses psutil."""
+
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+    PAGE_MB = (os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096) / (1024 * 1024)
+
+    def __init__(self, pid, count_fds=True):
+        self.pid = pid
+        self.count_fds = count_fds
+        self.stat_path = f'/proc/{pid}/stat'
+        self.use_proc = os.path.exists(self.stat_path)
+        self.process = None if self.use_proc else psutil.Process(pid)
+
+    def read(self):
+        if self.use_proc:
+            with open(self.stat_path, 'rb') as f:
+                stat = f.read()
+            # Fields after the parenthesised command name, starting at field 3 (state)
+            fields = stat[stat.rindex(b')') + 2:].split()
+            cpu_seconds = (int(fields[11]) + int(fields[12])) / self.CLOCK_TICKS
+            threads = int(fields[17])
+            memory_mb = int(fields[21]) * self.PAGE_MB
+            open_fds = len(os.listdir(f'/proc/{self.pid}/fd')) if self.count_fds else 0
+            return cpu_seconds, memory_mb, threads, open_fds
+        with self.process.oneshot():
+            cpu_times = self.process.cpu_times()
+            return (cpu_times.user + cpu_times.system,
+                    self.process.memory_info().rss / (1024 * 1024),
+                    self.process.num_threads(),
+                    count_open_fds(self.process) if self.count_fds else 0)
+
+class ClientSampler:
+    """CPU seconds and RSS (MB) summed over the benchmark's own processes:
+    this one plus any load-generating processes"""
+
+    def __init__(self, pids):
+        self.samplers = []
+        for pid in pids:
+            try:
+                self.samplers.append(ProcessSampler(pid, count_fds=False))
+            except psutil.Error:
+                print(f"Warning: client process {pid} is gone, not sampling it")
+
+    def read(self):
+        """A load process that has exited is dropped from this and later
+        readings, so the CPU seconds summed change basis on that tick"""
+        readings = []
+        for sampler in list(self.samplers):
+            try:
+                readings.append(sampler.read())
+            except (OSError, psutil.Error):
+                print(f"Warning: client process {sampler.pid} is gone, no longer sampling it")
+                self.samplers.remove(sampler)
+        return sum(reading[0] for reading in readings), sum(reading[1] for reading in readings)
+
 class ResourceMonitor:
-    def __init__(self, sample_interval=0.1):
-        self.samples = []
-        self.running = False
+    """Samples the Todo Manager server process, with the benchmark client
+    process recorded alongside as a separate series (client_* columns).
+
+    Samples are taken on a fixed-rate clock: each tick is scheduled at
+    start + k * sample_interval, so time spent sampling does not accumulate
+    as drift, and ticks missed while the thread was starved are skipped and
+    counted rather than fired in a burst. Samples go into preallocated numpy
+    columns used as a ring buffer, so memory stays constant on long runs.
+    """
+
+    def __init__(self, sample_interval=0.1, server_pid=None, capacity=SAMPLE_CAPACITY):
         self.sample_interval = sample_interval
+        self.server_pid = server_pid
+        self.capacity = capacity
+        self.columns = {name: np.zeros(capacity) for name in SAMPLE_COLUMNS}
+        self.sample_count = 0
+        self.missed_ticks = 0
+        self.stop_event = threading.Event()
         self.monitor_thread = None
         
     def start_monitoring(self):
         """Start collecting resource usage samples in a background thread"""
-        self.samples = []
-        self.running = True
+        self.sample_count = 0
+        self.missed_ticks = 0
+        self.stop_event.clear()
         self.monitor_thread = threading.Thread(target=self._monitor_resources)
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
         
     def stop_monitoring(self):
         """Stop collecting samples and wait for thread to finish"""
-        self.running = False
+        self.stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=1.0)
+
+    def _resolve_server_pid(self):
+        """Return the server PID, or None if it cannot be found"""
+        pid = self.server_pid or SERVER_PID or find_server_pid()
+        if pid is None:
+            print("Warning: server process not found, only client resources will be recorded")
+        return pid
+
+    def _record(self, values):
+        slot = self.sample_count % self.capacity
+        for name, value in zip(SAMPLE_COLUMNS, values):
+            self.columns[name][slot] = value
+        self.sample_count += 1
         
     def _monitor_resources(self):
-        """Background thread function to collect samples"""
-        process = psutil.Process()
-        while self.running:
+        """Background thread function to collect samples.
+
+        CPU percentages are computed from the change in CPU seconds between
+        consecutive readings. A final sample is taken when monitoring stops, so
+        runs shorter than one interval still get a reading.
+        """
+        client = ClientSampler([os.getpid(), *LOAD_PIDS])
+        server_pid = self._resolve_server_pid()
+        # A None reading means the next CPU delta is skipped
+        server = prev_server = None
+        prev_client = client.read()  # load processes that are gone are dropped, not raised
+        try:
+            server = ProcessSampler(server_pid) if server_pid else None
+            prev_server = server.read() if server else None
+        except (OSError, psutil.Error) as e:
+            print(f"Error sampling server resources: {e}")
+            server = None
+        prev_time = next_tick = time.perf_counter()
+
+        stopping = False
+        while not stopping:
+            next_tick += self.sample_interval
+            delay = next_tick - time.perf_counter()
+            if delay < 0:
+                skipped = int(-delay // self.sample_interval)
+                self.missed_ticks += skipped
+                next_tick += skipped * self.sample_interval
+                delay = next_tick - time.perf_counter()
+            stopping = self.stop_event.wait(max(0.0, delay))
+
+            now = time.perf_counter()
+            elapsed = now - prev_time
+            prev_time = now
+            if elapsed <= 0:
+                continue
+            processes = len(client.samplers)
+            client_reading = client.read()
+            if len(client.samplers) != processes:
+                prev_client = None
             try:
-                self.samples.append({
-                    'timestamp': time.time(),
-                    'cpu_percent': process.cpu_percent(),
-                    'memory_mb': process.memory_info().rss / (1024 * 1024)
-                })
-            except Exception as e:
-                print(f"Error sampling resources: {e}")
-            time.sleep(self.sample_interval)
+                server_reading = server.read() if server else None
+            except (OSError, psutil.Error) as e:
+                print(f"Error sampling server resources: {e}")
+                server = server_reading = None
+            client_cpu = (client_reading[0] - prev_client[0]) / elapsed * 100 if prev_client else 0.0
+            server_cpu = (server_reading[0] - prev_server[0]) / elapsed * 100 \
+                if server_reading and prev_server else 0.0
+            server_values = server_reading or (0.0, 0.0, 0, 0)
+            self._record((time.time(), server_cpu, server_values[1], server_values[2],
+                          server_values[3], client_cpu, client_reading[1]))
+            prev_client = client_reading
+            prev_server = server_reading
+
+    def _filled(self, name):
+        """View (no copy) of the filled part of a column, in slot order"""
+        return self.columns[name][:min(self.sample_count, self.capacity)]
     
     def get_statistics(self):
-        """Calculate statistics from collected samples"""
-        if not self.samples:
+        """Calculate statistics from collected samples.
+
+        Once the ring buffer has wrapped, these cover the most recent
+        `capacity` samples; `samples` is always the total taken.
+        """
+        if self.sample_count == 0:
             return {
                 'cpu_avg': 0,
                 'cpu_max': 0,
                 'memory_avg': 0, 
                 'memory_max': 0,
-                'samples': 0
+                'threads_max': 0,
+                'open_fds_max': 0,
+                'client_cpu_avg': 0,
+                'client_memory_avg': 0,
+                'samples': 0,
+                'missed_ticks': self.missed_ticks
             }
-            
-        cpu_values = [s['cpu_percent'] for s in self.samples]
-        memory_values = [s['memory_mb'] for s in self.samples]
         
         return {
-            'cpu_avg': statistics.mean(cpu_values) if cpu_values else 0,
-            'cpu_max': max(cpu_values) if cpu_values else 0,
-            'memory_avg': statistics.mean(memory_values) if memory_values else 0,
-            'memory_max': max(memory_values) if memory_values else 0,
-            'samples': len(self.samples)
+            'cpu_avg': float(self._filled('cpu_percent').mean()),
+            'cpu_max': float(self._filled('cpu_percent').max()),
+            'memory_avg': float(self._filled('memory_mb').mean()),
+            'memory_max': float(self._filled('memory_mb').max()),
+            'threads_max': int(self._filled('threads').max()),
+            'open_fds_max': int(self._filled('open_fds').max()),
+            'client_cpu_avg': float(self._filled('client_cpu_percent').mean()),
+            'client_memory_avg': float(self._filled('client_memory_mb').mean()),
+            'samples': self.sample_count,
+            'missed_ticks': self.missed_ticks
         }
     
     def get_dataframe(self):
-        """Return samples as pandas DataFrame"""
-        return pd.DataFrame(self.samples)
+        """Return samples as pandas DataFrame in time order.
+
+        Until the ring buffer wraps the DataFrame is a view over the sample
+        arrays, which are reused by the next start_monitoring(). After a wrap
+        the columns have to be reordered, which copies them.
+        """
+        if self.sample_count <= self.capacity:
+            return pd.DataFrame({name: self._filled(name) for name in SAMPLE_COLUMNS}, copy=False)
+        oldest = self.sample_count % self.capacity
+        return pd.DataFrame({name: np.roll(self.columns[name], -oldest) for name in SAMPLE_COLUMNS})
 
 
 def run_experiment(object_type, operation, object_counts):
     """Run experiments with resource monitoring during execution"""
     results = []
-    monitor = ResourceMonitor(sample_interval=0.1)  # Sample every 100ms
+    monitor = ResourceMonitor(sample_interval=SAMPLE_INTERVAL)
+    update_pool = array('q')
     
     for count in object_counts:
-        # Create objects first if needed
-        if operation != "create":
-            items = []
-            create_func = create_todo if object_type == "todo" else create_project
-            for _ in range(count):
-                item = create_func()
-                if item:
-                    items.append(item["id"])
+        isolate_data_point()
+        if ISOLATION != "none":
+            update_pool = array('q')
+
+        # Create objects first if needed. Updates leave their objects in place,
+        # so later points reuse them and only seed the shortfall.
+        if operation == "delete":
+            items = seed_objects(object_type, count)
+        elif operation == "update":
+            if len(update_pool) < count:
+                update_pool.extend(seed_objects(object_type, count - len(update_pool)))
+            items = update_pool[:count]
+        store = store_columns()
         
         # Start monitoring
         monitor.start_monitoring()
+        histogram = LatencyHistogram()
         
+        if ENGINE == "asyncio":
+            specs = request_specs(object_type, operation, [None] * count if operation == "create" else items)
+
         # Time the operation
         start_time = time.time()
         
-        if operation == "create":
+        if ENGINE == "asyncio":
+            for latency, sent_at, _ in async_load.closed_loop(specs, ASYNC_IN_FLIGHT, api_client.BASE_URL):
+                histogram.record(latency, sent_at)
+        elif operation == "create":
             create_func = create_todo if object_type == "todo" else create_project
             for _ in range(count):
+                sent_at, op_start = time.time(), time.perf_counter()
                 create_func()
+                histogram.record(time.perf_counter() - op_start, sent_at)
         elif operation == "delete":
             delete_func = delete_todo if object_type == "todo" else delete_project
             for item_id in items:
+                sent_at, op_start = time.time(), time.perf_counter()
                 delete_func(item_id)
+                histogram.record(time.perf_counter() - op_start, sent_at)
         elif operation == "update":
             update_func = update_todo if object_type == "todo" else update_project
             for item_id in items:
+                sent_at, op_start = time.time(), time.perf_counter()
                 update_func(item_id)
+                histogram.record(time.perf_counter() - op_start, sent_at)
         
         duration = time.time() - start_time
          
@@ -170,6 +574,9 @@ def run_experiment(object_type, operation, object_counts):
         
         # Get resource usage statistics
         stats = monitor.get_statistics()
+        latency = histogram.summary()
+        log_events = align_with_server_log(f"{object_type} {operation} count={count}",
+                                           start_time, start_time + duration, histogram)
         
         results.append({
             "count": count,
@@ -179,19 +586,874 @@ def run_experiment(object_type, operation, object_counts):
             "cpu_max_percent": stats['cpu_max'],
             "memory_avg_mb": stats['memory_avg'],
             "memory_max_mb": stats['memory_max'],
+            "server_threads_max": stats['threads_max'],
+            "server_open_fds_max": stats['open_fds_max'],
+            "client_cpu_avg_percent": stats['client_cpu_avg'],
+            "client_memory_avg_mb": stats['client_memory_avg'],
             "samples": stats['samples'],
-            "operations_per_second": count / duration if duration > 0 else 0
+            "operations_per_second": count / duration if duration > 0 else 0,
+            "latency_p50_ms": latency['latency_p50_ms'],
+            "latency_p95_ms": latency['latency_p95_ms'],
+            "latency_p99_ms": latency['latency_p99_ms'],
+            "latency_p999_ms": latency['latency_p999_ms'],
+            "latency_max_ms": latency['latency_max_ms'],
+            "server_log_events": log_events,
+            "connections": connection_mode(),
+            **store
         })
         
         print(f"Completed {object_type} {operation} test with {count} objects in {duration:.2f} seconds")
-        print(f"  CPU: avg={stats['cpu_avg']:.1f}%, max={stats['cpu_max']:.1f}%")
-        print(f"  Memory: avg={stats['memory_avg']:.1f}MB, max={stats['memory_max']:.1f}MB")
+        print("  Store before run: " + ", ".join(f"{key[6:]}={value}" for key, value in store.items()))
+        print(f"  Server CPU: avg={stats['cpu_avg']:.1f}%, max={stats['cpu_max']:.1f}%")
+        print(f"  Server Memory: avg={stats['memory_avg']:.1f}MB, max={stats['memory_max']:.1f}MB")
+        print(f"  Server threads: max={stats['threads_max']}, open fds: max={stats['open_fds_max']}")
+        print(f"  Client CPU: avg={stats['client_cpu_avg']:.1f}%, Client Memory: avg={stats['client_memory_avg']:.1f}MB")
+        print(f"  Latency: p50={latency['latency_p50_ms']:.1f}ms, p99={latency['latency_p99_ms']:.1f}ms, "
+              f"p99.9={latency['latency_p999_ms']:.1f}ms, max={latency['latency_max_ms']:.1f}ms")
         
         # Small delay to let system stabilize
         time.sleep(2)
     
     return results
 
+def get_operation_funcs(object_type):
+    """Return the (create, update, delete) functions for an object type"""
+    if object_type == "todo":
+        return create_todo, update_todo, delete_todo
+    return create_project, update_project, delete_project
+
+def get_operation(object_type, operation):
+    """Return a one-argument callable performing `operation` on an object type.
+
+    The argument is the ID to update/delete and is ignored for creates.
+    """
+    create_func, update_func, delete_func = get_operation_funcs(object_type)
+    if operation == "create":
+        return lambda _: create_func()
+    if operation == "update":
+        return update_func
+    return delete_func
+
+def prepare_items(object_type, operation, count):
+    """Return the work items for a run: fresh IDs for update/delete, or one
+    placeholder per create"""
+    if operation == "create":
+        return [None] * count
+    return seed_objects(object_type, count)
+
+def run_closed_loop(object_type, operation, items, concurrency):
+    """Push operations through a pool of workers that each send the next request
+    as soon as their previous one returns.
+
+    `items` comes from prepare_items. Returns the wall time in seconds, a
+    LatencyHistogram of per-request latencies and the number of failed requests.
+    """
+    if ENGINE == "asyncio":
+        specs = request_specs(object_type, operation, items)
+        start_time = time.perf_counter()
+        outcomes = async_load.closed_loop(specs, concurrency, api_client.BASE_URL)
+        duration = time.perf_counter() - start_time
+        return duration, *_closed_loop_results(outcomes)
+
+    op_func = get_operation(object_type, operation)
+
+    def timed_op(item):
+        sent_at, start = time.time(), time.perf_counter()
+        try:
+            ok = bool(op_func(item))
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - start, sent_at, ok
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(timed_op, items))
+    duration = time.perf_counter() - start_time
+    return duration, *_closed_loop_results(outcomes)
+
+def _closed_loop_results(outcomes):
+    """Histogram and error count of (latency, sent_at, ok) outcomes"""
+    histogram = LatencyHistogram()
+    errors = 0
+    for latency, sent_at, ok in outcomes:
+        histogram.record(latency, sent_at)
+        if not ok:
+            errors += 1
+    return histogram, errors
+
+def run_open_loop(object_type, operation, items, rate, max_workers=OPEN_LOOP_MAX_WORKERS):
+    """Send operations on a fixed schedule of `rate` requests per second, no
+    matter how quickly earlier requests complete.
+
+    Request i is due at start + i / rate. Its latency is measured from that
+    intended send time, not from when a worker actually sent it, so time spent
+    queued behind a stalled response is counted instead of hidden
+    (coordinated-omission correction). Returns the wall time, histograms of the
+    corrected latencies and of the service times (actual send to response), and
+    the error count.
+    """
+    if ENGINE == "asyncio":
+        specs = request_specs(object_type, operation, items)
+        start_time = time.perf_counter()
+        wall_offset = time.time() - start_time
+        outcomes = async_load.open_loop(specs, rate, ASYNC_MAX_IN_FLIGHT, api_client.BASE_URL)
+        duration = time.perf_counter() - start_time
+        return duration, *_open_loop_results(outcomes, wall_offset)
+
+    op_func = get_operation(object_type, operation)
+
+    def timed_op(item, intended_start):
+        actual_start = time.perf_counter()
+        try:
+            ok = bool(op_func(item))
+        except requests.RequestException:
+            ok = False
+        end = time.perf_counter()
+        return end - intended_start, end - actual_start, intended_start, ok
+
+    interval = 1.0 / rate
+    futures = []
+    start_time = time.perf_counter()
+    wall_offset = time.time() - start_time
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for i, item in enumerate(items):
+            intended_start = start_time + i * interval
+            delay = intended_start - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(timed_op, item, intended_start))
+        outcomes = [future.result() for future in futures]
+    duration = time.perf_counter() - start_time
+    return duration, *_open_loop_results(outcomes, wall_offset)
+
+def _open_loop_results(outcomes, wall_offset):
+    """Corrected and service-time histograms and the error count of
+    (latency, service time, intended start, ok) outcomes"""
+    histogram = LatencyHistogram()
+    service_histogram = LatencyHistogram()
+    errors = 0
+    for latency, service_time, intended_start, ok in outcomes:
+        histogram.record(latency, intended_start + wall_offset)
+        service_histogram.record(service_time)
+        if not ok:
+            errors += 1
+    return histogram, service_histogram, errors
+
+def _init_load_process(engine, in_flight, max_in_flight, base_url, pooled, pool_size, timeout):
+    """Runs in each load process: take the controller's settings and drop any
+    keep-alive connections inherited from it"""
+    global ENGINE, ASYNC_IN_FLIGHT, ASYNC_MAX_IN_FLIGHT
+    ENGINE, ASYNC_IN_FLIGHT, ASYNC_MAX_IN_FLIGHT = engine, in_flight, max_in_flight
+    api_client.configure(base_url=base_url, pooled=pooled, pool_size=pool_size, timeout=timeout)
+
+def start_load_processes(count):
+    """Start the pool of load-generating processes and remember their PIDs"""
+    global LOAD_POOL, LOAD_PIDS
+    existing = {child.pid for child in psutil.Process().children()}
+    LOAD_POOL = multiprocessing.Pool(count, initializer=_init_load_process,
+                                     initargs=(ENGINE, ASYNC_IN_FLIGHT, ASYNC_MAX_IN_FLIGHT, api_client.BASE_URL,
+                                               api_client.POOLED, api_client.POOL_SIZE, api_client.TIMEOUT))
+    LOAD_PIDS = [child.pid for child in psutil.Process().children() if child.pid not in existing]
+    print(f"Started {count} load processes")
+
+def stop_load_processes():
+    global LOAD_POOL, LOAD_PIDS
+    if LOAD_POOL is not None:
+        LOAD_POOL.close()
+        LOAD_POOL.join()
+    LOAD_POOL, LOAD_PIDS = None, []
+
+def _run_share(kind, object_type, operation, items, level, start_at):
+    """One load process's part of a data point, started at wall time start_at.
+    Returns when it finished and what its runner returned."""
+    time.sleep(max(0.0, start_at - time.time()))
+    runner = run_closed_loop if kind == "closed" else run_open_loop
+    outcome = runner(object_type, operation, items, level)
+    return time.time(), outcome
+
+def load_shares(kind, items, level, processes, start_at):
+    """Split a data point between processes as (items, level, start time).
+
+    Process i gets every n-th item from the i-th. Closed-loop concurrency is
+    divided as evenly as whole workers allow; in open loop each process sends
+    at level / n, started i / level later, so the processes' arrivals
+    interleave into the single-process schedule.
+    """
+    shares = []
+    for i in range(processes):
+        if kind == "closed":
+            share_level, share_start = level // processes + (i < level % processes), start_at
+        else:
+            share_level, share_start = level / processes, start_at + i / level
+        shares.append((items[i::processes], share_level, share_start))
+    return shares
+
+def merge_outcomes(outcomes):
+    """Merge the runner results of several processes, less their durations:
+    histograms are merged and error counts added"""
+    merged = list(outcomes[0])
+    for outcome in outcomes[1:]:
+        for position, value in enumerate(outcome):
+            merged[position] = merged[position].merge(value) if hasattr(value, "merge") else merged[position] + value
+    return merged
+
+def run_load(kind, object_type, operation, items, level):
+    """Run a closed-loop (level = concurrency) or open-loop (level = rate)
+    data point, in this process or split across LOAD_POOL.
+
+    Every process gets every n-th item. Closed-loop concurrency is divided
+    between the processes; in open loop each sends at rate / n, offset so the
+    combined arrivals keep the single-process schedule. Returns what
+    run_closed_loop or run_open_loop would, with histograms and error counts
+    merged and the wall time from the common start to the last process done.
+    """
+    runner = run_closed_loop if kind == "closed" else run_open_loop
+    processes = min(PROCESSES, len(items), int(level) if kind == "closed" else PROCESSES)
+    if LOAD_POOL is None or processes <= 1:
+        return runner(object_type, operation, items, level)
+    start_at = time.time() + LOAD_START_DELAY
+    finished = LOAD_POOL.starmap(_run_share, [(kind, object_type, operation, *share)
+                                              for share in load_shares(kind, items, level, processes, start_at)])
+    duration = max(finished_at for finished_at, _ in finished) - start_at
+    return duration, *merge_outcomes([outcome[1:] for _, outcome in finished])
+
+def run_concurrency_experiment(object_type, operation, count, concurrency_levels=CONCURRENCY_LEVELS):
+    """Run the same operation batch at increasing worker counts and report
+    throughput and latency for each level"""
+    results = []
+    monitor = ResourceMonitor(sample_interval=SAMPLE_INTERVAL)
+
+    for concurrency in concurrency_levels:
+        isolate_data_point()
+        items = prepare_items(object_type, operation, count)
+        store = store_columns()
+
+        monitor.start_monitoring()
+        start_time = time.time()
+        duration, histogram, errors = run_load("closed", object_type, operation, items, concurrency)
+        monitor.stop_monitoring()
+        stats = monitor.get_statistics()
+        log_events = align_with_server_log(f"{object_type} {operation} concurrency={concurrency}",
+                                           start_time, start_time + duration, histogram)
+
+        row = {
+            "concurrency": concurrency,
+            "count": len(items),
+            "time_seconds": duration,
+            "operations_per_second": len(items) / duration if duration > 0 else 0,
+            **histogram.summary(),
+            "errors": errors,
+            "server_log_events": log_events,
+            "cpu_avg_percent": stats['cpu_avg'],
+            "memory_avg_mb": stats['memory_avg'],
+            "client_cpu_avg_percent": stats['client_cpu_avg'],
+            "connections": connection_mode(),
+            "load_processes": PROCESSES,
+            **store
+        }
+        results.append(row)
+
+        print(f"Completed {object_type} {operation} with {concurrency} workers: "
+              f"{row['operations_per_second']:.1f} ops/s, p50={row['latency_p50_ms']:.1f}ms, "
+              f"p99={row['latency_p99_ms']:.1f}ms, errors={errors}")
+
+        time.sleep(2)
+
+    return results
+
+def run_open_loop_experiment(object_type, operation, rates, duration_seconds, slo_p99_ms=None):
+    """Run a constant-arrival-rate test at each target rate and report the
+    corrected latency distribution alongside the raw service time"""
+    results = []
+    monitor = ResourceMonitor(sample_interval=SAMPLE_INTERVAL)
+
+    for rate in rates:
+        count = max(1, int(rate * duration_seconds))
+        isolate_data_point()
+        items = prepare_items(object_type, operation, count)
+        store = store_columns()
+
+        monitor.start_monitoring()
+        start_time = time.time()
+        duration, histogram, service_histogram, errors = run_load("open", object_type, operation, items, rate)
+        monitor.stop_monitoring()
+        stats = monitor.get_statistics()
+        log_events = align_with_server_log(f"{object_type} {operation} rate={rate}",
+                                           start_time, start_time + duration, histogram)
+
+        row = {
+            "target_rate": rate,
+            "count": len(items),
+            "time_seconds": duration,
+            "achieved_rate": len(items) / duration if duration > 0 else 0,
+            **histogram.summary(),
+            **service_histogram.summary(prefix="service"),
+            "errors": errors,
+            "server_log_events": log_events,
+            "cpu_avg_percent": stats['cpu_avg'],
+            "memory_avg_mb": stats['memory_avg'],
+            "client_cpu_avg_percent": stats['client_cpu_avg'],
+            "connections": connection_mode(),
+            "load_processes": PROCESSES,
+            **store
+        }
+        if slo_p99_ms is not None:
+            row["slo_p99_ms"] = slo_p99_ms
+            row["slo_met"] = row["latency_p99_ms"] <= slo_p99_ms and errors == 0
+        results.append(row)
+
+        print(f"Completed {object_type} {operation} at {rate} req/s target "
+              f"({row['achieved_rate']:.1f} req/s achieved): "
+              f"p50={row['latency_p50_ms']:.1f}ms, p99={row['latency_p99_ms']:.1f}ms "
+              f"(service p99={row['service_p99_ms']:.1f}ms), errors={errors}")
+        if slo_p99_ms is not None:
+            print(f"  SLO p99 <= {slo_p99_ms}ms: {'met' if row['slo_met'] else 'MISSED'}")
+
+        time.sleep(2)
+
+    return results
+
+def run_cassette_replay(interactions, multiplier, max_workers=OPEN_LOOP_MAX_WORKERS):
+    """Send a cassette's recorded requests on their recorded schedule, sped up
+    `multiplier` times, against the live server.
+
+    Each chapter (test or scenario) replays its requests in recorded order, as
+    the test made them one after another; chapters run concurrently when the
+    sped-up schedule makes them overlap. As in run_open_loop, latency is
+    measured from each request's intended send time, so waiting for the
+    previous request of the chapter counts. IDs from the recording are mapped
+    to the ones the live server hands out. Returns the wall time, corrected and
+    service-time histograms, the error count and how many responses had a
+    different status than in the recording.
+    """
+    ids = cassette.IdMap(interactions)
+    chapters = {}
+    for interaction in interactions:
+        chapters.setdefault(interaction["chapter"], []).append(interaction)
+
+    def replay_chapter(chapter_interactions, start_time):
+        outcomes = []
+        for interaction in chapter_interactions:
+            intended_start = start_time + interaction["t"] / multiplier
+            delay = intended_start - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            path, body = ids.rewrite(interaction)
+            actual_start = time.perf_counter()
+            response = None
+            try:
+                response = api_client.request(interaction["method"], path, data=body.encode() or None,
+                                              headers=interaction["headers"])
+                status = response.status_code
+            except requests.RequestException:
+                status = None
+            finally:
+                ids.learn(interaction, response)
+            end = time.perf_counter()
+            outcomes.append((end - intended_start, end - actual_start, intended_start, status, interaction["status"]))
+        return outcomes
+
+    start_time = time.perf_counter()
+    wall_offset = time.time() - start_time
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(replay_chapter, chapter_interactions, start_time)
+                   for chapter_interactions in chapters.values()]
+        outcomes = [outcome for future in futures for outcome in future.result()]
+    duration = time.perf_counter() - start_time
+
+    histogram = LatencyHistogram()
+    service_histogram = LatencyHistogram()
+    errors = mismatches = 0
+    for latency, service_time, intended_start, status, recorded_status in outcomes:
+        histogram.record(latency, intended_start + wall_offset)
+        service_histogram.record(service_time)
+        if status is None:
+            errors += 1
+        elif status != recorded_status:
+            mismatches += 1
+    return duration, histogram, service_histogram, errors, mismatches
+
+def run_cassette_experiment(path, multipliers):
+    """Replay a recorded cassette as load at each rate multiplier"""
+    interactions = cassette.load_schedule(path)
+    recorded_seconds = interactions[-1]["t"] if interactions else 0
+    results = []
+    monitor = ResourceMonitor(sample_interval=SAMPLE_INTERVAL)
+
+    for multiplier in multipliers:
+        isolate_data_point()
+        store = store_columns()
+
+        monitor.start_monitoring()
+        start_time = time.time()
+        duration, histogram, service_histogram, errors, mismatches = run_cassette_replay(interactions, multiplier)
+        monitor.stop_monitoring()
+        stats = monitor.get_statistics()
+        log_events = align_with_server_log(f"cassette x{multiplier}", start_time, start_time + duration, histogram)
+
+        row = {
+            "rate_multiplier": multiplier,
+            "count": len(interactions),
+            "recorded_seconds": recorded_seconds,
+            "time_seconds": duration,
+            "achieved_rate": len(interactions) / duration if duration > 0 else 0,
+            **histogram.summary(),
+            **service_histogram.summary(prefix="service"),
+            "errors": errors,
+            "status_mismatches": mismatches,
+            "server_log_events": log_events,
+            "cpu_avg_percent": stats['cpu_avg'],
+            "memory_avg_mb": stats['memory_avg'],
+            "client_cpu_avg_percent": stats['client_cpu_avg'],
+            "connections": connection_mode(),
+            **store
+        }
+        results.append(row)
+
+        print(f"Completed cassette replay at x{multiplier} ({row['achieved_rate']:.1f} req/s): "
+              f"p50={row['latency_p50_ms']:.1f}ms, p99={row['latency_p99_ms']:.1f}ms, "
+              f"errors={errors}, status mismatches={mismatches}")
+
+        time.sleep(2)
+
+    return results
+
+MIX_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+
+def seed_mix_pool():
+    """Objects of every resource for a workload mix to read, update and delete"""
+    seeded = {}
+    for resource in workloads.RESOURCES:
+        specs = [(f"/{resource}", {"title": f"Mix seed {resource} {i}"}) for i in range(workloads.POOL_SEED_COUNT)]
+        seeded[resource] = [obj for obj in seeding.create_all(specs) if obj]
+        if not seeded[resource]:
+            raise RuntimeError(f"Could not seed any {resource} for the workload mix "
+                               f"(all {workloads.POOL_SEED_COUNT} creations failed)")
+    return seeded
+
+def run_mix(mix, count, concurrency):
+    """Send `count` requests of a workload mix from `concurrency` closed-loop
+    workers. Returns the wall time, and a LatencyHistogram and error count
+    per operation."""
+    histograms, errors = {}, {}
+    lock = threading.Lock()
+    remaining = [count]
+
+    def next_request():
+        with lock:
+            if remaining[0] == 0:
+                return None
+            remaining[0] -= 1
+        name, spec, creates = mix.next_request()
+
+        def done(status, body, latency, sent_at):
+            mix.learn(creates, status, body)
+            with lock:
+                histograms.setdefault(name, LatencyHistogram()).record(latency, sent_at)
+                if status != spec[3]:
+                    errors[name] = errors.get(name, 0) + 1
+        return spec, done
+
+    def worker():
+        while (request := next_request()) is not None:
+            (method, path, body, _), done = request
+            sent_at, start = time.time(), time.perf_counter()
+            try:
+                response = api_client.request(method, path, data=body, headers=MIX_HEADERS)
+                status, content = response.status_code, response.content
+            except requests.RequestException:
+                status, content = None, b""
+            done(status, content, time.perf_counter() - start, sent_at)
+
+    start_time = time.perf_counter()
+    if ENGINE == "asyncio":
+        async_load.drive(next_request, concurrency, api_client.BASE_URL)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in [pool.submit(worker) for _ in range(concurrency)]:
+                future.result()
+    return time.perf_counter() - start_time, histograms, errors
+
+def run_mix_experiment(workload, count, concurrency_levels=CONCURRENCY_LEVELS):
+    """Run a weighted workload at each worker count and report throughput and
+    latency per operation, plus an "all" row for the whole mix"""
+    weights = workloads.load_workload(workload)
+    results = []
+    monitor = ResourceMonitor(sample_interval=SAMPLE_INTERVAL)
+
+    for concurrency in concurrency_levels:
+        isolate_data_point()
+        mix = workloads.Mix(weights, seed_mix_pool())
+        store = store_columns()
+
+        monitor.start_monitoring()
+        start_time = time.time()
+        duration, histograms, errors = run_mix(mix, count, concurrency)
+        monitor.stop_monitoring()
+        stats = monitor.get_statistics()
+
+        overall = LatencyHistogram()
+        for histogram in histograms.values():
+            overall.merge(histogram)
+        log_events = align_with_server_log(f"mix {workload} concurrency={concurrency}",
+                                           start_time, start_time + duration, overall)
+        rows = sorted(histograms.items(), key=lambda item: -item[1].total_count) + [("all", overall)]
+        print(f"Completed {workload} mix with {concurrency} workers in {duration:.2f}s:")
+        for operation, histogram in rows:
+            operation_errors = sum(errors.values()) if operation == "all" else errors.get(operation, 0)
+            row = {
+                "workload": workload,
+                "concurrency": concurrency,
+                "operation": operation,
+                "count": histogram.total_count,
+                "share_percent": histogram.total_count / overall.total_count * 100 if overall.total_count else 0,
+                "time_seconds": duration,
+                "operations_per_second": histogram.total_count / duration if duration > 0 else 0,
+                **histogram.summary(),
+                "errors": operation_errors,
+                "server_log_events": log_events,
+                "cpu_avg_percent": stats['cpu_avg'],
+                "memory_avg_mb": stats['memory_avg'],
+                "client_cpu_avg_percent": stats['client_cpu_avg'],
+                "connections": connection_mode(),
+                **store
+            }
+            results.append(row)
+            print(f"  {operation:<20} {row['count']:>6} ({row['share_percent']:4.1f}%) "
+                  f"{row['operations_per_second']:8.1f} ops/s  p50={row['latency_p50_ms']:.1f}ms "
+                  f"p95={row['latency_p95_ms']:.1f}ms p99={row['latency_p99_ms']:.1f}ms errors={operation_errors}")
+
+        time.sleep(2)
+
+    return results
+
+def measure_get(path, samples=SCALING_SAMPLES, warmup=SCALING_WARMUP):
+    """Time `samples` sequential GETs of a path after `warmup` untimed ones.
+    Returns the latency histogram and the response size in bytes."""
+    histogram = LatencyHistogram()
+    response_bytes = 0
+    for i in range(warmup + samples):
+        sent_at, start = time.time(), time.perf_counter()
+        response = api_client.get(path)
+        latency = time.perf_counter() - start
+        response_bytes = len(response.content)
+        if i >= warmup:
+            histogram.record(latency, sent_at)
+    return histogram, response_bytes
+
+def fit_growth(store_sizes, latencies_ms):
+    """Least-squares fit of latency = a * size ** b in log-log space. b is the
+    growth exponent: about 1 when every request scans the whole store, about 0
+    when the store size does not matter. Returns (a, b)."""
+    b, log_a = np.polyfit(np.log(store_sizes), np.log(latencies_ms), 1)
+    return float(np.exp(log_a)), float(b)
+
+def fit_r_squared(store_sizes, latencies_ms, a, b):
+    """How much of the log-log variance the fit a * size ** b explains"""
+    log_latencies = np.log(latencies_ms)
+    residuals = log_latencies - (np.log(a) + b * np.log(store_sizes))
+    total = np.sum((log_latencies - np.mean(log_latencies)) ** 2)
+    return float(1 - np.sum(residuals ** 2) / total) if total > 0 else 0.0
+
+def slo_break_size(a, b, slo_ms, largest_size, r_squared=1.0):
+    """Store size at which the fitted latency reaches the SLO, and a note.
+
+    The size is None when the fit shows no measurable growth (exponent below
+    SCALING_MIN_EXPONENT or r^2 below SCALING_MIN_R_SQUARED), or when the SLO
+    is only reached beyond SCALING_MAX_EXTRAPOLATION times the largest size
+    measured.
+    """
+    if b < SCALING_MIN_EXPONENT or r_squared < SCALING_MIN_R_SQUARED:
+        return None, "no measurable growth"
+    size = (slo_ms / a) ** (1 / b)
+    if size > largest_size * SCALING_MAX_EXTRAPOLATION:
+        return None, f"beyond {SCALING_MAX_EXTRAPOLATION}x the largest size measured"
+    return size, "extrapolated" if size > largest_size else "within measured range"
+
+def run_scaling_experiment(object_type, sizes, samples, slo_p99_ms=None):
+    """Grow the store through `sizes` objects and time GET-all and the
+    filtered GET at each size. Returns the per-size rows and, per endpoint,
+    the fitted growth of p50/p99 latency and response size."""
+    resource = "todos" if object_type == "todo" else "projects"
+    collection = f"/{resource}"
+    isolate_data_point()
+    # Probes left by earlier runs on a reused server would make the filter
+    # match more than one object
+    for stale in api_client.get(collection, params={"title": SCALING_PROBE_TITLE}).json().get(resource, []):
+        api_client.delete(f"{collection}/{stale['id']}")
+    api_client.post(collection, json={"title": SCALING_PROBE_TITLE})
+    endpoints = {"list": collection, "filter": f"{collection}?title={SCALING_PROBE_TITLE}"}
+    results = []
+    monitor = ResourceMonitor(sample_interval=SAMPLE_INTERVAL)
+
+    for size in sorted(sizes):
+        shortfall = size - len(seeding.list_ids(resource))
+        if shortfall > 0:
+            print(f"  Growing {resource} to {size}...")
+            seed_objects(object_type, shortfall)
+        store = store_columns()
+
+        monitor.start_monitoring()
+        measured = {endpoint: measure_get(path, samples) for endpoint, path in endpoints.items()}
+        monitor.stop_monitoring()
+        stats = monitor.get_statistics()
+
+        for endpoint, (histogram, response_bytes) in measured.items():
+            row = {
+                "object_type": object_type,
+                "endpoint": endpoint,
+                "store_size": store[f"store_{resource}"],
+                "samples": samples,
+                **histogram.summary(),
+                "response_bytes": response_bytes,
+                "bytes_per_object": response_bytes / store[f"store_{resource}"],
+                "cpu_avg_percent": stats['cpu_avg'],
+                "memory_avg_mb": stats['memory_avg'],
+                "connections": connection_mode(),
+                **store
+            }
+            results.append(row)
+            print(f"Completed {endpoint} GET with {row['store_size']} {resource}: "
+                  f"p50={row['latency_p50_ms']:.1f}ms, p99={row['latency_p99_ms']:.1f}ms, "
+                  f"{response_bytes} bytes")
+
+    fits = []
+    df = pd.DataFrame(results)
+    for endpoint in endpoints:
+        points = df[df['endpoint'] == endpoint]
+        if len(points) < 2:
+            continue
+        fit = {"object_type": object_type, "endpoint": endpoint}
+        for column in ("latency_p50_ms", "latency_p99_ms", "response_bytes"):
+            values = points[column].clip(lower=0.001)
+            a, b = fit_growth(points['store_size'], values)
+            fit[f"{column}_coefficient"], fit[f"{column}_exponent"] = a, b
+            fit[f"{column}_r_squared"] = fit_r_squared(points['store_size'], values, a, b)
+        if slo_p99_ms is not None:
+            largest = points['store_size'].max()
+            fit["slo_p99_ms"] = slo_p99_ms
+            fit["slo_break_store_size"], fit["slo_break_note"] = slo_break_size(
+                fit["latency_p99_ms_coefficient"], fit["latency_p99_ms_exponent"], slo_p99_ms,
+                largest, fit["latency_p99_ms_r_squared"])
+        fits.append(fit)
+        print(f"{endpoint} GET: p99 grows as size^{fit['latency_p99_ms_exponent']:.2f} "
+              f"(r^2 {fit['latency_p99_ms_r_squared']:.2f}), "
+              f"response bytes as size^{fit['response_bytes_exponent']:.2f}")
+        if slo_p99_ms is not None:
+            break_size, note = fit["slo_break_store_size"], fit["slo_break_note"]
+            if break_size is not None:
+                print(f"  p99 reaches the {slo_p99_ms}ms SLO at about {break_size:,.0f} {resource} ({note})")
+            elif note == "no measurable growth":
+                print("  p99 shows no measurable growth with store size, so no SLO break size is extrapolated")
+            else:
+                print(f"  p99 stays under the {slo_p99_ms}ms SLO up to {largest * SCALING_MAX_EXTRAPOLATION:,} "
+                      f"{resource} ({note})")
+    return results, fits
+
+def create_scaling_figures(object_type, results):
+    """Plot latency and response size against store size on log-log axes"""
+    df = pd.DataFrame(results)
+    plt.figure(figsize=(10, 6))
+    for endpoint in df['endpoint'].unique():
+        endpoint_df = df[df['endpoint'] == endpoint]
+        line, = plt.plot(endpoint_df['store_size'], endpoint_df['latency_p50_ms'], marker='o',
+                         label=f'{endpoint} p50')
+        plt.plot(endpoint_df['store_size'], endpoint_df['latency_p99_ms'], marker='x', linestyle='--',
+                 color=line.get_color(), label=f'{endpoint} p99')
+    plt.title(f'GET Latency versus Number of Stored "{object_type}" Objects')
+    plt.xlabel(f'Number of "{object_type}" Objects')
+    plt.ylabel('Latency (ms)')
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(f'tests/figures/{object_type}_scaling_latency.png')
+    plt.close()
+
+    plt.figure(figsize=(10, 6))
+    for endpoint in df['endpoint'].unique():
+        endpoint_df = df[df['endpoint'] == endpoint]
+        plt.plot(endpoint_df['store_size'], endpoint_df['response_bytes'], marker='o', label=endpoint)
+    plt.title(f'GET Response Size versus Number of Stored "{object_type}" Objects')
+    plt.xlabel(f'Number of "{object_type}" Objects')
+    plt.ylabel('Response Size (bytes)')
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(f'tests/figures/{object_type}_scaling_bytes.png')
+    plt.close()
+
+def server_memory_mb():
+    """Current RSS of the server process in MB, or None if it is not found"""
+    pid = SERVER_PID or find_server_pid()
+    if pid is None:
+        return None
+    try:
+        return ProcessSampler(pid, count_fds=False).read()[1]
+    except (OSError, psutil.Error):
+        return None
+
+def build_fanout_graph(shape, fanout, mesh_width):
+    """Create the nodes of a graph, then link them one edge at a time.
+
+    Returns the hub's path, the path traversed in the benchmark, the
+    relationship of a linked todo that deleting the hub must clear, the
+    association latency histogram, the edge count and the server memory (MB)
+    before and after linking.
+    """
+    todos = seeding.seed("/todos", fanout, lambda i: {"title": f"Fanout todo {i}"})
+    if shape == "project":
+        hubs = [api_client.post("/projects", json={"title": "Fanout hub"}).json()["id"]]
+        relationship = "tasksof"
+    else:
+        width = mesh_width if shape == "mesh" else 1
+        hubs = [str(category_id) for category_id in
+                seeding.seed("/categories", width, lambda i: {"title": f"Fanout category {i}"})]
+        relationship = "categories"
+    memory_before = server_memory_mb()
+
+    histogram = LatencyHistogram()
+    for todo_id in todos:
+        for hub in hubs:
+            sent_at, start = time.time(), time.perf_counter()
+            api_client.post(f"/todos/{todo_id}/{relationship}", json={"id": hub})
+            histogram.record(time.perf_counter() - start, sent_at)
+    memory_after = server_memory_mb()
+
+    hub_path = f"/projects/{hubs[0]}" if shape == "project" else f"/categories/{hubs[0]}"
+    traverse_path = f"{hub_path}/tasks" if shape == "project" else f"{hub_path}/todos"
+    return hub_path, traverse_path, f"/todos/{todos[0]}/{relationship}", histogram, \
+        len(todos) * len(hubs), memory_before, memory_after
+
+def run_fanout_experiment(shapes, sizes, mesh_width=FANOUT_MESH_WIDTH, samples=SCALING_SAMPLES):
+    """Build each graph shape at each fan-out and time association,
+    traversal and cascading deletion of the hub, plus server memory per edge.
+    memory_per_edge_bytes is left empty when the server's RSS moved by less
+    than FANOUT_MEMORY_RESOLUTION_MB; use larger fan-outs to resolve it."""
+    results = []
+    for shape in shapes:
+        for fanout in sorted(sizes):
+            isolate_data_point()
+            store = store_columns()
+            hub_path, traverse_path, back_path, associate, edges, memory_before, memory_after = \
+                build_fanout_graph(shape, fanout, mesh_width)
+            traverse, traverse_bytes = measure_get(traverse_path, samples)
+
+            start = time.perf_counter()
+            status = api_client.delete(hub_path).status_code
+            delete_ms = (time.perf_counter() - start) * 1000
+            hub_id = hub_path.rsplit("/", 1)[1]
+            remaining = api_client.get(back_path).json()
+            cascaded = status == 200 and all(link["id"] != hub_id for link in next(iter(remaining.values()), []))
+
+            memory_per_edge = None
+            if memory_before is None or memory_after is None:
+                memory_note = "memory n/a"
+            elif memory_after - memory_before < FANOUT_MEMORY_RESOLUTION_MB:
+                memory_note = (f"memory per edge below resolution "
+                               f"(< {FANOUT_MEMORY_RESOLUTION_MB * 1024 * 1024 / edges:.0f} bytes/edge)")
+            else:
+                memory_per_edge = (memory_after - memory_before) * 1024 * 1024 / edges
+                memory_note = f"{memory_per_edge:.0f} bytes/edge"
+            row = {
+                "shape": shape,
+                "fanout": fanout,
+                "mesh_width": mesh_width if shape == "mesh" else 1,
+                "edges": edges,
+                **associate.summary(prefix="associate"),
+                "traverse_route": normalize_route(traverse_path),
+                **traverse.summary(prefix="traverse"),
+                "traverse_bytes": traverse_bytes,
+                "delete_ms": delete_ms,
+                "cascade_ok": cascaded,
+                "server_memory_before_mb": memory_before,
+                "server_memory_after_mb": memory_after,
+                "memory_per_edge_bytes": memory_per_edge,
+                "connections": connection_mode(),
+                **store
+            }
+            results.append(row)
+            print(f"Completed {shape} fan-out {fanout} ({edges} edges): "
+                  f"associate p50={row['associate_p50_ms']:.1f}ms, traverse p50={row['traverse_p50_ms']:.1f}ms "
+                  f"({traverse_bytes} bytes), delete={delete_ms:.1f}ms, cascade {'ok' if cascaded else 'INCOMPLETE'}, "
+                  + memory_note)
+
+    df = pd.DataFrame(results)
+    for shape in shapes:
+        points = df[df['shape'] == shape]
+        if len(points) < 2:
+            continue
+        growth = {column: fit_growth(points['fanout'], points[column].clip(lower=0.001))[1]
+                  for column in ("associate_p50_ms", "traverse_p50_ms", "delete_ms")}
+        print(f"{shape}: latency grows with fan-out as size^b, b = "
+              + ", ".join(f"{column[:-3]} {b:.2f}" for column, b in growth.items()))
+    return results
+
+def create_fanout_figures(results):
+    """Plot association, traversal and deletion latency against fan-out"""
+    df = pd.DataFrame(results)
+    plt.figure(figsize=(10, 6))
+    for shape in df['shape'].unique():
+        shape_df = df[df['shape'] == shape]
+        line, = plt.plot(shape_df['fanout'], shape_df['associate_p50_ms'], marker='o', label=f'{shape} associate p50')
+        plt.plot(shape_df['fanout'], shape_df['traverse_p50_ms'], marker='x', linestyle='--',
+                 color=line.get_color(), label=f'{shape} traverse p50')
+        plt.plot(shape_df['fanout'], shape_df['delete_ms'], marker='^', linestyle=':',
+                 color=line.get_color(), label=f'{shape} delete hub')
+    plt.title('Relationship Latency versus Fan-out')
+    plt.xlabel('Fan-out (todos linked to the hub)')
+    plt.ylabel('Latency (ms)')
+    plt.xscale('log')
+    plt.yscale('log')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig('tests/figures/fanout_latency.png')
+    plt.close()
+
+def create_concurrency_figures(object_type, concurrency_results):
+    """Plot throughput and tail latency against worker count for each operation"""
+    df = pd.DataFrame()
+    for operation, results in concurrency_results.items():
+        op_df = pd.DataFrame(results)
+        op_df['operation'] = operation
+        df = pd.concat([df, op_df], ignore_index=True)
+
+    plt.figure(figsize=(10, 6))
+    for operation in df['operation'].unique():
+        op_df = df[df['operation'] == operation]
+        plt.plot(op_df['concurrency'], op_df['operations_per_second'], marker='o', label=operation)
+    plt.title(f'Throughput versus Concurrent Workers ("{object_type}")')
+    plt.xlabel('Concurrent Workers')
+    plt.ylabel('Throughput (operations/second)')
+    plt.xscale('log', base=2)
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(f'tests/figures/{object_type}_concurrency_throughput.png')
+    plt.close()
+
+    plt.figure(figsize=(10, 6))
+    for operation in df['operation'].unique():
+        op_df = df[df['operation'] == operation]
+        plt.plot(op_df['concurrency'], op_df['latency_p50_ms'], marker='o', label=f'{operation} p50')
+        plt.plot(op_df['concurrency'], op_df['latency_p99_ms'], marker='x', linestyle='--', label=f'{operation} p99')
+    plt.title(f'Latency versus Concurrent Workers ("{object_type}")')
+    plt.xlabel('Concurrent Workers')
+    plt.ylabel('Latency (ms)')
+    plt.xscale('log', base=2)
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(f'tests/figures/{object_type}_concurrency_latency.png')
+    plt.close()
+
+    df.to_csv(f'tests/{object_type}_concurrency_results.csv', index=False)
+    print(f"Concurrency results for {object_type} saved")
+
 def create_separate_figures(todo_results, project_results):
     """Create and save separate figures for each metric"""
     
@@ -226,7 +1488,9 @@ def create_separate_figures(todo_results, project_results):
     plt.figure(figsize=(10, 6))
     for operation in todo_df['operation'].unique():
         op_df = todo_df[todo_df['operation'] == operation]
-        plt.plot(op_df['count'], op_df['cpu_avg_percent'], marker='o', label=operation)
+        line, = plt.plot(op_df['count'], op_df['cpu_avg_percent'], marker='o', label=f'{operation} (server)')
+        plt.plot(op_df['count'], op_df['client_cpu_avg_percent'], marker='x', linestyle='--',
+                 color=line.get_color(), label=f'{operation} (client)')
     plt.title('Figure 2. CPU Usage versus Number of "todo" Objects')
     plt.xlabel('Number of "todo" Objects')
     plt.ylabel('CPU Usage (%)')
@@ -240,7 +1504,9 @@ def create_separate_figures(todo_results, project_results):
     plt.figure(figsize=(10, 6))
     for operation in todo_df['operation'].unique():
         op_df = todo_df[todo_df['operation'] == operation]
-        plt.plot(op_df['count'], op_df['memory_avg_mb'], marker='o', label=operation)
+        line, = plt.plot(op_df['count'], op_df['memory_avg_mb'], marker='o', label=f'{operation} (server)')
+        plt.plot(op_df['count'], op_df['client_memory_avg_mb'], marker='x', linestyle='--',
+                 color=line.get_color(), label=f'{operation} (client)')
     plt.title('Figure 3. Memory Usage versus Number of "todo" Objects')
     plt.xlabel('Number of "todo" Objects')
     plt.ylabel('Memory Usage (MB)')
@@ -268,7 +1534,9 @@ def create_separate_figures(todo_results, project_results):
     plt.figure(figsize=(10, 6))
     for operation in project_df['operation'].unique():
         op_df = project_df[project_df['operation'] == operation]
-        plt.plot(op_df['count'], op_df['cpu_avg_percent'], marker='o', label=operation)
+        line, = plt.plot(op_df['count'], op_df['cpu_avg_percent'], marker='o', label=f'{operation} (server)')
+        plt.plot(op_df['count'], op_df['client_cpu_avg_percent'], marker='x', linestyle='--',
+                 color=line.get_color(), label=f'{operation} (client)')
     plt.title('Figure 5. CPU Usage versus Number of "project" Objects')
     plt.xlabel('Number of "project" Objects')
     plt.ylabel('CPU Usage (%)')
@@ -282,7 +1550,9 @@ def create_separate_figures(todo_results, project_results):
     plt.figure(figsize=(10, 6))
     for operation in project_df['operation'].unique():
         op_df = project_df[project_df['operation'] == operation]
-        plt.plot(op_df['count'], op_df['memory_avg_mb'], marker='o', label=operation)
+        line, = plt.plot(op_df['count'], op_df['memory_avg_mb'], marker='o', label=f'{operation} (server)')
+        plt.plot(op_df['count'], op_df['client_memory_avg_mb'], marker='x', linestyle='--',
+                 color=line.get_color(), label=f'{operation} (client)')
     plt.title('Figure 6. Memory Usage versus Number of "project" Objects')
     plt.xlabel('Number of "project" Objects')
     plt.ylabel('Memory Usage (MB)')
@@ -292,6 +1562,26 @@ def create_separate_figures(todo_results, project_results):
     plt.savefig('tests/figures/figure6_project_memory.png')
     plt.close()
     
+    # Figures 7 and 8: Latency percentiles vs number of objects
+    for figure_number, object_type, df in [(7, "todo", todo_df), (8, "project", project_df)]:
+        plt.figure(figsize=(10, 6))
+        for operation in df['operation'].unique():
+            op_df = df[df['operation'] == operation]
+            line, = plt.plot(op_df['count'], op_df['latency_p50_ms'], marker='o', label=f'{operation} p50')
+            plt.plot(op_df['count'], op_df['latency_p99_ms'], marker='x', linestyle='--',
+                     color=line.get_color(), label=f'{operation} p99')
+            plt.plot(op_df['count'], op_df['latency_p999_ms'], marker='^', linestyle=':',
+                     color=line.get_color(), label=f'{operation} p99.9')
+        plt.title(f'Figure {figure_number}. Request Latency Percentiles versus Number of "{object_type}" Objects')
+        plt.xlabel(f'Number of "{object_type}" Objects')
+        plt.ylabel('Request Latency (ms)')
+        plt.yscale('log')
+        plt.legend()
+        plt.grid(True)
+        plt.tight_layout()
+        plt.savefig(f'tests/figures/figure{figure_number}_{object_type}_latency_percentiles.png')
+        plt.close()
+    
     print("Figures saved to tests/figures/ directory")
     
     # Save detailed results to CSV
@@ -299,7 +1589,8 @@ def create_separate_figures(todo_results, project_results):
     project_df.to_csv('tests/project_performance_results.csv', index=False)
     print("Results saved to CSV files")
 
-if __name__ == "__main__":
+def run_sweep():
+    """Run the sequential create/update/delete sweep over object counts"""
     # Define the object counts to test with
     object_counts = [10, 50, 100, 200, 500, 1000]
     
@@ -319,4 +1610,167 @@ if __name__ == "__main__":
         project_results[operation] = run_experiment("project", operation, object_counts)
     
     # Create and save separate figures
-    create_separate_figures(todo_results, project_results)
\ No newline at end of file
+    create_separate_figures(todo_results, project_results)
+
+def run_concurrency_sweep(count, concurrency_levels):
+    """Run every operation at each worker count for todos and projects"""
+    for object_type in ["todo", "project"]:
+        concurrency_results = {}
+        for operation in ["create", "update", "delete"]:
+            print(f"\nRunning {object_type.upper()} {operation.upper()} concurrency tests...")
+            concurrency_results[operation] = run_concurrency_experiment(
+                object_type, operation, count, concurrency_levels)
+        create_concurrency_figures(object_type, concurrency_results)
+
+def run_open_loop_sweep(object_type, operation, rates, duration_seconds, slo_p99_ms):
+    """Run the open-loop test for one operation and save the results"""
+    print(f"\nRunning {object_type.upper()} {operation.upper()} open-loop tests...")
+    results = run_open_loop_experiment(object_type, operation, rates, duration_seconds, slo_p99_ms)
+    pd.DataFrame(results).to_csv(f'tests/{object_type}_{operation}_open_loop_results.csv', index=False)
+    print("Open-loop results saved to CSV file")
+
+def run_mix_sweep(workload, count, concurrency_levels):
+    """Run a weighted workload mix and save the per-operation results"""
+    print(f"\nRunning {workload} workload mix...")
+    results = run_mix_experiment(workload, count, concurrency_levels)
+    name = os.path.splitext(os.path.basename(workload))[0]
+    pd.DataFrame(results).to_csv(f'tests/mix_{name}_results.csv', index=False)
+    print("Workload mix results saved to CSV file")
+
+def run_scaling_sweep(object_type, sizes, samples, slo_p99_ms):
+    """Run the collection-size scaling benchmark and save results and fits"""
+    print(f"\nRunning {object_type.upper()} collection-size scaling tests...")
+    results, fits = run_scaling_experiment(object_type, sizes, samples, slo_p99_ms)
+    pd.DataFrame(results).to_csv(f'tests/{object_type}_scaling_results.csv', index=False)
+    pd.DataFrame(fits).to_csv(f'tests/{object_type}_scaling_fit.csv', index=False)
+    create_scaling_figures(object_type, results)
+    print("Scaling results saved to CSV files and tests/figures/")
+
+def run_fanout_sweep(shapes, sizes, mesh_width, samples):
+    """Run the relationship fan-out benchmark and save the results"""
+    print("\nRunning relationship fan-out tests...")
+    results = run_fanout_experiment(shapes, sizes, mesh_width, samples)
+    pd.DataFrame(results).to_csv('tests/fanout_results.csv', index=False)
+    create_fanout_figures(results)
+    print("Fan-out results saved to tests/fanout_results.csv and tests/figures/")
+
+def run_cassette_sweep(path, multipliers):
+    """Replay a cassette as load and save the results"""
+    print(f"\nReplaying {path} as load...")
+    results = run_cassette_experiment(path, multipliers)
+    pd.DataFrame(results).to_csv('tests/cassette_replay_results.csv', index=False)
+    print("Cassette replay results saved to CSV file")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Todo Manager REST API performance experiments")
+    parser.add_argument("--mode", choices=["sweep", "concurrency", "open-loop", "cassette", "mix", "scaling",
+                                           "fanout"],
+                        default="sweep",
+                        help="sequential object-count sweep, closed-loop concurrency sweep, "
+                             "open-loop constant-arrival-rate test, replay of a recorded cassette, "
+                             "weighted workload mix, list/filter latency against store size, "
+                             "or relationship fan-out")
+    parser.add_argument("--shapes", choices=FANOUT_SHAPES, nargs="+", default=FANOUT_SHAPES,
+                        help="graph shapes for the fan-out benchmark")
+    parser.add_argument("--fanout", type=int, nargs="+", default=FANOUT_SIZES,
+                        help="todos linked to each hub in the fan-out benchmark")
+    parser.add_argument("--mesh-width", type=int, default=FANOUT_MESH_WIDTH,
+                        help="categories every todo is linked to in the mesh shape")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SCALING_SIZES,
+                        help="store sizes the scaling benchmark grows through")
+    parser.add_argument("--samples", type=int, default=SCALING_SAMPLES,
+                        help="timed GETs per endpoint and store size in the scaling benchmark, "
+                             "and per traversal in the fan-out benchmark")
+    parser.add_argument("--workload", default="mixed",
+                        help=f"workload for --mode mix: one of {', '.join(workloads.WORKLOADS)} "
+                             "(tests/workloads.py) or a JSON file of operation weights")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=CONCURRENCY_LEVELS,
+                        help="worker counts for the concurrency sweep")
+    parser.add_argument("--count", type=int, default=1000,
+                        help="operations per concurrency level (concurrency and mix modes)")
+    parser.add_argument("--object-type", choices=["todo", "project"], default="todo",
+                        help="object type for the open-loop test and the scaling benchmark")
+    parser.add_argument("--operation", choices=["create", "update", "delete"], default="create",
+                        help="operation for the open-loop test")
+    parser.add_argument("--rate", type=float, nargs="+", default=[200],
+                        help="target request rates (requests/second) for the open-loop test")
+    parser.add_argument("--duration", type=float, default=10,
+                        help="seconds of load per target rate in the open-loop test")
+    parser.add_argument("--slo-p99-ms", type=float, default=None,
+                        help="report whether corrected p99 latency stays within this bound (open loop), "
+                             "or the store size at which it is exceeded (scaling)")
+    parser.add_argument("--cassette", default=None,
+                        help="cassette recorded with pytest/behave --cassette record, for --mode cassette")
+    parser.add_argument("--rate-multiplier", type=float, nargs="+", default=[1.0],
+                        help="speed-ups of the recorded request schedule for --mode cassette")
+    parser.add_argument("--engine", choices=["threads", "asyncio"], default="threads",
+                        help="send requests through api_client from threads, or as raw HTTP/1.1 "
+                             "keep-alive from one asyncio event loop (async_load.py)")
+    parser.add_argument("--in-flight", type=int, default=None,
+                        help=f"asyncio engine: concurrent requests in the sequential sweep (default "
+                             f"{ASYNC_IN_FLIGHT}) or most in flight in open-loop runs (default {ASYNC_MAX_IN_FLIGHT})")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="load-generating processes for the concurrency and open-loop modes "
+                             "(0 = one per core); results are merged per data point")
+    parser.add_argument("--sample-interval", type=float, default=SAMPLE_INTERVAL,
+                        help="seconds between server resource samples")
+    parser.add_argument("--connections", choices=["pooled", "fresh"], default="pooled",
+                        help="reuse keep-alive connections from a shared pool, or open "
+                             "a new connection for every request")
+    parser.add_argument("--pool-size", type=int, default=None,
+                        help="keep-alive pool size (defaults to the most requests in flight)")
+    parser.add_argument("--isolation", choices=["none", "purge", "restart"], default="none",
+                        help="reset server state before each data point by purging all "
+                             "todos/projects/categories or by restarting the server")
+    parser.add_argument("--gc-log", action="store_true",
+                        help="start the JVM with -Xlog:gc so GC pauses show up in the server log")
+    parser.add_argument("--start-server", action="store_true",
+                        help="start the server with setup.start_api and monitor that process "
+                             "instead of looking the server up by port")
+    parser.add_argument("--api-server", choices=["jar", "local"], default=setup.API_SERVER,
+                        help="server started by --start-server: the JAR, or the Python "
+                             "stand-in in local_api.py")
+    args = parser.parse_args()
+    if args.isolation == "restart" and not args.start_server:
+        parser.error("--isolation restart needs --start-server so the script owns the server process")
+    if args.mode == "cassette" and not args.cassette:
+        parser.error("--mode cassette needs --cassette FILE")
+    if args.processes != 1 and args.mode not in ("concurrency", "open-loop"):
+        parser.error("--processes only applies to --mode concurrency and open-loop")
+    SAMPLE_INTERVAL = args.sample_interval
+    ENGINE = args.engine
+    if args.in_flight:
+        ASYNC_IN_FLIGHT = ASYNC_MAX_IN_FLIGHT = args.in_flight
+    ISOLATION = args.isolation
+    pool_size = args.pool_size or (OPEN_LOOP_MAX_WORKERS if args.mode == "open-loop" else max(args.concurrency))
+    api_client.configure(pool_size=pool_size, pooled=args.connections == "pooled")
+
+    setup.API_SERVER = args.api_server
+    if args.gc_log:
+        setup.JAVA_OPTIONS.append("-Xlog:gc")
+    if args.start_server:
+        start_server("initial")
+    PROCESSES = args.processes or os.cpu_count()
+    if PROCESSES > 1:
+        start_load_processes(PROCESSES)
+
+    if args.mode == "concurrency":
+        run_concurrency_sweep(args.count, args.concurrency)
+    elif args.mode == "open-loop":
+        run_open_loop_sweep(args.object_type, args.operation, args.rate, args.duration, args.slo_p99_ms)
+    elif args.mode == "cassette":
+        run_cassette_sweep(args.cassette, args.rate_multiplier)
+    elif args.mode == "mix":
+        run_mix_sweep(args.workload, args.count, args.concurrency)
+    elif args.mode == "scaling":
+        run_scaling_sweep(args.object_type, args.sizes, args.samples, args.slo_p99_ms)
+    elif args.mode == "fanout":
+        run_fanout_sweep(args.shapes, args.fanout, args.mesh_width, args.samples)
+    else:
+        run_sweep()
+
+    stop_load_processes()
+    if API_PROCESS:
+        stop_api(API_PROCESS)
+    save_startup_times()
+    save_log_alignment()
@@ -0,0 +1,38 @@
+import json
+import socket
+import threading
+import api_client
+import async_load
+import local_api
+import setup
+
+def test_closed_and_open_loop_against_the_stand_in():
+    port = setup.find_free_port()
+    server = local_api.start_in_thread(port)
+    try:
+        base_url = f"http://localhost:{port}"
+        create = ("POST", "/todos", json.dumps({"title": "load"}).encode(), 201)
+        outcomes = async_load.closed_loop([create] * 20 + [("GET", "/todos/999", None, 200)], 4, base_url)
+        assert [ok for _, _, ok in outcomes].count(False) == 1
+        outcomes = async_load.open_loop([("GET", "/todos", None, 200)] * 20, 1000, 8, base_url)
+        assert all(ok and latency >= service for latency, service, _, ok in outcomes)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_a_stalled_server_times_out_as_an_error():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    accepted = []
+    threading.Thread(target=lambda: accepted.append(listener.accept()), daemon=True).start()
+    timeout = api_client.TIMEOUT
+    api_client.TIMEOUT = 0.2  # attribute only, so the pooled session is left alone
+    try:
+        base_url = f"http://127.0.0.1:{listener.getsockname()[1]}"
+        outcomes = async_load.closed_loop([("GET", "/todos", None, 200)], 1, base_url)
+        assert [ok for _, _, ok in outcomes] == [False]
+        assert outcomes[0][0] < 2
+    finally:
+        api_client.TIMEOUT = timeout
+        listener.close()
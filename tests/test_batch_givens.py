@@ -0,0 +1,25 @@
+from collections import deque
+from types import SimpleNamespace
+import batch_givens
+
+def step(step_type, name):
+    return SimpleNamespace(step_type=step_type, name=name)
+
+def test_entity_spec():
+    assert batch_givens.entity_spec('a todo with title "A" and description "B" exists') == \
+        ("/todos", {"title": "A", "description": "B"})
+    assert batch_givens.entity_spec('a todo with title "A" exists') == ("/todos", {"title": "A"})
+    assert batch_givens.entity_spec('a category with title "C" exists') == ("/categories", {"title": "C"})
+    assert batch_givens.entity_spec('a project with id 1 already exists') is None
+
+def test_only_leading_givens_are_batched():
+    steps = [step("given", "the server is running"), step("given", 'a todo with title "A" exists'),
+             step("when", "the user deletes the todo"), step("given", 'a todo with title "B" exists')]
+    assert batch_givens.setup_steps(steps) == steps[:2]
+
+def test_take_hands_out_objects_in_order():
+    prepared = {batch_givens._key("/todos", {"title": "A"}): deque([{"id": "1"}, {"id": "2"}])}
+    assert batch_givens.take(prepared, "/todos", {"title": "A"}) == {"id": "1"}
+    assert batch_givens.take(prepared, "/todos", {"title": "A"}) == {"id": "2"}
+    assert batch_givens.take(prepared, "/todos", {"title": "A"}) is None
+    assert batch_givens.take(None, "/todos", {"title": "A"}) is None
@@ -0,0 +1,30 @@
+from behave_random import order_features, shard, update_timings
+
+def timings_for(durations, failed=()):
+    return {"features": {f: dict({"duration": d}, **({"last_failed": 100.0} if f in failed else {}))
+                         for f, d in durations.items()},
+            "scenarios": {}}
+
+def test_longest_first_spreads_work_across_workers():
+    timings = timings_for({"a": 10, "b": 6, "c": 5, "d": 4, "e": 1})
+    ordered = order_features(list("abcde"), "longest", None, timings)
+    assert ordered == list("abcde")
+    assert shard(ordered, 2, timings) == [["a", "d"], ["b", "c", "e"]]
+
+def test_fail_fast_runs_recent_failures_first(monkeypatch):
+    monkeypatch.setattr("behave_random.time.time", lambda: 200.0)
+    timings = timings_for({"a": 10, "b": 1, "c": 5}, failed=("b",))
+    assert order_features(list("abc"), "fail-fast", None, timings) == ["b", "a", "c"]
+
+def test_random_order_is_reproducible_from_seed():
+    timings = timings_for({})
+    features = [f"f{i}" for i in range(10)]
+    assert order_features(features, "random", 3, timings) == order_features(features, "random", 3, timings)
+
+def test_timings_are_smoothed_and_failures_recorded():
+    report = [{"location": "features/x.feature:1", "status": "failed", "elements": [
+        {"type": "scenario", "location": "features/x.feature:3", "name": "S", "status": "failed",
+         "steps": [{"result": {"duration": 2.0}}, {"result": {"duration": 1.0}}]}]}]
+    timings = update_timings(timings_for({"features/x.feature": 1.0}), report, now=50.0)
+    assert timings["features"]["features/x.feature"] == {"duration": 2.0, "status": "failed", "last_failed": 50.0}
+    assert timings["scenarios"]["features/x.feature:3 S"] == 3.0
@@ -0,0 +1,72 @@
+import json
+import pytest
+import requests
+import cassette
+
+def fake_response(status, payload):
+    response = requests.Response()
+    response.status_code = status
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(payload).encode()
+    return response
+
+def record(path, exchanges):
+    recorder = cassette.Cassette(path, "record")
+    recorder.begin("test_a")
+    for method, api_path, kwargs, response in exchanges:
+        recorder.layer(method, api_path, kwargs, lambda m, p, kw, response=response: response)
+    recorder.save()
+
+def test_replay_answers_from_the_recording_and_reports_divergence(tmp_path):
+    path = str(tmp_path / "c.json.gz")
+    record(path, [
+        ("POST", "/todos", {"json": {"title": "A"}}, fake_response(201, {"id": "7", "title": "A"})),
+        ("GET", "/todos/7", {}, fake_response(200, {"todos": [{"id": "7"}]})),
+        ("DELETE", "/todos/7", {}, fake_response(200, {})),
+    ])
+    player = cassette.Cassette(path, "replay")
+    player.begin("test_a")
+    no_server = lambda *args: pytest.fail("replay must not send requests")
+    assert player.layer("POST", "/todos", {"json": {"title": "A"}}, no_server).json()["id"] == "7"
+    assert player.layer("GET", "/todos/7", {}, no_server).status_code == 200
+    assert player.layer("GET", "/todos/7", {}, no_server).status_code == 200  # repeated read
+    with pytest.raises(cassette.CassetteMiss):
+        player.layer("POST", "/todos", {"json": {"title": "B"}}, no_server)
+    kinds = [divergence["kind"] for divergence in player.report()]
+    assert kinds == ["repeated", "unrecorded", "not replayed"]
+
+def test_id_map_rewrites_recorded_ids():
+    interactions = [
+        {"method": "POST", "path": "/projects", "status": 201, "response": '{"id": "5"}', "body": "{}"},
+        {"method": "POST", "path": "/todos/5/tasksof", "status": 201, "response": "", "body": '{"id": "5"}'},
+    ]
+    ids = cassette.IdMap(interactions)
+    ids.learn(interactions[0], fake_response(201, {"id": "42"}))
+    path, body = ids.rewrite(interactions[1])
+    assert path == "/todos/5/tasksof"  # todo 5 was not created by the recording
+    assert json.loads(body) == {"id": "42"}
+
+def test_concurrent_requests_and_readiness_checks_do_not_diverge(tmp_path):
+    path = str(tmp_path / "c.json.gz")
+    recorder = cassette.Cassette(path, "record")
+    ok = lambda m, p, kw: fake_response(200, {})
+    for _ in range(3):
+        recorder.layer("GET", "/", {}, ok)  # polling a starting server
+    recorder.begin("test_a")
+    for title in ("A", "B"):
+        recorder.layer("POST", "/categories", {"json": {"title": title}}, ok)
+    recorder.layer("GET", "/categories", {}, ok)
+    # The two creations overlapped, as seeding.create_all sends them
+    for interaction, (start, end) in zip(recorder.interactions, [(0, 1), (1, 2), (2, 3), (4, 6), (5, 7), (8, 9)]):
+        interaction["t"], interaction["t_end"] = start, end
+    recorder.save()
+    assert [i.get("concurrent", False) for i in recorder.interactions] == [False, False, False, True, True, False]
+
+    player = cassette.Cassette(path, "replay")
+    no_server = lambda *args: pytest.fail("replay must not send requests")
+    player.layer("GET", "/", {}, no_server)
+    player.begin("test_a")
+    for title in ("B", "A"):
+        player.layer("POST", "/categories", {"json": {"title": title}}, no_server)
+    player.layer("GET", "/categories", {}, no_server)
+    assert player.report() == []
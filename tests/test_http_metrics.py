@@ -0,0 +1,31 @@
+import requests
+import http_metrics
+
+def fake_send(status, body=b"{}"):
+    def send(method, path, kwargs):
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        return response
+    return send
+
+def test_normalize_route():
+    assert http_metrics.normalize_route("/todos/12/categories/3?title=x") == "/todos/{id}/categories/{id}"
+    assert http_metrics.normalize_route("http://localhost:4567/projects/1") == "/projects/{id}"
+    assert http_metrics.normalize_route("/") == "/"
+
+def test_summary_splits_calls_by_route_and_phase():
+    log = http_metrics.CallLog()
+    log.begin("test_a", "setup")
+    log.layer("POST", "/todos", {}, fake_send(201, b'{"id": "3"}'))
+    log.begin("test_a", "call")
+    log.layer("GET", "/todos/3", {}, fake_send(200))
+    log.layer("GET", "/todos/4", {}, fake_send(404))
+    log.add_duration("test_a", "call", 0.5)
+    summary = log.summary()
+    assert summary["calls"] == 3
+    assert summary["routes"]["GET /todos/{id}"]["statuses"] == {"200": 1, "404": 1}
+    assert summary["routes"]["POST /todos"]["bytes"] == 11
+    phases = summary["tests"]["test_a"]
+    assert (phases["setup"]["calls"], phases["call"]["calls"], phases["teardown"]["calls"]) == (1, 2, 0)
+    assert phases["call"]["wall_ms"] == 500
@@ -0,0 +1,23 @@
+import latency_budget
+
+BUDGETS = {"GET /todos/{id}": {"p95_ms": 20, "calls": 4, "warmup": 2}}
+
+def test_warmup_calls_do_not_count():
+    probe = latency_budget.Probe(BUDGETS)
+    probe.samples["GET /todos/{id}"] = [500, 400, 5, 6, 7, 8]
+    assert probe.check() == []
+    probe.samples["GET /todos/{id}"] = [1, 1, 5, 6, 7, 30]
+    assert probe.check() == ["GET /todos/{id}: p95 30.0 ms over the 20 ms budget (4 calls after 2 warm-up)"]
+
+def test_layer_samples_only_budgeted_routes():
+    probe = latency_budget.Probe(BUDGETS)
+    send = lambda method, path, kwargs: "response"
+    probe.layer("GET", "/todos/3", {}, send)
+    probe.layer("GET", "/todos", {}, send)
+    assert list(probe.samples) == ["GET /todos/{id}"]
+    assert probe.last_request["GET /todos/{id}"] == ("GET", "/todos/3", {})
+
+def test_named_routes_must_be_budgeted_and_called():
+    probe = latency_budget.Probe(BUDGETS, ["GET /todos/{id}", "DELETE /todos/{id}"])
+    assert probe.check() == ["DELETE /todos/{id}: no latency budget in " + latency_budget.BUDGETS_FILE,
+                             "GET /todos/{id}: never called"]
@@ -0,0 +1,43 @@
+import pytest
+from latency_histogram import LatencyHistogram
+
+def test_empty_histogram_reports_zero():
+    histogram = LatencyHistogram()
+    assert histogram.total_count == 0
+    assert histogram.percentile(99) == 0
+    assert histogram.summary()['latency_max_ms'] == 0
+
+def test_percentiles_within_precision():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+    assert histogram.total_count == 1000
+    assert histogram.percentile(50) == pytest.approx(500, rel=0.01)
+    assert histogram.percentile(99) == pytest.approx(990, rel=0.01)
+    assert histogram.percentile(99.9) == pytest.approx(999, rel=0.01)
+    assert histogram.max() == 1000
+    assert histogram.mean() == pytest.approx(500.5)
+
+def test_memory_is_bounded():
+    histogram = LatencyHistogram()
+    size = len(histogram.counts)
+    for _ in range(10000):
+        histogram.record(0.005)
+    histogram.record(3600)  # clamped to the highest trackable value
+    assert len(histogram.counts) == size
+    assert histogram.max() == histogram.highest_us / 1000
+
+def test_merge_combines_counts():
+    fast, slow = LatencyHistogram(), LatencyHistogram()
+    for _ in range(90):
+        fast.record(0.001)
+    for _ in range(10):
+        slow.record(0.2)
+    merged = LatencyHistogram().merge(fast).merge(slow)
+    assert merged.total_count == 100
+    assert merged.percentile(50) == pytest.approx(1, rel=0.01)
+    assert merged.percentile(95) == pytest.approx(200, rel=0.01)
+
+def test_merge_rejects_different_configuration():
+    with pytest.raises(ValueError):
+        LatencyHistogram().merge(LatencyHistogram(significant_digits=3))
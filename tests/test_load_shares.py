@@ -0,0 +1,34 @@
+import pytest
+from latency_histogram import LatencyHistogram
+from performance_test import load_shares, merge_outcomes
+
+@pytest.mark.parametrize("processes", [1, 2, 3, 4])
+def test_closed_loop_shares_cover_items_once_and_split_concurrency(processes):
+    items = list(range(10))
+    shares = load_shares("closed", items, 7, processes, 100.0)
+    assert sorted(item for share_items, _, _ in shares for item in share_items) == items
+    levels = [level for _, level, _ in shares]
+    assert sum(levels) == 7 and max(levels) - min(levels) <= 1
+    assert {start for _, _, start in shares} == {100.0}
+
+def test_open_loop_offsets_interleave_the_single_process_schedule():
+    rate, processes, start_at = 50.0, 3, 100.0
+    items = list(range(12))
+    shares = load_shares("open", items, rate, processes, start_at)
+    assert sum(level for _, level, _ in shares) == pytest.approx(rate)
+    # Item j of a share is sent at its start + j / its rate; together that is
+    # start_at + k / rate for the k-th item overall
+    sends = sorted((start + j / level, item) for share_items, level, start in shares
+                   for j, item in enumerate(share_items))
+    assert [item for _, item in sends] == items
+    assert [at for at, _ in sends] == pytest.approx([start_at + k / rate for k in range(len(items))])
+
+def test_merge_outcomes_merges_histograms_and_adds_errors():
+    outcomes = []
+    for latencies, errors in (([0.001, 0.002], 1), ([0.003], 2)):
+        histogram = LatencyHistogram()
+        for latency in latencies:
+            histogram.record(latency, 0.0)
+        outcomes.append((histogram, errors))
+    histogram, errors = merge_outcomes(outcomes)
+    assert histogram.total_count == 3 and errors == 3
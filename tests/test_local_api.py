@@ -0,0 +1,49 @@
+import pytest
+from local_api import ApiError, Store
+
+def test_defaults_match_the_jar():
+    store = Store()
+    assert [todo["title"] for todo in store.query("todos")] == ["scan paperwork", "file paperwork"]
+    assert store.get("projects", "1")["tasks"] == [{"id": "1"}, {"id": "2"}]
+    assert store.get("todos", "1")["tasksof"] == [{"id": "1"}]
+
+def test_title_index_follows_updates():
+    store = Store(defaults=False)
+    first = store.create("todos", {"title": "A"})
+    second = store.create("todos", {"title": "A"})
+    store.amend("todos", second, {"title": "B"})
+    assert [todo["id"] for todo in store.query("todos", [("title", "A")])] == [first]
+    store.delete("todos", first)
+    assert store.query("todos", [("title", "A")]) == []
+    assert store.query("todos", [("title", "B"), ("doneStatus", "false")])[0]["id"] == second
+
+def test_validation_errors():
+    store = Store(defaults=False)
+    with pytest.raises(ApiError) as error:
+        store.create("todos", {"id": "1", "title": "x"})
+    assert error.value.status == 400
+    for body in ({"description": "no title"}, {"title": "x", "unknown": 1}, {"title": "x", "doneStatus": "true"}):
+        with pytest.raises(ApiError):
+            store.create("todos", body)
+    with pytest.raises(ApiError) as error:
+        store.amend("todos", "99", {"title": "x"})
+    assert error.value.status == 404
+
+def test_deleting_removes_both_sides_of_a_link():
+    store = Store()
+    store.delete("projects", "1")
+    assert "tasksof" not in store.get("todos", "1")
+    store.link("todos", "1", "categories", "1")
+    store.delete("categories", "1")
+    assert "categories" not in store.get("todos", "1")
+
+def test_category_links_are_mirrored():
+    store = Store()
+    store.link("todos", "1", "categories", "1")
+    store.link("categories", "1", "projects", "1")
+    assert store.related("categories", "1", "todos")[1][0]["id"] == "1"
+    assert store.get("projects", "1")["categories"] == [{"id": "1"}]
+    store.unlink("categories", "1", "todos", "1")
+    assert "categories" not in store.get("todos", "1")
+    store.unlink("projects", "1", "categories", "1")
+    assert "projects" not in store.get("categories", "1")
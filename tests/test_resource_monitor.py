@@ -0,0 +1,39 @@
+import time
+import psutil
+import performance_test
+
+GONE_PID = 999_999
+SERVER_PID = 1
+
+class FakeSampler:
+    """Stands in for ProcessSampler: steadily rising CPU seconds, a load
+    process that exits after a few readings, and one slow server reading"""
+
+    def __init__(self, pid, count_fds=True):
+        self.pid = pid
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        if self.pid == GONE_PID and self.reads > 3:
+            raise psutil.NoSuchProcess(self.pid)
+        if self.pid == SERVER_PID and self.reads == 5:
+            time.sleep(0.06)  # stalls the monitor for several ticks
+        return self.reads * 0.001, 10.0, 4, 8
+
+def test_monitor_wraps_counts_missed_ticks_and_survives_a_gone_process(monkeypatch):
+    monkeypatch.setattr(performance_test, "ProcessSampler", FakeSampler)
+    monkeypatch.setattr(performance_test, "LOAD_PIDS", [GONE_PID])
+    monitor = performance_test.ResourceMonitor(sample_interval=0.01, server_pid=SERVER_PID, capacity=8)
+    monitor.start_monitoring()
+    time.sleep(0.3)
+    assert monitor.monitor_thread.is_alive()
+    monitor.stop_monitoring()
+
+    assert monitor.sample_count > monitor.capacity
+    assert monitor.missed_ticks >= 3
+    df = monitor.get_dataframe()
+    assert len(df) == monitor.capacity
+    assert df['timestamp'].is_monotonic_increasing
+    assert (df['memory_mb'] == 10.0).all()
+    assert monitor.get_statistics()['samples'] == monitor.sample_count
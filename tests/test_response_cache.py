@@ -0,0 +1,37 @@
+import requests
+import response_cache
+
+class FakeServer:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, method, path, kwargs):
+        self.sent.append((method, path))
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+def test_repeated_gets_are_served_from_the_cache():
+    server, cache = FakeServer(), response_cache.ResponseCache()
+    for _ in range(3):
+        cache.layer("GET", "/projects/1/tasks", {}, server.send)
+    cache.layer("GET", "/projects/1/tasks", {"headers": {"Accept": "application/xml"}}, server.send)
+    assert len(server.sent) == 2
+    assert cache.stats() == {"hits": 2, "misses": 2, "invalidations": 0}
+
+def test_writes_invalidate_overlapping_paths():
+    server, cache = FakeServer(), response_cache.ResponseCache()
+    for path in ("/projects/1/tasks", "/todos/1", "/categories"):
+        cache.layer("GET", path, {}, server.send)
+    # A task is a todo, so this can change /todos/1 too, but not /categories
+    cache.layer("POST", "/projects/1/tasks", {"json": {"id": "2"}}, server.send)
+    assert set(cache.entries) == {response_cache.cache_key("/categories", {})}
+    cache.layer("DELETE", "/todos/1", {}, server.send)
+    assert cache.entries == {}
+
+def test_bypass_always_reaches_the_server():
+    server, cache = FakeServer(), response_cache.ResponseCache()
+    cache.layer("GET", "/todos", {}, server.send)
+    with cache.bypass():
+        cache.layer("GET", "/todos", {}, server.send)
+    assert len(server.sent) == 2
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from performance_test import (SCALING_MAX_EXTRAPOLATION, SCALING_MIN_R_SQUARED, fit_growth, fit_r_squared,
+                              slo_break_size)
+
+SIZES = np.array([1_000, 10_000, 100_000])
+
+def test_fit_recovers_a_power_law():
+    a, b = fit_growth(SIZES, 0.002 * SIZES ** 0.9)
+    assert a == pytest.approx(0.002) and b == pytest.approx(0.9)
+    assert fit_r_squared(SIZES, 0.002 * SIZES ** 0.9, a, b) == pytest.approx(1.0)
+
+def test_flat_latency_has_no_break_size():
+    latencies = np.array([2.0, 2.1, 2.0])
+    a, b = fit_growth(SIZES, latencies)
+    r_squared = fit_r_squared(SIZES, latencies, a, b)
+    assert slo_break_size(a, b, 50, SIZES.max(), r_squared) == (None, "no measurable growth")
+
+def test_a_poor_fit_has_no_break_size():
+    size, note = slo_break_size(0.002, 0.9, 50, 100_000, SCALING_MIN_R_SQUARED - 0.01)
+    assert size is None and note == "no measurable growth"
+
+def test_break_sizes_are_not_extrapolated_too_far():
+    largest = 100_000
+    # latency = size / 1e6 ms reaches 50 ms at 5e7, 500x the largest size
+    size, note = slo_break_size(1e-6, 1.0, 50, largest)
+    assert size is None and str(SCALING_MAX_EXTRAPOLATION) in note
+    size, note = slo_break_size(1e-4, 1.0, 50, largest)
+    assert size == pytest.approx(500_000) and note == "extrapolated"
+    size, note = slo_break_size(1e-3, 1.0, 50, largest)
+    assert size == pytest.approx(50_000) and note == "within measured range"
@@ -0,0 +1,91 @@
+import time
+import api_client
+import local_api
+import seeding
+import setup
+
+def serve(monkeypatch, port=None):
+    port = port or setup.find_free_port()
+    server = local_api.start_in_thread(port)
+    monkeypatch.setattr(api_client, "BASE_URL", f"http://127.0.0.1:{port}")
+    return server
+
+def stop(server):
+    server.shutdown()
+    server.server_close()
+
+def titled(server, title):
+    return server.RequestHandlerClass.store.query("todos", [("title", title)])
+
+def test_a_refused_connection_is_retried(monkeypatch):
+    port = setup.find_free_port()
+    monkeypatch.setattr(api_client, "BASE_URL", f"http://127.0.0.1:{port}")
+    started = []
+    def start_server_instead_of_sleeping(seconds):
+        if not started:
+            started.append(local_api.start_in_thread(port))
+    monkeypatch.setattr(seeding.time, "sleep", start_server_instead_of_sleeping)
+    try:
+        created = seeding.create_with_retry("/todos", {"title": "Retried"})
+        assert created["title"] == "Retried"
+        assert len(titled(started[0], "Retried")) == 1
+    finally:
+        for server in started:
+            stop(server)
+
+def test_a_post_that_timed_out_after_sending_is_not_retried(monkeypatch):
+    server = serve(monkeypatch)
+    store = server.RequestHandlerClass.store
+    create = store.create
+    def slow_create(resource, body):
+        time.sleep(0.3)
+        return create(resource, body)
+    monkeypatch.setattr(store, "create", slow_create)
+    monkeypatch.setattr(api_client, "TIMEOUT", 0.1)
+    try:
+        assert seeding.create_with_retry("/todos", {"title": "Sent once"}) is None
+        time.sleep(0.5)  # let the server finish what it received
+        assert len(titled(server, "Sent once")) == 1
+    finally:
+        stop(server)
+
+def test_pipeline_caps_queued_creations(monkeypatch):
+    server = serve(monkeypatch)
+    workers, pulled, done = 2, [], []
+    def specs():
+        for i in range(40):
+            pulled.append(i)
+            yield i, "/todos", {"title": f"Piped {i}"}
+    outstanding = []
+    def on_result(index, created):
+        done.append(created)
+        outstanding.append(len(pulled) - len(done))
+    try:
+        seeding._run_pipeline(specs(), workers, on_result)
+    finally:
+        stop(server)
+    assert len(done) == 40 and all(done)
+    assert max(outstanding) <= 2 * workers
+
+def test_restore_brings_back_a_snapshot_with_its_relationships(monkeypatch):
+    server = serve(monkeypatch)
+    try:
+        api_client.post("/todos/1/categories", json={"id": "1"})
+        state = seeding.snapshot()
+
+        api_client.post("/todos", json={"title": "Extra"})
+        api_client.put("/todos/1", json={"title": "Renamed", "doneStatus": True})
+        api_client.delete("/todos/1/categories/1")
+        api_client.delete("/projects/1/tasks/2")
+        api_client.post("/projects/1/categories", json={"id": "2"})
+        assert seeding.restore(state)
+        assert seeding.snapshot() == state
+
+        # A deleted default cannot come back with its ID, which restore reports
+        api_client.delete("/categories/2")
+        assert not seeding.restore(state)
+        remaining = {resource: [obj for obj in objects if (resource, obj["id"]) != ("categories", "2")]
+                     for resource, objects in state.items()}
+        assert seeding.snapshot() == remaining
+    finally:
+        stop(server)
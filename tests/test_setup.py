@@ -0,0 +1,23 @@
+import setup
+
+def write_lines(path, timestamps):
+    with open(path, "a") as f:
+        for timestamp in timestamps:
+            f.write(f"{timestamp:.3f} 2026-01-01 00:00:00,000 [stdout] line {timestamp:g}\n")
+
+def test_log_tail_reads_only_new_lines_across_rotation(tmp_path, monkeypatch):
+    log = str(tmp_path / "todo_api.log")
+    monkeypatch.setattr(setup, "SERVER_LOG_FILE", log)
+    write_lines(log, [1, 2])
+    tail = setup.ServerLogTail()  # starts where the log ends
+    write_lines(log, [3])
+    with open(log, "a") as f:
+        f.write("4.000 2026-01-01 00:00:00,000 [stdout] half a li")
+    assert [entry[0] for entry in tail.read()] == [3]
+    with open(log, "a") as f:
+        f.write("ne\n")
+    # Rotate as RotatingFileHandler does, then keep writing
+    (tmp_path / "todo_api.log").rename(tmp_path / "todo_api.log.1")
+    write_lines(log, [5])
+    assert [entry[0] for entry in tail.read()] == [4, 5]
+    assert tail.read() == []
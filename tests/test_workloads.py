@@ -0,0 +1,41 @@
+import json
+import pytest
+import workloads
+
+def seeded(count):
+    return {resource: [{"id": str(i), "title": f"{resource} {i}"} for i in range(count)]
+            for resource in workloads.RESOURCES}
+
+def test_every_named_workload_is_valid():
+    for name in workloads.WORKLOADS:
+        assert workloads.load_workload(name)
+
+def test_unknown_operations_are_rejected(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps({"get_todo": 1, "get_widget": 1}))
+    with pytest.raises(ValueError, match="get_widget"):
+        workloads.load_workload(str(path))
+
+def test_deletes_keep_a_minimum_pool_and_creates_join_it():
+    mix = workloads.Mix({"delete_todo": 1}, seeded(workloads.POOL_MIN + 3), seed=1)
+    requests = [mix.next_request() for _ in range(5)]
+    assert [name for name, _, _ in requests] == ["delete_todo"] * 3 + ["create_todo"] * 2
+    deleted = {spec[1] for _, spec, _ in requests[:3]}
+    assert len(deleted) == 3
+    name, spec, creates = requests[-1]
+    assert spec[:2] == ("POST", "/todos") and creates == "todos"
+    mix.learn(creates, 201, json.dumps({"id": "99", "title": "new"}).encode())
+    assert "99" in mix.ids["todos"]
+
+def test_relationship_and_filter_requests():
+    mix = workloads.Mix({"link_project_task": 1}, seeded(3), seed=2)
+    _, (method, path, body, expected), _ = mix.next_request()
+    assert (method, expected) == ("POST", 201) and path.endswith("/tasks") and json.loads(body)["id"] in "012"
+    mix = workloads.Mix({"filter_projects": 1}, seeded(3), seed=2)
+    assert mix.next_request()[1][1].startswith("/projects?title=projects%20")
+
+def test_operations_on_an_empty_pool_become_creates():
+    pools = seeded(3)
+    pools["categories"] = []
+    mix = workloads.Mix({"link_todo_category": 1, "get_category": 1}, pools, seed=3)
+    assert {mix.next_request()[0] for _ in range(10)} == {"create_category"}
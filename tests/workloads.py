@@ -0,0 +1,168 @@
+"""Weighted mixed workloads for performance_test.py --mode mix.
+
+A workload maps operation names to relative weights. Each request picks an
+operation at random by weight and builds it against a pool of live object
+IDs: objects seeded before the run, plus the ones the workload itself
+creates. Deletes take their object out of the pool when they are built, so no
+two requests delete the same object. An operation that needs an object from
+an empty pool is sent as a create in that pool instead.
+
+Add a workload to WORKLOADS, or pass a JSON file of {"operation": weight}.
+"""
+import json
+import random
+import threading
+from urllib.parse import quote
+
+# Objects of each resource created before a mix starts
+POOL_SEED_COUNT = 100
+# Deletes are replaced by creates when a resource gets this small, so reads
+# always have something to read
+POOL_MIN = 10
+
+RESOURCES = ("todos", "projects", "categories")
+SINGULAR = {"todos": "todo", "projects": "project", "categories": "category"}
+
+def _operation_names():
+    names = []
+    for resource in RESOURCES:
+        singular = SINGULAR[resource]
+        names += [f"list_{resource}", f"get_{singular}", f"filter_{resource}",
+                  f"create_{singular}", f"update_{singular}", f"delete_{singular}"]
+    return names + ["todo_categories", "todo_tasksof", "project_tasks", "link_todo_category", "link_project_task"]
+
+OPERATIONS = _operation_names()
+
+WORKLOADS = {
+    # Mostly reads, the way a UI browses lists and opens items
+    "browse": {
+        "list_todos": 20, "get_todo": 25, "filter_todos": 10, "list_projects": 5, "get_project": 10,
+        "todo_categories": 8, "todo_tasksof": 5, "project_tasks": 7,
+        "create_todo": 4, "update_todo": 4, "delete_todo": 2,
+    },
+    # Every operation, reads still ahead of writes
+    "mixed": {
+        "list_todos": 8, "get_todo": 12, "filter_todos": 6, "create_todo": 6, "update_todo": 6, "delete_todo": 3,
+        "list_projects": 4, "get_project": 8, "filter_projects": 3, "create_project": 3, "update_project": 3,
+        "delete_project": 2,
+        "list_categories": 3, "get_category": 5, "filter_categories": 2, "create_category": 2,
+        "update_category": 2, "delete_category": 1,
+        "todo_categories": 5, "todo_tasksof": 4, "project_tasks": 5, "link_todo_category": 2, "link_project_task": 2,
+    },
+    # Ingest-style traffic: creates, updates and linking
+    "write-heavy": {
+        "create_todo": 25, "update_todo": 20, "delete_todo": 10, "create_project": 5, "update_project": 5,
+        "link_todo_category": 10, "link_project_task": 10, "get_todo": 10, "list_todos": 5,
+    },
+}
+
+def load_workload(name_or_path):
+    """Weights of a named workload, or of a JSON file of {"operation": weight}"""
+    if name_or_path in WORKLOADS:
+        weights = WORKLOADS[name_or_path]
+    else:
+        with open(name_or_path) as f:
+            weights = json.load(f)
+    unknown = set(weights) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations in workload {name_or_path}: {', '.join(sorted(unknown))}")
+    return weights
+
+def _body(payload):
+    return json.dumps(payload).encode()
+
+class Mix:
+    """Builds the requests of a weighted workload. next_request() and the
+    done callbacks it hands out may be called from several threads."""
+
+    def __init__(self, weights, seeded, seed=None):
+        """`seeded` maps each resource to the objects created for the run"""
+        self.names = list(weights)
+        self.weights = [weights[name] for name in self.names]
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.titles = {resource: {obj["id"]: obj["title"] for obj in seeded.get(resource, ())}
+                       for resource in RESOURCES}
+        self.ids = {resource: list(titles) for resource, titles in self.titles.items()}
+        self.created = 0
+
+    @staticmethod
+    def _needs(name):
+        """Resources an operation picks existing objects from"""
+        kind, _, target = name.partition("_")
+        if kind in ("get", "filter", "update", "delete"):
+            return [next(r for r in RESOURCES if target in (r, SINGULAR[r]))]
+        return {"todo_categories": ["todos"], "todo_tasksof": ["todos"], "project_tasks": ["projects"],
+                "link_todo_category": ["todos", "categories"],
+                "link_project_task": ["projects", "todos"]}.get(name, [])
+
+    def _pick(self, resource):
+        return self.rng.choice(self.ids[resource])
+
+    def _take(self, resource):
+        ids = self.ids[resource]
+        index = self.rng.randrange(len(ids))
+        ids[index], ids[-1] = ids[-1], ids[index]
+        object_id = ids.pop()
+        del self.titles[resource][object_id]
+        return object_id
+
+    def _title(self, resource):
+        self.created += 1
+        return f"Mix {SINGULAR[resource]} {self.created}"
+
+    def _build(self, name):
+        """(method, path, body, expected status) for an operation, and the
+        resource a successful response creates an object in, if any"""
+        kind, _, target = name.partition("_")
+        resource = next((r for r in RESOURCES if target in (r, SINGULAR[r])), None)
+        if kind == "list":
+            return ("GET", f"/{resource}", None, 200), None
+        if kind == "get":
+            return ("GET", f"/{resource}/{self._pick(resource)}", None, 200), None
+        if kind == "filter":
+            title = self.titles[resource][self._pick(resource)]
+            return ("GET", f"/{resource}?title={quote(title)}", None, 200), None
+        if kind == "create":
+            return ("POST", f"/{resource}", _body({"title": self._title(resource)}), 201), resource
+        if kind == "update":
+            object_id, title = self._pick(resource), self._title(resource)
+            self.titles[resource][object_id] = title
+            return ("PUT", f"/{resource}/{object_id}", _body({"title": title}), 200), None
+        if kind == "delete":
+            return ("DELETE", f"/{resource}/{self._take(resource)}", None, 200), None
+        if name in ("todo_categories", "todo_tasksof"):
+            return ("GET", f"/todos/{self._pick('todos')}/{target}", None, 200), None
+        if name == "project_tasks":
+            return ("GET", f"/projects/{self._pick('projects')}/tasks", None, 200), None
+        if name == "link_todo_category":
+            return ("POST", f"/todos/{self._pick('todos')}/categories",
+                    _body({"id": self._pick("categories")}), 201), None
+        return ("POST", f"/projects/{self._pick('projects')}/tasks", _body({"id": self._pick("todos")}), 201), None
+
+    def next_request(self):
+        """(operation name, request spec, creates) for the next request"""
+        with self.lock:
+            name = self.rng.choices(self.names, self.weights)[0]
+            kind, _, target = name.partition("_")
+            if kind == "delete":
+                resource = next(r for r in RESOURCES if target == SINGULAR[r])
+                if len(self.ids[resource]) <= POOL_MIN:
+                    name = f"create_{target}"
+            empty = next((resource for resource in self._needs(name) if not self.ids[resource]), None)
+            if empty is not None:
+                name = f"create_{SINGULAR[empty]}"
+            spec, creates = self._build(name)
+        return name, spec, creates
+
+    def learn(self, resource, status, body):
+        """Add an object the workload created to the pool"""
+        if resource is None or status != 201:
+            return
+        try:
+            obj = json.loads(body)
+        except ValueError:
+            return
+        with self.lock:
+            self.ids[resource].append(obj["id"])
+            self.titles[resource][obj["id"]] = obj["title"]